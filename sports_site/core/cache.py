@@ -0,0 +1,56 @@
+import time
+from django.core.cache import cache
+from django.db import transaction
+
+
+
+"""Versioned cache keys
+
+Cached values are stored under a key that includes a version number, and
+writes bump the version instead of deleting keys, so stale entries are
+simply never read again and expire on their own. Works with any Django
+cache backend shared by every worker process, ie the FileBasedCache in
+settings.py. LocMemCache is per process, so a bump in one worker would
+never reach the others.
+"""
+def get_version(name):
+    """
+    Returns the current version for name, starting it when missing.
+    Versions start from the current time in ms so a version lost to cache
+    eviction or a restart never reuses an older number.
+
+    Params:
+        name - str, ie "boxscore-version:12"
+    """
+    version = cache.get(name)
+    if version is None:
+        cache.add(name, int(time.time() * 1000), timeout=None)
+        version = cache.get(name)
+    return version
+
+
+def bump_version(name):
+    """
+    Moves name to a new version, invalidating everything cached under the
+    old one.
+
+    Params:
+        name - str, ie "boxscore-version:12"
+    """
+    try:
+        return cache.incr(name)
+    except ValueError:
+        cache.add(name, int(time.time() * 1000), timeout=None)
+        return cache.get(name)
+
+
+def bump_version_on_commit(name):
+    """
+    bump_version() once the current transaction commits, or right away
+    outside of one, so a request can't cache data the transaction is still
+    writing under the new version.
+
+    Params:
+        name - str, ie "boxscore-version:12"
+    """
+    transaction.on_commit(lambda: bump_version(name))
@@ -0,0 +1,41 @@
+import time
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from . import query_stats
+
+
+
+class QueryStatsMiddleware:
+    """
+    Records the query count, DB time and total time of every request into
+    the core/query_stats.py ring buffer, under its resolved URL name, and
+    reports them in a Server-Timing header, ie
+        Server-Timing: db;dur=4.2;desc="7 queries", total;dur=31.0
+
+    Opt in with settings.QUERY_STATS = True, and list it first in
+    MIDDLEWARE so the total covers the other middleware too. Streamed
+    responses only count the queries run before streaming starts.
+    """
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_STATS", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+
+    def __call__(self, request):
+        timer = query_stats.QueryTimer()
+        start = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match and match.view_name else request.path
+        query_stats.record(view, request.path, request.method,
+            response.status_code, timer.count, timer.duration, total)
+
+        response["Server-Timing"] = (
+            f'db;dur={timer.duration * 1000:.1f};desc="{timer.count} queries", '
+            f"total;dur={total * 1000:.1f}")
+        return response
@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import deque
+from django.conf import settings
+
+
+
+"""Query stats
+
+Per request query count, DB time and total time, kept in a ring buffer of
+the last QUERY_STATS_SIZE requests in this process. Recorded by
+core/middleware.py QueryStatsMiddleware when settings.QUERY_STATS is on,
+read by core/views.py query_stats.
+"""
+QUERY_STATS_SIZE = getattr(settings, "QUERY_STATS_SIZE", 1000)
+
+_records = deque(maxlen=QUERY_STATS_SIZE)
+_lock = threading.Lock()
+
+
+class QueryTimer:
+    """
+    Database execute wrapper counting queries and the time spent in them,
+    see connection.execute_wrapper.
+    """
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def record(view, path, method, status, queries, db_time, total_time):
+    """
+    Adds a request to the ring buffer. Times are in seconds.
+
+    Params:
+        view - Resolved URL name, ie "stats-page", or the path if unnamed.
+    """
+    with _lock:
+        _records.append({
+            "view": view,
+            "path": path,
+            "method": method,
+            "status": status,
+            "queries": queries,
+            "db_ms": round(db_time * 1000, 3),
+            "total_ms": round(total_time * 1000, 3),
+            "time": time.time(),
+            })
+
+
+def recent():
+    """Copy of the buffered requests, oldest first."""
+    with _lock:
+        return list(_records)
+
+
+def clear():
+    with _lock:
+        _records.clear()
+
+
+def summary(records=None):
+    """
+    Buffered requests grouped by view, with their request count and the
+    mean and max queries, DB time and total time, most queries first.
+    """
+    views = {}
+    for row in recent() if records is None else records:
+        views.setdefault(row["view"], []).append(row)
+
+    summaries = []
+    for view, rows in views.items():
+        stats = {"view": view, "requests": len(rows)}
+        for key in ("queries", "db_ms", "total_ms"):
+            values = [row[key] for row in rows]
+            stats[f"mean_{key}"] = round(sum(values) / len(values), 3)
+            stats[f"max_{key}"] = max(values)
+        summaries.append(stats)
+    return sorted(summaries, key=lambda stats: -stats["mean_queries"])
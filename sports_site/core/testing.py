@@ -0,0 +1,36 @@
+from contextlib import contextmanager
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin for per-view query budgets. Unlike assertNumQueries a
+    budget is an upper bound, so a view that gets cheaper still passes,
+    and a failure lists every query the view ran, ie
+
+        class StatsViewTests(QueryBudgetMixin, TestCase):
+            def test_query_budget(self):
+                self.assertQueryBudget(4, reverse("stats-page"),
+                    {"league": "TL"})
+    """
+    @contextmanager
+    def assertMaxQueries(self, budget):
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        queries = context.captured_queries
+        if len(queries) > budget:
+            self.fail(f"{len(queries)} queries run, budget is {budget}:\n" +
+                "\n".join(f"{i}. {query['sql']}"
+                    for i, query in enumerate(queries, start=1)))
+
+
+    def assertQueryBudget(self, budget, url, data=None, **extra):
+        """
+        GETs url with the test client and fails if the view runs more than
+        budget queries. Returns the response.
+        """
+        with self.assertMaxQueries(budget):
+            response = self.client.get(url, data, **extra)
+        return response
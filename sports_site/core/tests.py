@@ -1,3 +1,103 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from core import query_stats
+from core.testing import QueryBudgetMixin
+from league.models import League
 
-# Create your tests here.
+
+
+@override_settings(QUERY_STATS=True)
+class QueryStatsMiddlewareTest(TestCase):
+    """
+    Tests QueryStatsMiddleware from core/middleware.py and query_stats_view
+    from core/views.py
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(username="Staff",
+            password="staff", is_staff=True)
+
+
+    def setUp(self):
+        query_stats.clear()
+
+
+    def test_records_view(self):
+        response = self.client.get(reverse("stats-page"), {"league": "TL"})
+        record, = query_stats.recent()
+        self.assertEqual(record["view"], "stats-page")
+        self.assertEqual(record["path"], reverse("stats-page"))
+        self.assertEqual(record["method"], "GET")
+        self.assertEqual(record["status"], 200)
+        self.assertTrue(record["queries"] > 0)
+        self.assertTrue(record["total_ms"] >= record["db_ms"] >= 0)
+        self.assertIn(f'desc="{record["queries"]} queries"',
+            response["Server-Timing"])
+        self.assertIn("total;dur=", response["Server-Timing"])
+
+
+    def test_unresolved_path(self):
+        self.client.get("/no/such/page/")
+        self.assertEqual(query_stats.recent()[0]["view"], "/no/such/page/")
+
+
+    @override_settings(QUERY_STATS=False)
+    def test_off_by_default(self):
+        response = self.client.get(reverse("stats-page"), {"league": "TL"})
+        self.assertFalse(response.has_header("Server-Timing"))
+        self.assertEqual(query_stats.recent(), [])
+
+
+    def test_summary(self):
+        for queries in (2, 4):
+            query_stats.record("page", "/page/", "GET", 200, queries, .001, .002)
+        summary, = query_stats.summary()
+        self.assertEqual(summary["requests"], 2)
+        self.assertEqual(summary["mean_queries"], 3)
+        self.assertEqual(summary["max_queries"], 4)
+        self.assertEqual(summary["max_total_ms"], 2)
+
+
+    def test_ring_buffer(self):
+        for i in range(query_stats.QUERY_STATS_SIZE + 5):
+            query_stats.record("page", "/page/", "GET", 200, i, 0, 0)
+        records = query_stats.recent()
+        self.assertEqual(len(records), query_stats.QUERY_STATS_SIZE)
+        self.assertEqual(records[0]["queries"], 5)
+
+
+    def test_endpoint_staff_only(self):
+        response = self.client.get(reverse("query-stats"))
+        self.assertEqual(response.status_code, 302)
+        self.client.login(username="Test", password="test")
+        self.assertEqual(self.client.get(reverse("query-stats")).status_code,
+            302)
+
+
+    def test_endpoint(self):
+        self.client.get(reverse("standings-page"), {"league": "TL"})
+        self.client.login(username="Staff", password="staff")
+        data = self.client.get(reverse("query-stats"), {"recent": 1}).json()
+        self.assertEqual([row["view"] for row in data["views"]],
+            ["standings-page"])
+        self.assertEqual(len(data["recent"]), 1)
+
+
+
+class QueryBudgetMixinTest(QueryBudgetMixin, TestCase):
+    """
+    Tests QueryBudgetMixin from core/testing.py
+    """
+    def test_within_budget(self):
+        with self.assertMaxQueries(1):
+            League.objects.count()
+
+
+    def test_over_budget_lists_queries(self):
+        with self.assertRaises(AssertionError) as context:
+            with self.assertMaxQueries(1):
+                League.objects.count()
+                League.objects.exists()
+        self.assertIn("2 queries run, budget is 1", str(context.exception))
+        self.assertIn("2. SELECT", str(context.exception))
@@ -3,6 +3,7 @@ from . import views
 
 urlpatterns = [
     path('', views.landing, name='landing'),
+    path('query-stats/', views.query_stats_view, name='query-stats'),
     path('<league_url>/', views.find_league, name='league-redirect'),
     path('login/redirect/', views.login_redirect, name='login-redirect'),
     ]
\ No newline at end of file
@@ -1,4 +1,7 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
 from django.shortcuts import redirect, render
+from . import query_stats
 
 
 def landing(request):
@@ -16,4 +19,22 @@ def login_redirect(request):
     if request.user.has_perm('league.league_admin'):
         return redirect("league-admin-dashboard")
     else:
-        return redirect("user-dashboard")
\ No newline at end of file
+        return redirect("user-dashboard")
+
+
+@staff_member_required
+def query_stats_view(request):
+    """
+    Query stats of the last requests this process served, per view and
+    the most recent ?recent=N (default 50) individually. Empty unless
+    settings.QUERY_STATS is on, see core/middleware.py.
+    """
+    try:
+        count = max(int(request.GET.get("recent", 50)), 0)
+    except ValueError:
+        count = 50
+    records = query_stats.recent()
+    return JsonResponse({
+        "views": query_stats.summary(records),
+        "recent": records[-count:] if count else [],
+        })
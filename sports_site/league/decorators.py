@@ -0,0 +1,64 @@
+import datetime
+import hashlib
+from core.cache import get_version
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.decorators import method_decorator
+from django.utils.http import quote_etag
+from django.views.decorators.http import condition
+from .models import LEAGUE_DATA_MODIFIED, LEAGUE_DATA_VERSION, League
+
+
+
+def _league_pk(request):
+    try:
+        return request.league_resolver.league.pk
+    except League.DoesNotExist:
+        return None
+
+
+def league_data_etag(request, *args, **kwargs):
+    """
+    ETag for a public league page, from the league's data version, the
+    full path and the session cookie, as pages differ by logged in user.
+    None without a league or a working cache, which skips the conditional
+    response.
+    """
+    league_pk = _league_pk(request)
+    if league_pk is None:
+        return None
+    version = get_version(LEAGUE_DATA_VERSION.format(league_pk))
+    if version is None:
+        return None
+    session = request.COOKIES.get(settings.SESSION_COOKIE_NAME, "")
+    key = f"{version}:{request.get_full_path()}:{session}"
+    return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+
+def league_data_last_modified(request, *args, **kwargs):
+    """When the league's data last changed, None if not since startup."""
+    league_pk = _league_pk(request)
+    if league_pk is None:
+        return None
+    modified = cache.get(LEAGUE_DATA_MODIFIED.format(league_pk))
+    if modified is None:
+        return None
+    return datetime.datetime.fromtimestamp(modified, tz=datetime.timezone.utc)
+
+
+def league_data_condition(function):
+    """
+    Sets ETag/Last-Modified on a public league page from the league data
+    version, see league/models.py, and answers a matching conditional GET
+    with 304 before the view runs. Only the league resolver is read, which
+    is served from the cache once warm, so a 304 runs no queries.
+    """
+    return condition(etag_func=league_data_etag,
+        last_modified_func=league_data_last_modified)(function)
+
+
+class LeagueDataConditionMixin:
+    """league_data_condition for class based views."""
+    @method_decorator(league_data_condition)
+    def dispatch(self, request, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
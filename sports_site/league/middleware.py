@@ -0,0 +1,18 @@
+from .resolver import LeagueResolver
+
+
+
+class LeagueResolverMiddleware:
+    """
+    Attaches a LeagueResolver for the ?league= query parameter to each
+    request as request.league_resolver. Nothing is queried until a view
+    reads request.league_resolver.league or .featured_stage.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+
+    def __call__(self, request):
+        request.league_resolver = LeagueResolver(
+            request.GET.get('league', None))
+        return self.get_response(request)
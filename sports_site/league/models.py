@@ -1,9 +1,17 @@
 import datetime
-from django.db import models
+import time
+from core.cache import bump_version
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
 from django.contrib.auth.models import User
 from django.utils.timezone import now
 
 
+LEAGUE_RESOLVER_VERSION = "league-resolver-version"
+LEAGUE_DATA_VERSION = "league-data-version:{}"
+LEAGUE_DATA_MODIFIED = "league-data-modified:{}"
+
 
 
 class League(models.Model):
@@ -21,6 +29,17 @@ class League(models.Model):
         return f"{self.name}"
 
 
+    def save(self, *args, **kwargs):
+        super(League, self).save(*args, **kwargs)
+        bump_version(LEAGUE_RESOLVER_VERSION)
+
+
+    def delete(self, *args, **kwargs):
+        deleted = super(League, self).delete(*args, **kwargs)
+        bump_version(LEAGUE_RESOLVER_VERSION)
+        return deleted
+
+
 """Season Related Models"""
 class Season(models.Model):
     year = models.CharField(max_length=10, null=False, default=now().year, help_text="Year in YYYY format, ie 2020")
@@ -30,6 +49,17 @@ class Season(models.Model):
         return f"{self.year}"
 
 
+    def save(self, *args, **kwargs):
+        super(Season, self).save(*args, **kwargs)
+        bump_version(LEAGUE_RESOLVER_VERSION)
+
+
+    def delete(self, *args, **kwargs):
+        deleted = super(Season, self).delete(*args, **kwargs)
+        bump_version(LEAGUE_RESOLVER_VERSION)
+        return deleted
+
+
 class SeasonStage(models.Model):
     STAGE_PRINT = {"R":"Regular Season","P":"Postseason", "O": "Other"}
     REGULAR = 'R'
@@ -64,6 +94,13 @@ class SeasonStage(models.Model):
                 pass
 
         super(SeasonStage, self).save(*args, **kwargs)
+        bump_version(LEAGUE_RESOLVER_VERSION)
+
+
+    def delete(self, *args, **kwargs):
+        deleted = super(SeasonStage, self).delete(*args, **kwargs)
+        bump_version(LEAGUE_RESOLVER_VERSION)
+        return deleted
 
 
 
@@ -192,3 +229,73 @@ class Game(models.Model):
         super(Game, self).save(*args, **kwargs)
 
 
+
+"""League data version
+
+Bumped whenever anything shown on a league's public pages is saved or
+deleted, see league/decorators.py league_data_condition. Models register
+with track_league_data, giving the lookup path from the model to its
+League.
+"""
+LEAGUE_DATA_PATHS = {}
+
+
+def bump_league_version(league_pk):
+    """
+    Marks the given League pk's data as changed, for code that writes
+    without save(), ie bulk_create. Waits for the current transaction to
+    commit, so a request can't get the new ETag with the old data.
+    """
+    if league_pk is None:
+        return
+
+    def bump():
+        bump_version(LEAGUE_DATA_VERSION.format(league_pk))
+        cache.set(LEAGUE_DATA_MODIFIED.format(league_pk), time.time(),
+            timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def league_pk_of(instance, path):
+    """
+    Returns the League pk of instance by following path, ie
+    "season__league" from a SeasonStage. Only the first hop is read off
+    the instance, the rest is one values_list query.
+    """
+    first, _, rest = path.partition("__")
+    field = instance._meta.get_field(first)
+    if not rest:
+        return getattr(instance, field.attname)
+    return field.related_model.objects.filter(
+        pk=getattr(instance, field.attname)).values_list(
+            rest, flat=True).first()
+
+
+def league_data_changed(sender, instance, **kwargs):
+    bump_league_version(league_pk_of(instance, LEAGUE_DATA_PATHS[sender]))
+
+
+def track_league_data(model, path="league"):
+    """
+    Bumps the league data version whenever a model object is saved or
+    deleted.
+
+    Params:
+        model - Model class.
+        path - str, lookup path from model to League, ie "season__league"
+    """
+    LEAGUE_DATA_PATHS[model] = path
+    post_save.connect(league_data_changed, sender=model)
+    post_delete.connect(league_data_changed, sender=model)
+
+
+track_league_data(League, "id")
+track_league_data(Season)
+track_league_data(SeasonStage, "season__league")
+track_league_data(Team)
+track_league_data(TeamSeason, "team__league")
+track_league_data(Roster, "team__team__league")
+track_league_data(Player)
+track_league_data(PlayerSeason, "player__league")
+track_league_data(Game, "season__season__league")
@@ -0,0 +1,56 @@
+import hashlib
+from core.cache import get_version
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from .models import LEAGUE_RESOLVER_VERSION, League, SeasonStage
+
+
+RESOLVER_CACHE_TIMEOUT = 60 * 60
+
+
+
+class LeagueResolver:
+    """
+    Resolves a league url slug, ie the ?league= query parameter, to its
+    League and featured SeasonStage. Results are kept on the resolver for
+    the rest of the request, and in the Django cache between requests
+    until a League, Season or SeasonStage is saved or deleted.
+
+    Attached to every request as request.league_resolver by
+    league/middleware.py LeagueResolverMiddleware.
+
+    Used: league/views.py, news/views.py, stats/views/views.py
+    """
+    def __init__(self, league_slug):
+        self.league_slug = league_slug
+
+
+    def _cached(self, name, lookup):
+        """
+        Returns the cached value of name for this slug, running lookup and
+        caching its result on a miss. Values are stored in a 1-tuple so a
+        None result is cached too.
+        """
+        version = get_version(LEAGUE_RESOLVER_VERSION)
+        slug_hash = hashlib.md5(str(self.league_slug).encode()).hexdigest()
+        cache_key = f"league-resolver:{version}:{slug_hash}:{name}"
+        cached = cache.get(cache_key)
+        if cached is None:
+            cached = (lookup(),)
+            cache.set(cache_key, cached, RESOLVER_CACHE_TIMEOUT)
+        return cached[0]
+
+
+    @cached_property
+    def league(self):
+        """League for the slug, raises League.DoesNotExist if none."""
+        return self._cached("league",
+            lambda: League.objects.get(url=self.league_slug))
+
+
+    @cached_property
+    def featured_stage(self):
+        """The league's featured SeasonStage, None if it has none."""
+        return self._cached("featured_stage",
+            lambda: SeasonStage.objects.select_related("season").filter(
+                season__league__url=self.league_slug, featured=True).first())
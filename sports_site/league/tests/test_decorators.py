@@ -0,0 +1,134 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from league.models import (LEAGUE_DATA_VERSION, Game, League, Player, Season,
+    SeasonStage, TeamSeason, bump_league_version, league_pk_of)
+from news.models import Article
+from stats.models import PlayerHittingGameStats
+from core.cache import get_version
+
+
+@override_settings(CACHES={"default": {
+    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    "LOCATION": "league-data-tests"}})
+class LeagueDataConditionTest(TestCase):
+    """
+    Tests league_data_condition from league/decorators.py and the league
+    data version receivers from league/models.py
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.league = League.objects.get(id=1)
+        cls.stage = SeasonStage.objects.get(id=3)
+        cls.pages = [
+            reverse("news-home"),
+            reverse("schedule-page"),
+            reverse("game-boxscore-page", args=[1]),
+            reverse("stats-page"),
+            reverse("standings-page"),
+            ]
+
+
+    def setUp(self):
+        cache.clear()
+
+
+    def get(self, url, **headers):
+        return self.client.get(url, {"league": self.league.url}, **headers)
+
+
+    def version(self):
+        return get_version(LEAGUE_DATA_VERSION.format(self.league.pk))
+
+
+    def test_not_modified_without_queries(self):
+        for url in self.pages:
+            etag = self.get(url)["ETag"]
+            with self.assertNumQueries(0):
+                response = self.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304, url)
+
+
+    def test_data_change_invalidates(self):
+        url = reverse("schedule-page")
+        etag = self.get(url)["ETag"]
+        game = Game.objects.get(id=2)
+        game.home_score = 4
+        with self.captureOnCommitCallbacks(execute=True):
+            game.save()
+        response = self.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+    def test_etag_varies_by_path_and_session(self):
+        url = reverse("stats-page")
+        etag = self.get(url)["ETag"]
+        self.assertNotEqual(self.client.get(url, {"league": self.league.url,
+            "sort": "hits"})["ETag"], etag)
+        self.client.login(username="Test", password="test")
+        self.assertEqual(self.get(url, HTTP_IF_NONE_MATCH=etag).status_code,
+            200)
+
+
+    def test_last_modified(self):
+        url = reverse("news-home")
+        self.assertFalse(self.get(url).has_header("Last-Modified"))
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_league_version(self.league.pk)
+        modified = self.get(url)["Last-Modified"]
+        response = self.get(url, HTTP_IF_MODIFIED_SINCE=modified)
+        self.assertEqual(response.status_code, 304)
+
+
+    def test_unknown_league_is_not_conditional(self):
+        with self.assertRaises(League.DoesNotExist):
+            self.client.get(reverse("schedule-page"), {"league": "missing"},
+                HTTP_IF_NONE_MATCH="*")
+
+
+    def test_models_bump_version(self):
+        version = self.version()
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.create(league=self.league, title="Bump",
+                body="Body")
+        self.assertNotEqual(self.version(), version)
+
+        version = self.version()
+        row = PlayerHittingGameStats.objects.filter(league=self.league).first()
+        row.runs += 1
+        with self.captureOnCommitCallbacks(execute=True):
+            row.save()
+        self.assertNotEqual(self.version(), version)
+
+        version = self.version()
+        with self.captureOnCommitCallbacks(execute=True):
+            Player.objects.filter(league=self.league).first().delete()
+        self.assertNotEqual(self.version(), version)
+
+
+    def test_bump_waits_for_commit(self):
+        version = self.version()
+        row = PlayerHittingGameStats.objects.filter(league=self.league).first()
+        row.runs += 1
+        with self.captureOnCommitCallbacks(execute=True):
+            row.save()
+            self.assertEqual(self.version(), version)
+        self.assertNotEqual(self.version(), version)
+
+
+    def test_other_league_does_not_bump(self):
+        other = League.objects.create(name="Other", url="OL")
+        version = self.version()
+        with self.captureOnCommitCallbacks(execute=True):
+            Season.objects.create(league=other, year="2021")
+        self.assertEqual(self.version(), version)
+
+
+    def test_league_pk_of(self):
+        self.assertEqual(league_pk_of(self.stage, "season__league"),
+            self.league.pk)
+        team_season = TeamSeason.objects.get(id=1)
+        self.assertEqual(league_pk_of(team_season, "team__league"),
+            self.league.pk)
+        self.assertEqual(league_pk_of(self.league, "id"), self.league.pk)
@@ -0,0 +1,77 @@
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from league.middleware import LeagueResolverMiddleware
+from league.models import League, SeasonStage
+from league.resolver import LeagueResolver
+
+
+@override_settings(CACHES={"default": {
+    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    "LOCATION": "resolver-tests"}})
+class LeagueResolverTest(TestCase):
+    """
+    Tests LeagueResolver from league/resolver.py
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.league = League.objects.get(url="TL")
+        cls.stage = SeasonStage.objects.get(
+            season__league=cls.league, featured=True)
+
+
+    def setUp(self):
+        cache.clear()
+
+
+    def test_resolves_league_and_featured_stage(self):
+        resolver = LeagueResolver("TL")
+        self.assertEqual(resolver.league, self.league)
+        self.assertEqual(resolver.featured_stage, self.stage)
+
+
+    def test_request_scoped(self):
+        resolver = LeagueResolver("TL")
+        resolver.league
+        resolver.featured_stage
+        with self.assertNumQueries(0):
+            resolver.league
+            str(resolver.featured_stage)
+
+
+    def test_process_cached(self):
+        LeagueResolver("TL").featured_stage
+        with self.assertNumQueries(0):
+            self.assertEqual(LeagueResolver("TL").featured_stage, self.stage)
+
+
+    def test_featured_stage_save_invalidates(self):
+        LeagueResolver("TL").featured_stage
+        other = SeasonStage.objects.create(stage=SeasonStage.POST,
+            season=self.stage.season, featured=True)
+        self.assertEqual(LeagueResolver("TL").featured_stage, other)
+
+
+    def test_league_save_invalidates(self):
+        LeagueResolver("TL").league
+        self.league.name = "Renamed League"
+        self.league.save()
+        self.assertEqual(LeagueResolver("TL").league.name, "Renamed League")
+
+
+    def test_missing_league(self):
+        with self.assertRaises(League.DoesNotExist):
+            LeagueResolver("missing").league
+        self.assertEqual(LeagueResolver("missing").featured_stage, None)
+
+
+
+class LeagueResolverMiddlewareTest(TestCase):
+    """
+    Tests LeagueResolverMiddleware from league/middleware.py
+    """
+    def test_attaches_resolver(self):
+        request = RequestFactory().get("/league/?league=TL")
+        middleware = LeagueResolverMiddleware(lambda request: request)
+        with self.assertNumQueries(0):
+            response = middleware(request)
+        self.assertEqual(response.league_resolver.league_slug, "TL")
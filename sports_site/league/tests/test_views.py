@@ -1,8 +1,13 @@
 from datetime import datetime
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from core.testing import QueryBudgetMixin
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from league.models import Game, League, Player, SeasonStage, Team, TeamSeason
-from stats.models import PlayerHittingGameStats, TeamGameStats, TeamGameLineScore
+from stats.models import (PlayerHittingGameStats, PlayerPitchingGameStats,
+    TeamGameStats, TeamGameLineScore)
 
 from stats.tables import (BattingOrderTable, PitchingOrderTable,
     PlayerHittingGameStatsTable, PlayerPageGameHittingStatsSplitsTable,
@@ -10,7 +15,7 @@ from stats.tables import (BattingOrderTable, PitchingOrderTable,
     PlayerPitchingGameStatsTable, TeamGameLineScoreTable)
 
 
-class PlayerPageViewTest(TestCase):
+class PlayerPageViewTest(QueryBudgetMixin, TestCase):
     """
     Tests player_page_view from league/views.py
     """
@@ -41,7 +46,23 @@ class PlayerPageViewTest(TestCase):
         self.assertEqual(type(response.context["last_x_table"]), PlayerPageHittingStatsSplitsTable)
 
 
-class SchedulePageViewTest(TestCase):
+    def test_split_query_parameter(self):
+        response = self.client.get(reverse('player-page', args=["1"]) +
+            "?league=TL&split=last-10&split=bogus&split=home")
+        self.assertEqual(response.status_code, 200)
+        durations = [row["duration"]
+            for row in response.context["last_x_table"].data]
+        self.assertEqual(durations, ["Last 3 Games", "Last 5 Games",
+            "Last 7 Games", "Last 10 Games", "Home"])
+
+
+    def test_query_budget(self):
+        response = self.assertQueryBudget(3, reverse('player-page', args=['1']),
+            {'league': 'TL'})
+        self.assertEqual(response.status_code, 200)
+
+
+class SchedulePageViewTest(QueryBudgetMixin, TestCase):
     """
     Tests schedule_page_view from league/views.py
     """
@@ -74,6 +95,12 @@ class SchedulePageViewTest(TestCase):
             self.assertTrue(game in response.context["schedule"])
 
 
+    def test_query_budget(self):
+        response = self.assertQueryBudget(11, reverse('schedule-page'),
+            {'league': 'TL'})
+        self.assertEqual(response.status_code, 200)
+
+
 class TeamPageViewTest(TestCase):
     """
     Tests team_page_view from league/views.py
@@ -138,7 +165,7 @@ class TeamSelectPageViewTest(TestCase):
         self.assertEqual(league, response.context["league"])
 
 
-class GameBoxscorePageViewTest(TestCase):
+class GameBoxscorePageViewTest(QueryBudgetMixin, TestCase):
     """
     Tests game_boxscore_page_view from league/views.py
     """
@@ -204,6 +231,20 @@ class GameBoxscorePageViewTest(TestCase):
         #home away exxtra, home away linescore
 
 
+    def test_query_count_bounded(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(
+                'game-boxscore-page', args="1")+"?league=TL")
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(queries), 8)
+
+
+    def test_missing_game_404(self):
+        response = self.client.get(reverse(
+            'game-boxscore-page', args=["999"])+"?league=TL")
+        self.assertEqual(response.status_code, 404)
+
+
     def test_obj_does_not_exist(self):
         league = League.objects.get(id=1)
         team = Team.objects.get(name="Team One")
@@ -221,3 +262,109 @@ class GameBoxscorePageViewTest(TestCase):
             'game-boxscore-page', args=str(game.id))+"?league=TL")
         self.assertEqual(response.status_code, 200)
 
+
+    def test_query_budget(self):
+        response = self.assertQueryBudget(8,
+            reverse('game-boxscore-page', args=['1']), {'league': 'TL'})
+        self.assertEqual(response.status_code, 200)
+
+
+
+@override_settings(CACHES={"default": {
+    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    "LOCATION": "boxscore-tests"}})
+class GameBoxscorePageCacheTest(TestCase):
+    """
+    Tests the finalized boxscore cache in game_boxscore_page_view from
+    league/views.py
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.game = Game.objects.get(stats_entered=True)
+        cls.home_stats = TeamGameStats.objects.create(
+            game=cls.game, team=cls.game.home_team)
+        TeamGameStats.objects.create(game=cls.game, team=cls.game.away_team)
+        cls.player = cls.game.home_team.roster_set.first().playerseason_set.first()
+
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse(
+            'game-boxscore-page', args=[str(self.game.pk)]) + "?league=TL"
+
+
+    def test_second_request_served_from_cache(self):
+        first = self.client.get(self.url)
+        self.assertIn("home_stats_table", first.context)
+        second = self.client.get(self.url)
+        self.assertNotIn("home_stats_table", second.context)
+        self.assertEqual(first.content, second.content)
+
+
+    def test_hitting_stats_save_invalidates(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            PlayerHittingGameStats.objects.create(
+                team_stats=self.home_stats, player=self.player, doubles=1)
+        response = self.client.get(self.url)
+        self.assertIn("home_stats_table", response.context)
+        self.assertContains(response, "One, Player")
+
+
+    def test_pitching_stats_delete_invalidates(self):
+        stats = PlayerPitchingGameStats.objects.create(
+            team_stats=self.home_stats, player=self.player)
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            stats.delete()
+        response = self.client.get(self.url)
+        self.assertIn("home_stats_table", response.context)
+
+
+    def test_linescore_save_invalidates(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            TeamGameLineScore.objects.create(game=self.home_stats)
+        response = self.client.get(self.url)
+        self.assertIn("home_stats_table", response.context)
+
+
+    def test_player_rename_invalidates(self):
+        PlayerHittingGameStats.objects.create(
+            team_stats=self.home_stats, player=self.player)
+        self.client.get(self.url)
+        player = self.player.player
+        player.first_name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            player.save()
+        response = self.client.get(self.url)
+        self.assertIn("home_stats_table", response.context)
+        self.assertContains(response, "One, Renamed")
+
+
+    def test_team_rename_invalidates(self):
+        self.client.get(self.url)
+        team = self.game.home_team.team
+        team.name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            team.save()
+        response = self.client.get(self.url)
+        self.assertIn("home_stats_table", response.context)
+
+
+    def test_not_invalidated_before_commit(self):
+        first = self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            TeamGameLineScore.objects.create(game=self.home_stats)
+            response = self.client.get(self.url)
+            self.assertNotIn("home_stats_table", response.context)
+            self.assertEqual(first.content, response.content)
+        response = self.client.get(self.url)
+        self.assertIn("home_stats_table", response.context)
+
+
+    def test_unfinalized_game_not_cached(self):
+        url = reverse('game-boxscore-page', args="1") + "?league=TL"
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertIn("home_stats_table", response.context)
@@ -1,52 +1,40 @@
-from django.core.exceptions import ObjectDoesNotExist
+import hashlib
+from core.cache import get_version
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404, render
-from stats.get_stats import (format_stats, get_stats, get_stats_aggregate,
-    get_extra_innings, get_stats_info)
-from stats.models import TeamGameStats, PlayerHittingGameStats
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from stats.get_stats import (format_stats, get_extra_innings,
+    get_player_page_stats, get_stats_info, load_boxscore)
+from stats.models import BOXSCORE_CACHE_VERSION
 from stats.tables import (BattingOrderTable, PitchingOrderTable,
     PlayerHittingGameStatsTable, PlayerPageGameHittingStatsSplitsTable,
     PlayerPageHittingStatsTable, PlayerPageHittingStatsSplitsTable,
     PlayerPitchingGameStatsTable, TeamGameLineScoreTable,)
-from .models import Game, League, Player, PlayerSeason, SeasonStage, Team
+from .decorators import league_data_condition
+from .models import Game, Player, PlayerSeason, Team
 
 
+BOXSCORE_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 def player_page_view(request, player_pk):
-    league_slug = request.GET.get('league', None)
-    league = League.objects.get(url=league_slug)
+    league = request.league_resolver.league
 
     player = get_object_or_404(Player, pk=player_pk, league=league)
     player_seasons = PlayerSeason.objects.filter(player=player)
 
-    num_games = 5
-    qs = PlayerHittingGameStats.objects.filter(
-                                            player__player=player,
-                                            player__player__league=league)
-
-    player_splits_qs = qs.filter(
-        season__featured=True).order_by("-team_stats__game__date")
-
-
-    all_stats_filters = {"season__stage": SeasonStage.REGULAR}
-    all_stats = get_stats(qs, "player_career_hitting_stats", filters=all_stats_filters)
-    player_splits = get_stats(player_splits_qs[:num_games], "last_x_hitting_date")
-    career_stats = get_stats_aggregate(qs, "player_career_hitting_stats_totals", filters=all_stats_filters)
-    last_x = [3,5,7]
-    last_x_splits = []
-    for val in last_x:
-        extra_keys = {"duration": f"Last {val} Games"}
-        last_x_splits.append(
-            get_stats_aggregate(player_splits_qs[:val], "last_x_hitting_stats_totals", extra_keys=extra_keys)
-            )
-
-    table_data = []
-    for statline in all_stats:
-        table_data.append(statline)
-    table_data.append(career_stats)
+    player_stats = get_player_page_stats(player)
+    table_data = player_stats["career_by_year"] + [player_stats["career"]]
 
     table = PlayerPageHittingStatsTable(table_data)
-    split_table = PlayerPageGameHittingStatsSplitsTable(player_splits)
-    last_x_table = PlayerPageHittingStatsSplitsTable(last_x_splits)
+    split_table = PlayerPageGameHittingStatsSplitsTable(
+        player_stats["recent_games"])
+    #?split=last-10&split=home, see stats.get_stats.HittingSplits.split
+    extra_splits = [split for split in map(player_stats["splits"].split,
+        request.GET.getlist("split")) if split is not None]
+    last_x_table = PlayerPageHittingStatsSplitsTable(
+        player_stats["last_x"] + extra_splits)
 
     context = {
         "league": league,
@@ -60,10 +48,10 @@ def player_page_view(request, player_pk):
     return render(request, "league/player_page.html", context)
 
 
+@league_data_condition
 def schedule_page_view(request):
-    league_slug = request.GET.get('league', None)
-    league = League.objects.get(url=league_slug)
-    featured_stage = SeasonStage.objects.get(season__league=league, featured=True)
+    league = request.league_resolver.league
+    featured_stage = request.league_resolver.featured_stage
     schedule = Game.objects.filter(season=featured_stage)
 
     context = {
@@ -75,10 +63,9 @@ def schedule_page_view(request):
 
 
 def team_page_view(request, team_pk):
-    league_slug = request.GET.get('league', None)
-    league = League.objects.get(url=league_slug)
+    league = request.league_resolver.league
     team = Team.objects.get(pk=team_pk)
-    featured_stage = SeasonStage.objects.get(season__league=league, featured=True)
+    featured_stage = request.league_resolver.featured_stage
 
     team_season = team.teamseason_set.all()
 
@@ -92,8 +79,7 @@ def team_page_view(request, team_pk):
 
 
 def team_select_page_view(request):
-    league_slug = request.GET.get('league', None)
-    league = League.objects.get(url=league_slug)
+    league = request.league_resolver.league
     teams = Team.objects.filter(league=league)
 
     context = {
@@ -103,42 +89,62 @@ def team_select_page_view(request):
     return render(request, "league/team_select_page.html", context)
 
 
+@league_data_condition
 def game_boxscore_page_view(request, game_pk):
-    """Page that shows all the stats for a given game, the boxscore etc."""
-    league_slug = request.GET.get('league', None)
-    league = League.objects.get(url=league_slug)
-    game = Game.objects.get(pk=game_pk)
-
-    home_game_stats = get_object_or_404(TeamGameStats, game=game, team=game.home_team)
-    home_stats = home_game_stats.playerhittinggamestats_set.all()
+    """
+    Page that shows all the stats for a given game, the boxscore etc.
+
+    Once a game's stats are entered the rendered boxscore is cached under
+    the game's boxscore version, which stats/models.py bumps whenever the
+    game or any of its stats change.
+    """
+    league = request.league_resolver.league
+
+    version = get_version(BOXSCORE_CACHE_VERSION.format(game_pk))
+    query = hashlib.md5(request.GET.urlencode().encode()).hexdigest()
+    cache_key = f"boxscore:{game_pk}:{version}:{query}"
+    boxscore_html = cache.get(cache_key)
+    if boxscore_html is not None:
+        context = {
+            "league": league,
+            "boxscore_html": mark_safe(boxscore_html),
+            }
+        return render(request, "league/game_boxscore_page.html", context)
+
+    boxscore = load_boxscore(game_pk)
+    game = boxscore["game"]
+    totals = boxscore["totals"]
+
+    home_game_stats = boxscore["home"]["game_stats"]
+    home_stats = boxscore["home"]["hitting"]
     home_stats_table = PlayerHittingGameStatsTable(home_stats)
-    home_pitching_stats = home_game_stats.playerpitchinggamestats_set.all()
+    home_pitching_stats = boxscore["home"]["pitching"]
     home_pitching_stats_table = PlayerPitchingGameStatsTable(home_pitching_stats)
 
     home_boxscore = BattingOrderTable(home_stats)
     home_pitching = PitchingOrderTable(home_pitching_stats)
-    home_extra = format_stats(get_stats_info(home_stats))
+    home_extra = format_stats(get_stats_info(home_stats, game, totals))
 
-    away_game_stats = get_object_or_404(TeamGameStats, game=game, team=game.away_team)
-    away_stats = away_game_stats.playerhittinggamestats_set.all()
+    away_game_stats = boxscore["away"]["game_stats"]
+    away_stats = boxscore["away"]["hitting"]
     away_stats_table = PlayerHittingGameStatsTable(away_stats)
-    away_pitching_stats = away_game_stats.playerpitchinggamestats_set.all()
+    away_pitching_stats = boxscore["away"]["pitching"]
     away_pitching_stats_table = PlayerPitchingGameStatsTable(away_pitching_stats)
 
     away_boxscore = BattingOrderTable(away_stats)
     away_pitching = PitchingOrderTable(away_pitching_stats)
-    away_extra = format_stats(get_stats_info(away_stats))
+    away_extra = format_stats(get_stats_info(away_stats, game, totals))
 
 
-    try:
-        home_linescore = home_game_stats.teamgamelinescore_set.all()[0]
-        away_linescore = away_game_stats.teamgamelinescore_set.all()[0]
+    home_linescore = boxscore["home"]["linescore"]
+    away_linescore = boxscore["away"]["linescore"]
+    if home_linescore and away_linescore:
         table_data = [
             get_extra_innings(away_linescore),
             get_extra_innings(home_linescore)
         ]
         boxscore_table = TeamGameLineScoreTable(table_data)
-    except (ObjectDoesNotExist, IndexError):
+    else:
         home_linescore = None
         away_linescore = None
         table_data = None
@@ -166,6 +172,10 @@ def game_boxscore_page_view(request, game_pk):
         "away_linescore": away_linescore,
         "boxscore_table": boxscore_table
         }
+    context["boxscore_html"] = render_to_string(
+        "league/game_boxscore.html", context, request)
+    if game.stats_entered:
+        cache.set(cache_key, context["boxscore_html"], BOXSCORE_CACHE_TIMEOUT)
     return render(request, "league/game_boxscore_page.html", context)
 
 
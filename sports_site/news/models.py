@@ -5,7 +5,7 @@ from django.urls import reverse
 
 from taggit.managers import TaggableManager
 from random import randint
-from league.models import League
+from league.models import League, track_league_data
 
 
 # Create your models here.
@@ -57,3 +57,5 @@ class Article(models.Model):
             self.slug = unique_slug(self, self.slug)
         super(Article, self).save(*args, **kwargs)
 
+
+track_league_data(Article)
@@ -1,4 +1,5 @@
 from django.db.models.query import QuerySet
+from core.testing import QueryBudgetMixin
 from django.test import TestCase
 from django.urls import reverse
 from league.models import Game, League, SeasonStage
@@ -6,7 +7,7 @@ from news.models import Article
 
 
 
-class HomeViewTest(TestCase):
+class HomeViewTest(QueryBudgetMixin, TestCase):
     """
     Tests home from news/views.py
     """
@@ -58,6 +59,12 @@ class HomeViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
 
 
+    def test_query_budget(self):
+        response = self.assertQueryBudget(13, reverse('news-home'),
+            {'league': 'TL'})
+        self.assertEqual(response.status_code, 200)
+
+
 class NewsDetailTest(TestCase):
     """
     Tests news_detail from news/views.py
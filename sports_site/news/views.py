@@ -4,45 +4,28 @@ from django.http import HttpResponseRedirect
 from django.shortcuts import render
 from django.utils.decorators import method_decorator
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
-from league.models import Game, League, SeasonStage
-from stats.get_stats import get_stats
-from stats.models import PlayerHittingGameStats
-from stats.stat_calc import _convert_to_str
+from league.decorators import league_data_condition
+from league.models import Game, League
+from stats.get_stats import get_league_leaders
 from .decorators import user_owns_article
 from .forms import ArticleCreateForm
 from .models import Article
 
 
 
+@league_data_condition
 def home(request):
-    league_slug = request.GET.get('league', None)
-    league = League.objects.get(url=str(league_slug))
+    league = request.league_resolver.league
     Article_data = Article.objects.filter(
         league=league).order_by('-id')[:10]
 
     """Leaders"""
-    #.first() --> bandaid fix for objects.get returning none.
-    #Should only be 1 featuerd season anyways, so currently works.
-    featured_stage = SeasonStage.objects.filter(season__league=league,
-                                             featured=True).first()
-    qs = PlayerHittingGameStats.objects.filter(
-            player__player__league=league,
-            season=featured_stage)
-
-    stats = get_stats(qs, "hitting_league_leaders")
-    if stats:
-        avg = stats.order_by('-average')[0]
-        avg["average"] = _convert_to_str(avg["average"])
-        homeruns = stats.order_by('-homeruns')[0]
-        runs_batted_in = stats.order_by('-runs_batted_in')[0]
-        runs = stats.order_by('-runs')[0]
-        stolen_bases = stats.order_by('-stolen_bases')[0]
-    else:
-        avg = None
-        homeruns = None
-        runs_batted_in = None
-        runs = None
-        stolen_bases = None
+    featured_stage = request.league_resolver.featured_stage
+    leaders = get_league_leaders(league, featured_stage)
+    stats = any(leaders.values())
+    avg, homeruns, runs_batted_in, runs, stolen_bases = (
+        next(iter(leaders[category]), None) for category in (
+            "average", "homeruns", "runs_batted_in", "runs", "stolen_bases"))
 
     """Games"""
     schedule_query = Game.objects.filter(season=featured_stage).query
@@ -151,7 +134,7 @@ class ArticlesView(ListView):
 
     def get_context_data(self, **kwargs):
         data = super().get_context_data(**kwargs)
-        data['league'] = League.objects.get(url=self.request.GET.get('league', None))
+        data['league'] = self.request.league_resolver.league
         return data
 
 
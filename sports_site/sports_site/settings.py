@@ -54,6 +54,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.QueryStatsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -61,6 +62,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'league.middleware.LeagueResolverMiddleware',
 ]
 
 ROOT_URLCONF = 'sports_site.urls'
@@ -163,6 +165,23 @@ EMAIL_PORT = 587
 EMAIL_HOST_USER = str(os.getenv('EMAIL_USER'))
 EMAIL_HOST_PASSWORD = str(os.getenv('EMAIL_PASSWORD'))
 
+#CACHE
+#Single host, no Redis. FileBasedCache is shared by every worker process,
+#so version bumps reach them all, see core/cache.py. LocMemCache is per
+#process and would leave other workers serving stale pages and 304s.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', BASE_DIR / 'cache'),
+    }
+}
+
+#QUERY STATS
+#Records query count and timings per view, see core/middleware.py.
+#Served to staff at /query-stats/ and in Server-Timing headers.
+QUERY_STATS = os.getenv("QUERY_STATS") == "True"
+QUERY_STATS_SIZE = 1000
+
 #DEFAULT AUTO FIELD
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 
@@ -187,6 +206,14 @@ if TESTING:
 
     MIGRATION_MODULES = DisableMigrations()
 
+    #Cache tests opt in with override_settings, so cached pages never
+    #outlive the test database transaction they were built from.
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        }
+    }
+
 
 
 
@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.models import User
 from .models import (TeamGameStats, PlayerHittingGameStats,
-    PlayerPitchingGameStats)
+    PlayerHittingSeasonStats, PlayerPitchingGameStats,
+    PlayerPitchingSeasonStats, TeamPitchingSeasonStats, TeamStanding)
 from .vars import SeasonStageYear
 
 
@@ -67,4 +68,18 @@ class PlayerHittingGameStatsAdmin(admin.ModelAdmin):
 class PlayerPitchingGameStatsAdmin(admin.ModelAdmin):
     list_display = ('player', 'team_stats')
 
+@admin.register(PlayerHittingSeasonStats)
+class PlayerHittingSeasonStatsAdmin(admin.ModelAdmin):
+    list_display = ('player', 'season', 'games', 'hits', 'average')
 
+@admin.register(PlayerPitchingSeasonStats)
+class PlayerPitchingSeasonStatsAdmin(admin.ModelAdmin):
+    list_display = ('player', 'season', 'innings_pitched', 'era', 'whip')
+
+@admin.register(TeamPitchingSeasonStats)
+class TeamPitchingSeasonStatsAdmin(admin.ModelAdmin):
+    list_display = ('team_season', 'innings_pitched', 'era', 'whip')
+
+@admin.register(TeamStanding)
+class TeamStandingAdmin(admin.ModelAdmin):
+    list_display = ('team', 'season', 'win', 'loss', 'tie', 'pct')
@@ -0,0 +1,211 @@
+"""
+Bulk loading of whole games, for imports and generated test leagues.
+
+A game is a dict of unsaved objects keyed by model, see write_games(), or
+for generated games a whole batch is one dict with the stat rows as
+columns, see write_game_columns(). Games, TeamGameStats and linescores
+are written with bulk_create, and the many game stat and inning rows
+under them with raw executemany inserts. Nothing goes through save(), so
+season rollups and standings are re-totaled afterwards with
+refresh_rollups().
+
+Used: management/commands/import_boxscores.py,
+    management/commands/generate_league.py
+"""
+import operator
+import numpy as np
+from django.db import connection, models
+from league.models import Game
+from .models import (InningScore, PlayerHittingGameStats,
+    PlayerHittingSeasonStats, PlayerPitchingGameStats,
+    PlayerPitchingSeasonStats, TeamGameLineScore, TeamGameStats,
+    TeamPitchingSeasonStats, TeamStanding)
+
+
+#Rollups are re-totaled this many players at a time.
+REFRESH_BATCH = 500
+
+
+def _insert_sql(model):
+    """The model's non pk fields, and an INSERT of one row of them."""
+    fields = [field for field in model._meta.concrete_fields
+        if not field.primary_key]
+    quote = connection.ops.quote_name
+    sql = (f"INSERT INTO {quote(model._meta.db_table)} "
+        f"({', '.join(quote(field.column) for field in fields)}) "
+        f"VALUES ({', '.join(['%s'] * len(fields))})")
+    return fields, sql
+
+
+def _execute(sql, values):
+    if values:
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, values)
+    return len(values)
+
+
+def insert_rows(model, rows):
+    """
+    Inserts rows, dicts of field attname: value, with one executemany.
+    Fields a row leaves out get their model default. Used for the game
+    stat and inning rows, where building a model instance and compiling
+    its SQL per row is most of bulk_create's time.
+
+    Returns the number of rows inserted.
+    """
+    fields, sql = _insert_sql(model)
+    defaults = {field.attname: field.get_default() for field in fields}
+    dates = [field.attname for field in fields
+        if isinstance(field, models.DateField)]
+    row_values = operator.itemgetter(*defaults)
+    adapt_date = connection.ops.adapt_datefield_value
+    values = []
+    for row in rows:
+        row = {**defaults, **row}
+        for attname in dates:
+            row[attname] = adapt_date(row[attname])
+        values.append(row_values(row))
+    return _execute(sql, values)
+
+
+def insert_columns(model, columns):
+    """
+    insert_rows() from columns, a dict of field attname: sequence or NumPy
+    array, all the same length, so no dict is built per row. Fields
+    missing from columns get their model default.
+
+    Returns the number of rows inserted.
+    """
+    fields, sql = _insert_sql(model)
+    count = len(next(iter(columns.values())))
+    adapt_date = connection.ops.adapt_datefield_value
+    values = []
+    for field in fields:
+        column = columns.get(field.attname)
+        if column is None:
+            column = [field.get_default()] * count
+        elif isinstance(column, np.ndarray):
+            #sqlite3 and most drivers can't adapt NumPy scalars.
+            column = column.tolist()
+        if isinstance(field, models.DateField):
+            column = [adapt_date(value) for value in column]
+        values.append(column)
+    return _execute(sql, list(zip(*values)))
+
+
+def linescore_objects(runs, team_stats):
+    """
+    A TeamGameLineScore and its InningScore rows, as its save() would
+    write them, from runs by inning including extras.
+
+    Params:
+        runs - list of runs by inning, ie [0, 1, 0, 2, 0, 0, 0, 1, 0]
+        team_stats - TeamGameStats, saved or not.
+    """
+    innings = len(TeamGameLineScore.INNINGS)
+    runs = [int(inning_runs) for inning_runs in runs]
+    extras = runs[innings:]
+    runs = runs[:innings] + [0] * (innings - len(runs))
+    linescore = TeamGameLineScore(game=team_stats,
+        extras="-".join(map(str, extras)) or "None",
+        **dict(zip(TeamGameLineScore.INNINGS, runs)))
+    return linescore, [
+        {"linescore": linescore, "inning": inning, "runs": inning_runs}
+        for inning, inning_runs in enumerate(runs + extras, start=1)]
+
+
+def write_games(games):
+    """
+    Inserts a chunk of games, parents first. Returns the rows written.
+
+    Each game is a dict of:
+        Game, TeamGameStats, TeamGameLineScore - lists of unsaved objects.
+        PlayerHittingGameStats, PlayerPitchingGameStats - lists of row
+            dicts for insert_rows(), holding their TeamGameStats under
+            "team_stats" and Game under "game", or "_game" for pitching,
+            until those have pks.
+        InningScore - row dicts holding their TeamGameLineScore under
+            "linescore", see linescore_objects().
+    """
+    def rows(model):
+        return [row for game in games for row in game[model]]
+
+    written = 0
+    for model in [Game, TeamGameStats]:
+        written += len(model.objects.bulk_create(rows(model)))
+    for model, game_field in [(PlayerHittingGameStats, "game"),
+            (PlayerPitchingGameStats, "_game")]:
+        stat_rows = rows(model)
+        for row in stat_rows:
+            row["team_stats_id"] = row.pop("team_stats").pk
+            row[f"{game_field}_id"] = row.pop(game_field).pk
+        written += insert_rows(model, stat_rows)
+    written += len(TeamGameLineScore.objects.bulk_create(
+        rows(TeamGameLineScore)))
+    innings = rows(InningScore)
+    for row in innings:
+        row["linescore_id"] = row.pop("linescore").pk
+    return written + insert_rows(InningScore, innings)
+
+
+def write_game_columns(objects):
+    """
+    Inserts a batch of games from columns, parents first. Returns the rows
+    written.
+
+    objects is a dict of:
+        Game, TeamGameStats, TeamGameLineScore - lists of unsaved objects.
+        PlayerHittingGameStats, PlayerPitchingGameStats - columns for
+            insert_columns(), with "team_stats" holding each row's index
+            in the TeamGameStats list, which its game, date, season and
+            league are taken from.
+        InningScore - columns with "linescore" holding each row's index in
+            the TeamGameLineScore list.
+    """
+    written = 0
+    for model in [Game, TeamGameStats, TeamGameLineScore]:
+        written += len(model.objects.bulk_create(objects[model]))
+
+    team_stats = objects[TeamGameStats]
+    #bulk_create drops the TeamGameStats' cached games, don't refetch them.
+    dates = {game.pk: game.date for game in objects[Game]}
+    parents = {
+        "team_stats_id": np.array([stats.pk for stats in team_stats]),
+        "season_id": np.array([stats.season_id for stats in team_stats]),
+        "league_id": np.array([stats.league_id for stats in team_stats]),
+        "game_date": np.array([dates[stats.game_id] for stats in team_stats]),
+        }
+    game_pks = np.array([stats.game_id for stats in team_stats])
+    for model, game_field in [(PlayerHittingGameStats, "game_id"),
+            (PlayerPitchingGameStats, "_game_id")]:
+        columns = dict(objects[model])
+        index = columns.pop("team_stats")
+        columns.update({attname: column[index]
+            for attname, column in parents.items()})
+        columns[game_field] = game_pks[index]
+        written += insert_columns(model, columns)
+
+    columns = dict(objects[InningScore])
+    linescore_pks = np.array([line.pk for line in objects[TeamGameLineScore]])
+    columns["linescore_id"] = linescore_pks[columns.pop("linescore")]
+    return written + insert_columns(InningScore, columns)
+
+
+def refresh_rollups(season_pk, player_pks, team_pks):
+    """
+    Re-totals the season rollups and standings of a stage after
+    write_games().
+
+    Params:
+        season_pk - SeasonStage pk.
+        player_pks - {"hitting": PlayerSeason pks, "pitching": ...}
+        team_pks - TeamSeason pks with pitching rows.
+    """
+    for model, pks in [(PlayerHittingSeasonStats, player_pks["hitting"]),
+            (PlayerPitchingSeasonStats, player_pks["pitching"])]:
+        pks = sorted(pks)
+        for start in range(0, len(pks), REFRESH_BATCH):
+            model.refresh_many(pks[start:start + REFRESH_BATCH], season_pk)
+    for team_pk in team_pks:
+        TeamPitchingSeasonStats.refresh(team_pk)
+    TeamStanding.rebuild(season_pk=season_pk)
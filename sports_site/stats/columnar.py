@@ -0,0 +1,194 @@
+"""
+Columnar ratio stats, for pages and exports that show many aggregated
+rows at once. The ratio columns of a whole batch of rows are computed
+over NumPy arrays, and their display strings formatted in one pass,
+instead of one _calc_*/_convert_to_str call per row and cell.
+
+Output matches the scalar functions in stat_calc.py exactly.
+"""
+import numpy as np
+
+from .stat_calc import (_convert_to_str, _convert_to_str_ip,
+    _convert_to_str_pitching)
+
+
+HITTING_RATIOS = ["average", "on_base_percentage", "slugging_percentage",
+    "on_base_plus_slugging"]
+PITCHING_RATIOS = ["era", "whip"]
+
+
+def _column(rows, stat):
+    """Float array of stat over rows, missing values as 0."""
+    return np.fromiter((row.get(stat) or 0 for row in rows), dtype=float,
+        count=len(rows))
+
+
+def _values(values):
+    """Float array of values, None as NaN."""
+    return np.array([np.nan if value is None else value for value in values],
+        dtype=float)
+
+
+def _ratio(top, bottom):
+    """top / bottom, NaN where bottom is 0."""
+    return np.divide(top, bottom, out=np.full_like(top, np.nan),
+        where=bottom != 0)
+
+
+def _format(values, spec, width, convert):
+    """
+    Formats values with spec, dropping the leading 0, ie 0.300 -> ".300".
+    Values the spec doesn't render the way convert does, negatives and
+    anything wider than width, go through convert instead.
+    """
+    text = np.char.lstrip(np.char.mod(spec, np.nan_to_num(values)), "0")
+    text = text.astype(object)
+    odd = (values < 0) | (np.char.str_len(text.astype(str)) > width)
+    for i in np.flatnonzero(odd):
+        text[i] = convert(float(values[i]))
+    text[np.isnan(values)] = ".000"
+    return text
+
+
+def format_ratios(values):
+    """
+    Display strings for hitting ratios, same as _convert_to_str.
+
+    Params:
+        values - sequence of floats or None.
+    """
+    values = _values(values)
+    text = _format(values, "%.3f", 5, _convert_to_str)
+    text[values == 0] = ".000"
+    return text.tolist()
+
+
+def format_pitching_ratios(values):
+    """
+    Display strings for ERA/WHIP, same as _convert_to_str_pitching.
+
+    Params:
+        values - sequence of floats or None.
+    """
+    values = _values(values)
+    text = _format(values, "%.2f", 4, _convert_to_str_pitching)
+    text[values == 0] = "0.00"
+    return text.tolist()
+
+
+def format_innings(values):
+    """
+    Display strings for innings pitched, same as _convert_to_str_ip,
+    ie 5.333 -> "5.1".
+
+    Params:
+        values - sequence of floats or None.
+    """
+    values = _values(values)
+    clean = np.nan_to_num(values)
+    remainder = np.char.mod("%.2f", np.mod(clean, 1))
+    thirds = np.where(remainder == "0.33", ".1",
+        np.where(remainder == "0.67", ".2", ".0"))
+    text = np.char.add(np.floor(clean).astype(np.int64).astype(str), thirds)
+    text = text.astype(object)
+    for i in np.flatnonzero(clean < 0):
+        text[i] = _convert_to_str_ip(float(values[i]))
+    text[values == 0] = "0.0"
+    text[np.isnan(values)] = ".000"
+    return text.tolist()
+
+
+def format_outs(outs):
+    """
+    Innings pitched display strings from outs recorded, same as
+    formatters.format_outs, ie 20 -> "6.2".
+
+    Params:
+        outs - sequence of ints.
+    """
+    outs = np.asarray(outs, dtype=np.int64)
+    return np.char.add(np.char.add((outs // 3).astype(str), "."),
+        (outs % 3).astype(str)).tolist()
+
+
+def hitting_ratio_columns(rows):
+    """
+    AVG/OBP/SLG/OPS arrays for rows of summed hitting stats, NaN where
+    the denominator is 0.
+
+    Params:
+        rows - sequence of dicts with hits, at_bats, walks, hit_by_pitch,
+            sacrifice_flies, doubles, triples, homeruns.
+    """
+    hits = _column(rows, "hits")
+    at_bats = _column(rows, "at_bats")
+    on_base = hits + _column(rows, "walks") + _column(rows, "hit_by_pitch")
+    total_bases = (hits + _column(rows, "doubles") +
+        _column(rows, "triples") * 2 + _column(rows, "homeruns") * 3)
+
+    average = _ratio(hits, at_bats)
+    obp = _ratio(on_base, on_base - hits + at_bats +
+        _column(rows, "sacrifice_flies"))
+    slugging = _ratio(total_bases, at_bats)
+    return {
+        "average": average,
+        "on_base_percentage": obp,
+        "slugging_percentage": slugging,
+        "on_base_plus_slugging": obp + slugging,
+        }
+
+
+def pitching_ratio_columns(rows):
+    """
+    ERA/WHIP arrays for rows of summed pitching stats, worked out from
+    outs recorded. NaN without outs.
+
+    Params:
+        rows - sequence of dicts with earned_runs, walks_allowed,
+            hits_allowed, outs_recorded.
+    """
+    outs = _column(rows, "outs_recorded")
+    return {
+        "era": _ratio(_column(rows, "earned_runs") * 27, outs),
+        "whip": _ratio((_column(rows, "walks_allowed") +
+            _column(rows, "hits_allowed")) * 3, outs),
+        }
+
+
+def _add_columns(rows, columns, formatter):
+    for stat, values in columns.items():
+        ratios = [None if np.isnan(value) else value
+            for value in values.tolist()]
+        for row, value, text in zip(rows, ratios, formatter(values)):
+            row[stat] = value
+            row[f"{stat}_display"] = text
+
+
+def add_hitting_ratios(rows):
+    """
+    Sets the hitting ratio stats on each row, and their display strings
+    under "<stat>_display", ie row["average_display"] = ".300". Ratios
+    with a 0 denominator are None, like the season rollups.
+
+    Params:
+        rows - list of dicts, see hitting_ratio_columns.
+    """
+    rows = list(rows)
+    _add_columns(rows, hitting_ratio_columns(rows), format_ratios)
+    return rows
+
+
+def add_pitching_ratios(rows):
+    """
+    Sets ERA/WHIP on each row and the display strings for them and
+    innings pitched, from outs recorded, see add_hitting_ratios.
+
+    Params:
+        rows - list of dicts, see pitching_ratio_columns.
+    """
+    rows = list(rows)
+    _add_columns(rows, pitching_ratio_columns(rows), format_pitching_ratios)
+    innings = format_outs([row.get("outs_recorded") or 0 for row in rows])
+    for row, text in zip(rows, innings):
+        row["innings_pitched_display"] = text
+    return rows
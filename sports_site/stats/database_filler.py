@@ -1,10 +1,33 @@
 from league.models import League, Game, SeasonStage
-from random import randint, choice
-from django.db.models import  Sum
-from math import floor
+from stats.models import (InningScore, PlayerHittingGameStats,
+    PlayerPitchingGameStats, TeamGameLineScore, TeamGameStats)
+import datetime
+import numpy as np
 
 
 
+"""Database filler
+
+Random games for generated test leagues, see
+management/commands/generate_league.py. Every generator takes a NumPy
+random Generator, so the same seed gives the same league, and works on
+arrays over a whole batch of games at once, one row per team in a game,
+its "side", home then away, ie sides 0 and 1 are game 0. random_games()
+puts them together for stats/bulk_load.py write_game_columns().
+"""
+#Opposing hitting totals and the pitching stat they're charged to by outs.
+#Hits, walks and hit batters follow runs instead, see random_pitching_stats.
+HITTING_ALLOWED = [("strikeouts", "strikeouts"),
+    ("caught_stealing", "runners_caught_stealing"),
+    ("stolen_bases", "stolen_bases_allowed")]
+INNINGS = 9
+TOTAL_OUTS = INNINGS * 3
+#Starters go 5 to 7 innings, high end exclusive.
+STARTER_OUTS = (15, 22)
+#A starter and up to 2 relievers a game.
+MAX_PITCHERS = 3
+
+
 def get_league(url="SBBL"):
     """Gets and returns league model object based of url slug."""
     league = League.objects.get(url=url)
@@ -23,592 +46,339 @@ def get_games(season_stage):
     return games
 
 
-def create_schedule(dates, games, team_dict):
+def random_schedule(rng, team_count, games, start):
+    """
+    A round robin schedule, every team playing games games, or one short
+    when the team count leaves it without an opponent. Home and away
+    alternate by round, and with an odd team count one team sits out each
+    round. Returns dates and games for create_schedule().
+
+    Params:
+        team_count - Number of teams, scheduled by index 0 to team_count-1.
+        games - Games per team.
+        start - datetime.date of the first round, one round a day.
+    """
+    teams = [int(team) for team in rng.permutation(team_count)]
+    if team_count % 2:
+        teams.append(None)
+    played = dict.fromkeys(range(team_count), 0)
+    dates, schedule = [], []
+    day = 0
+    while sum(count < games for count in played.values()) > 1:
+        half = len(teams) // 2
+        pairs = [(teams[i], teams[-1 - i]) for i in range(half)]
+        round_games = []
+        for away, home in pairs:
+            if away is None or home is None:
+                continue
+            if played[away] >= games or played[home] >= games:
+                continue
+            if day % 2:
+                away, home = home, away
+            round_games.append((away, home))
+            played[away] += 1
+            played[home] += 1
+        if round_games:
+            dates.append(start + datetime.timedelta(days=day))
+            schedule.append(round_games)
+        #Circle method, the first team stays put and the rest rotate.
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+        day += 1
+    return dates, schedule
+
+
+def create_schedule(season_stage, dates, games, team_dict):
     """
     Creates a schedule given list of dates, a same len list of games
-    for said date, and a team_dict to map numbers from games to
-    teamseason objects.
+    for said date, and a team_dict to map the teams in games to
+    teamseason objects. Returns the unsaved games.
     Params:
+        season_stage - SeasonStage the games are played in.
         dates - list of dates using datetime.date objects.
         games - list of lists of games, outer list being list of games,
-            inner lists being the list of games for given date,
+            inner lists being the (away, home) pairs for given date,
         team_dict - dictionary value that maps to proper team.
     """
-    ss = SeasonStage.objects.all()[2]
-    for i in range(len(games)):
-        game_date = dates[i]
-        for value in games[i]:
-            new_game = Game(season=ss, home_team=team_dict[str(value)[1]],
-                away_team=team_dict[str(value)[0]], date=game_date)
-            new_game.save()
+    schedule = []
+    for game_date, date_games in zip(dates, games):
+        for away, home in date_games:
+            home_team = team_dict[home]
+            schedule.append(Game(season=season_stage, home_team=home_team,
+                away_team=team_dict[away], date=game_date,
+                location=f"{home_team.team.place}"))
+    return schedule
 
 
-def random_hitting_stats(pgs):
+def random_hitting_stats(rng, count):
     """
-    Params:
-        pgs - player game stats queryset.
+    Hitting stat columns for count hitters, 3 to 5 at bats each, hits
+    never more than at bats and runs never more than times on base.
+    RBI are left to random_runs_batted_in().
     """
-    for p in pgs:
-        ab = 3 + randint(0,2)
-        bb = randint(0, 5-ab)
-        hbp = randint(0,1)
-        pa = ab + bb + hbp
-        singles = randint(0, ab)
-        doubles = 0
-        triples = 0
-        hr = 0
-        xb = randint(0,3)
-        if xb in (1,2,3):
-                if xb == 1:
-                    doubles = 1
-                elif xb == 2:
-                    triples = 1
-                elif xb == 3:
-                    hr = 1
-        k = 0
-        if (singles + doubles + triples + hr) < ab:
-            k = randint(0, ab-(singles + doubles + triples + hr))
-        runs = randint(0,10)
-        run = rbi = hr
-        if runs in (4,5,6):
-            run = 1 + hr
-        if runs in (1,2,3):
-            rbi = 1 + hr
-        p.at_bats = ab
-        p.plate_appearances = pa
-        p.runs = run
-        p.strikeouts = k
-        p.walks = bb
-        p.singles = singles
-        p.doubles = doubles
-        p.triples = triples
-        p.homeruns = hr
-        p.runs_batted_in = rbi
-        p.hit_by_pitch = hbp
-        sb = randint(0,10)
-        if sb == 9:
-            p.stolen_bases = 1
-        elif sb == 6:
-            p.stolen_bases = 1
-        p.save()
-
-
-def tally_game_runs(games_queryset):
-    games = games_queryset
-
-    for game in games:
-        tgs = game.teamgamestats_set.all()
-        for team in tgs:
-            ps = team.playerhittinggamestats_set.all()
-            runs = 0
-            for p in ps:
-                runs += p.runs
-            if team.team == game.home_team:
-                game.home_score = runs
-            elif team.team == game.away_team:
-                game.away_score = runs
-            game.save()
-
-
-def equalize_runs_rbis(games_queryset):
-    games = games_queryset
-    for game in games:
-        tgs = game.teamgamestats_set.all()
-        for team in tgs:
-            ps = team.playerhittinggamestats_set.all()
-            runs = 0
-            rbi = 0
-            for p in ps:
-                runs += p.runs
-                rbi += p.runs_batted_in
-            if rbi > runs:
-                for p in ps:
-                    if p.runs < (p.hits + p.walks + p.hit_by_pitch):
-                        p.runs += (rbi - runs)
-                        p.save()
-                        break
-
-
-def create_pitching_stats(tgs):
+    ab = rng.integers(3, 6, count)
+    bb = rng.integers(0, 6 - ab)
+    hbp = rng.integers(0, 2, count)
+    singles = rng.integers(0, ab + 1)
+    extra_bases = np.where(singles < ab, rng.integers(0, 4, count), 0)
+    doubles = (extra_bases == 1).astype(np.int64)
+    triples = (extra_bases == 2).astype(np.int64)
+    hr = (extra_bases == 3).astype(np.int64)
+    hits = singles + doubles + triples + hr
+    roll = rng.integers(0, 11, count)
+    return {
+        "at_bats": ab,
+        "plate_appearances": ab + bb + hbp,
+        "runs": np.minimum(hr + ((roll >= 4) & (roll <= 6)), hits + bb + hbp),
+        "strikeouts": rng.integers(0, ab - hits + 1),
+        "walks": bb,
+        "singles": singles,
+        "doubles": doubles,
+        "triples": triples,
+        "homeruns": hr,
+        "hits": hits,
+        "hit_by_pitch": hbp,
+        "stolen_bases": np.isin(rng.integers(0, 11, count),
+            (6, 9)).astype(np.int64),
+        "caught_stealing": np.zeros(count, dtype=np.int64),
+        }
+
+
+def random_runs_batted_in(rng, hitting, lineup):
     """
+    RBI column adding up to each side's runs. Homeruns drive in their
+    hitter, the rest go to the side's hitters weighted by their other hits.
+
     Params:
-        tgs - TeamGameStats object
+        hitting - random_hitting_stats() columns, lineup rows per side.
+        lineup - Hitters per side.
     """
-    for game in tgs:
-        pgs = game.playerpitchinggamestats_set.all()
+    runs = hitting["runs"].reshape(-1, lineup)
+    hr = hitting["homeruns"].reshape(-1, lineup)
+    weights = hitting["hits"].reshape(-1, lineup) - hr + 0.5
+    rbi = hr + rng.multinomial(runs.sum(axis=1) - hr.sum(axis=1),
+        weights / weights.sum(axis=1, keepdims=True))
+    return rbi.ravel()
 
 
-        team1 = pgs[0].team_stats
-        team_one = []
-        team_two = []
-        for player in pgs:
-            if player.team_stats == team1:
-                team_one.append(player)
-            else:
-                team_two.append(player)
+def side_totals(hitting, lineup):
+    """Each side's total of every hitting column."""
+    return {stat: column.reshape(-1, lineup).sum(axis=1)
+        for stat, column in hitting.items()}
 
-        tgs1 = team_one[0].team_stats
-        tgs2 = team_two[0].team_stats
 
+def random_linescore(rng, runs):
+    """Runs by inning, (sides, 9), a random split of each side's runs."""
+    return rng.multinomial(runs, np.full(INNINGS, 1 / INNINGS))
 
-        random_pitching_stats(team_one, tgs1, tgs2)
-        random_pitching_stats(team_two, tgs2, tgs1)
 
+def random_pitching_innings(rng, pitchers, sides):
+    """
+    Outs recorded, (sides, pitchers), each side's 27 outs split between a
+    starter going 5 to 7 innings and 0 to pitchers-1 relievers, unused
+    slots 0. Returns the outs and the pitchers used by each side.
 
-def total_hitting_stats(hqs):
-    """Totals up a queryset of players hitting stats in a game.
     Params:
-        hgs - Queryset of PlayerHittingGameStats"""
-
+        pitchers - Most pitchers a side uses, at most MAX_PITCHERS.
+    """
+    used = rng.integers(1, pitchers + 1, sides)
+    outs = np.zeros((sides, pitchers), dtype=np.int64)
+    outs[:, 0] = np.where(used == 1, TOTAL_OUTS,
+        rng.integers(*STARTER_OUTS, sides))
+    rest = TOTAL_OUTS - outs[:, 0]
+    if pitchers > 1:
+        first = np.where(used == 3, rng.integers(1, np.maximum(rest, 2)),
+            rest)
+        outs[:, 1] = np.where(used >= 2, first, 0)
+    if pitchers > 2:
+        outs[:, 2] = np.where(used == 3, rest - first, 0)
+    return outs, used
+
+
+def _split(weights, weight_totals, totals, used):
+    """
+    Splits each side's total over its pitchers by weight, rounded down,
+    the last pitcher used taking the rest.
+    """
+    sides = np.arange(len(totals))
+    shares = weights * totals[:, None] // np.maximum(weight_totals, 1)[:, None]
+    shares[sides, used - 1] = 0
+    shares[sides, used - 1] = totals - shares.sum(axis=1)
+    return shares
 
-    return_stats = hqs.aggregate(
-        at_bats = Sum('at_bats'),
-        plate_appearances = Sum('plate_appearances'),
-        runs = Sum('runs'),
-        hits = Sum('hits'),
-        doubles = Sum('doubles'),
-        triples = Sum('triples'),
-        homeruns = Sum('homeruns'),
-        runs_batted_in = Sum('runs_batted_in'),
-        walks = Sum('walks'),
-        strikeouts = Sum('strikeouts'),
-        stolen_bases = Sum('stolen_bases'),
-        caught_stealing = Sum('caught_stealing'),
-        hit_by_pitch = Sum('hit_by_pitch'),
-        sacrifice_flies = Sum('sacrifice_flies'),
-        )
 
-    return return_stats
+def _split_capped(weights, weight_totals, totals):
+    """
+    Splits each side's total over its pitchers by weight, rounded down,
+    the rest going to the latest pitchers with room, so no pitcher gets
+    more than their weight. Totals must not be more than weight_totals.
+    """
+    shares = weights * totals[:, None] // np.maximum(weight_totals, 1)[:, None]
+    rest = totals - shares.sum(axis=1)
+    room = (weights - shares)[:, ::-1]
+    before = room.cumsum(axis=1) - room
+    return shares + np.clip(rest[:, None] - before, 0, room)[:, ::-1]
 
 
-"""
-For random_pitching_innings: Copy base into bash, tabs are spaces.
-from stats.models import TeamGameStats
-from league.models import SeasonStage
-from stats.database_filler import random_pitching_innings
-ss = SeasonStage.objects.all()[2]
-tgs = TeamGameStats.objects.all().filter(season=ss, game__date__year=2021)
-for game in tgs:
-    pgs = game.playerpitchinggamestats_set.all()
-    random_pitching_innings(pgs)
-    print('Done')
-"""
-def random_pitching_innings(pgs):
+def random_pitching_stats(outs, used, opponent, charged):
     """
+    Charges the opposing hitting totals to each side's pitchers, as
+    pitching stat columns of shape (sides, pitchers). Each pitcher first
+    gets a baserunner for every run they allowed other than homeruns, and
+    the rest of the hits, walks and hit batters, and the other totals, are
+    split by outs recorded. So a pitcher's homeruns are part of their hits,
+    and their runs never outnumber their baserunners.
+
     Params:
-        pgs - List of all PlayerPitchingGameStats for a team in a game.
-        tgs1 - TeamGameStats of the team listed in pgs
-        tgs2 - TeamGameStats of opposing team
+        opponent - side_totals() of each side's opponent.
+        charged - random_pitching_runs() of the same sides.
     """
-    starter_innings = [5, 5.1, 5.2, 6, 6.1, 6.2, 7]
-    inning_outs = {0:0, 0.1:1, 0.2:2, 1:3, 1.1:4, 1.2:5, 2:6, 2.1:7, 2.2:8, 3:9,
-        3.1:10, 3.2:11, 4:12, 4.1:13, 4.2:14, 5:15, 5.1:16, 5.2:17, 6:18,
-        6.1:19, 6.2:20, 7:21, 7.1:22, 7.2:23, 8:24, 8.1:25, 8.2:26, 9:27}
-    outs_inning = {0: 0, 1: 0.1, 2: 0.2, 3: 1, 4: 1.1, 5: 1.2, 6: 2, 7: 2.1,
-        8: 2.2, 9: 3, 10: 3.1, 11: 3.2, 12: 4, 13: 4.1, 14: 4.2, 15: 5, 16: 5.1,
-        17: 5.2, 18: 6, 19: 6.1, 20: 6.2, 21: 7, 22: 7.1, 23: 7.2, 24: 8,
-        25: 8.1, 26: 8.2, 27: 9}
-    totals_outs = 27
-    pitchers = len(pgs)
-
-    starter = False
-
-    if len(pgs) == 1 and starter == False:
-        pgs[0].complete_game == 1
-        pgs[0].innings_pitched == 9
-
-    for player in pgs:
-        if starter == False:
-            player.innings_pitched = choice(starter_innings)
-
-            player.game_started = 1
-            player.game = 1
-            starter = True
-            starter_outs = inning_outs[player.innings_pitched]
-            player._innings = starter_outs/3
-            totals_outs -= starter_outs
-            pitchers -= 1
-        elif pitchers == 1:
-            player.innings_pitched = outs_inning[totals_outs]
-            player._innings = totals_outs/3
-
-            player.game = 1
-        else:
-            possible_outs = totals_outs - pitchers
-            if possible_outs > 1:
-                random_outs = randint(1,possible_outs)
-                player.innings_pitched = outs_inning[random_outs]
-                player._innings = random_outs/3
-            elif possible_outs == 1:
-                player.innings_pitched = possible_outs
-                player._innings = possible_outs/3
-            else:
-                pass
-
-            real_outs = inning_outs[player.innings_pitched]
-
-            totals_outs -= real_outs
-            pitchers -= 1
-            player.game = 1
-
-
-        player.save()
-
-
-'''
-For random_pitching_stats: Copy base into bash, tabs are spaces.
-
-from stats.models import TeamGameStats
-from league.models import SeasonStage, Game
-from stats.database_filler import random_pitching_stats
-ss = SeasonStage.objects.all()[2]
-games = Game.objects.all().filter(season=ss, date__year=2021)
-for game in games:
-    tgs = game.teamgamestats_set.all()
-    tgs1 = tgs[0]
-    tgs2 = tgs[1]
-    for g in tgs:
-        print(g, end='')
-        pgs = g.playerpitchinggamestats_set.all()
-        if g == tgs1:
-            random_pitching_stats(pgs, g, tgs2)
-        else:
-            random_pitching_stats(pgs, g, tgs1)
-    print("Done Game")
-'''
-def random_pitching_stats(pgs, tgs1, tgs2):
+    totals = np.full(len(outs), TOTAL_OUTS)
+    columns = {pitching: _split(outs, totals, opponent[hitting], used)
+        for hitting, pitching in HITTING_ALLOWED}
+
+    homeruns = charged["homeruns_allowed"]
+    needed = charged["runs_allowed"] - homeruns
+    other_hits = opponent["hits"] - opponent["homeruns"]
+    free = opponent["walks"] + opponent["hit_by_pitch"]
+    baserunners = needed + _split(outs, totals,
+        other_hits + free - needed.sum(axis=1), used)
+    hits = _split_capped(baserunners, other_hits + free, other_hits)
+    free_baserunners = baserunners - hits
+    walks = _split_capped(free_baserunners, free, opponent["walks"])
+    columns.update({"hits_allowed": hits + homeruns, "walks_allowed": walks,
+        "hit_batters": free_baserunners - walks})
+    return columns
+
+
+def inning_pitchers(outs):
+    """Slot of the pitcher in to start each inning, (sides, 9)."""
+    ends = outs.cumsum(axis=1)
+    ends[outs == 0] = TOTAL_OUTS
+    starts = np.arange(INNINGS) * 3
+    return (ends[:, :, None] <= starts[None, None, :]).sum(axis=1)
+
+
+def random_pitching_runs(outs, used, linescore_against, opponent):
     """
-    Params:
-        pgs - List of all PlayerPitchingGameStats for a team in a game.
-        tgs1 - TeamGameStats of the team listed in pgs
-        tgs2 - TeamGameStats of opposing team
+    Charges each inning's runs to the pitcher who started it, and the
+    opposing homeruns by runs allowed, never more than a pitcher's runs
+    allowed. Generated games have no errors, so every run is earned and
+    earned_runs is always runs_allowed.
 
+    Params:
+        linescore_against - Opposing runs by inning, (sides, 9).
+        opponent - side_totals() of each side's opponent.
     """
-    inning_outs = {0:0, 0.1:1, 0.2:2, 1:3, 1.1:4, 1.2:5, 2:6, 2.1:7, 2.2:8, 3:9,
-        3.1:10, 3.2:11, 4:12, 4.1:13, 4.2:14, 5:15, 5.1:16, 5.2:17, 6:18,
-        6.1:19, 6.2:20, 7:21, 7.1:22, 7.2:23, 8:24, 8.1:25, 8.2:26, 9:27}
-
-    total_outs = 27
-
-    ths2 = total_hitting_stats(tgs2.playerhittinggamestats_set.all())
-    total_hits = hits_left = ths2["hits"]
-    total_bb = bb_left = ths2["walks"]
-    total_k = k_left = ths2["strikeouts"]
-    total_sb = sb_left = ths2["stolen_bases"]
-    total_cs = cs_left = ths2["caught_stealing"]
-    total_hbp = hbp_left = ths2["hit_by_pitch"]
-
-    last_player = pgs.last()
-    for player in pgs:
-        pitch_outs = inning_outs[player.innings_pitched]
-
-        #hits:
-        if player == last_player:
-            if hits_left > 0:
-                hits_allowed = hits_left
-            else:
-                hits_allowed = 0
-        elif hits_left:
-            hits_allowed = floor((pitch_outs/total_outs)*total_hits)
-            hits_left -= hits_allowed
-        else:
-            hits_allowed = 0
-        player.hits_allowed = hits_allowed
-
-        #walks:
-        if player == last_player:
-            if bb_left > 0:
-                bb_allowed = bb_left
-            else:
-                bb_allowed = 0
-        elif bb_left:
-            bb_allowed = floor((pitch_outs/total_outs)*total_bb)
-            bb_left -= bb_allowed
-        else:
-            bb_allowed = 0
-        player.walks_allowed = bb_allowed
-
-        #hit by pitch
-        if player == last_player:
-            if hbp_left > 0:
-                hbp_allowed = hbp_left
-            else:
-                hbp_allowed = 0
-        elif hbp_left:
-            hbp_allowed = floor((pitch_outs/total_outs)*total_hbp)
-            hbp_left -= hbp_allowed
-        else:
-            hbp_allowed = 0
-        player.hit_batters = hbp_allowed
-
-        #strikeouts
-        if player == last_player:
-            if k_left > 0:
-                k_allowed = k_left
-            else:
-                k_allowed = 0
-        elif k_left:
-            k_allowed = floor((pitch_outs/total_outs)*total_k)
-            k_left -= k_allowed
-        else:
-            k_allowed = 0
-        player.strikeouts = k_allowed
-
-
-        #caught_stealing
-        if player == last_player:
-            if cs_left > 0:
-                cs_allowed = cs_left
-            else:
-                cs_allowed = 0
-        elif cs_left:
-            cs_allowed = floor((pitch_outs/total_outs)*total_cs)
-            cs_left -= cs_allowed
-        else:
-            cs_allowed = 0
-        player.runners_caught_stealing = cs_allowed
-
-        #stolen bases
-        if player == last_player:
-            if sb_left > 0:
-                sb_allowed = sb_left
-            else:
-                sb_allowed = 0
-        elif sb_left:
-            sb_allowed = floor((pitch_outs/total_outs)*total_sb)
-            sb_left -= sb_allowed
-        else:
-            sb_allowed = 0
-        player.stolen_bases_allowed = sb_allowed
-
-
-        player.save()
-
-
-
-'''
-For random_pitching_runs: Copy base into bash, tabs are spaces.
-
-from stats.models import TeamGameStats
-from league.models import SeasonStage, Game
-from stats.database_filler import random_pitching_runs
-ss = SeasonStage.objects.all()[2]
-games = Game.objects.all().filter(season=ss, date__year=2021)
-for game in games:
-    tgs = game.teamgamestats_set.all()
-    tgs1 = tgs[0]
-    tgs2 = tgs[1]
-    for g in tgs:
-        print(g, end='')
-        pgs = g.playerpitchinggamestats_set.all()
-        if g == tgs1:
-            random_pitching_runs(pgs, g, tgs2)
-        else:
-            random_pitching_runs(pgs, g, tgs1)
-    print("Done Game")
-'''
-def random_pitching_runs(pgs, tgs1, tgs2):
+    slots = inning_pitchers(outs)[:, :, None] == np.arange(outs.shape[1])
+    runs = (slots * linescore_against[:, :, None]).sum(axis=1)
+    return {"runs_allowed": runs, "earned_runs": runs,
+        "homeruns_allowed": _split_capped(runs, opponent["runs"],
+            opponent["homeruns"])}
+
+
+def random_pitching_decision(outs, used, linescore_for, linescore_against):
     """
-    Params:
-        pgs - List of all PlayerPitchingGameStats for a team in a game.
-        tgs1 - TeamGameStats of the team listed in pgs
-        tgs2 - TeamGameStats of opposing team
+    Gives the win or loss to the pitcher in when the side took the lead,
+    or fell behind, for good, and a save to a last pitcher finishing a
+    win by 3 or less after at least an inning. Ties get no decision.
     """
-    inning_outs = {0:0, 0.1:1, 0.2:2, 1:3, 1.1:4, 1.2:5, 2:6, 2.1:7, 2.2:8, 3:9,
-        3.1:10, 3.2:11, 4:12, 4.1:13, 4.2:14, 5:15, 5.1:16, 5.2:17, 6:18,
-        6.1:19, 6.2:20, 7:21, 7.1:22, 7.2:23, 8:24, 8.1:25, 8.2:26, 9:27}
-
-    outs_left = 27
-
-    t1_linescore = tgs1.teamgamelinescore_set.get()
-    tls1 = [
-        t1_linescore.first,   t1_linescore.second, t1_linescore.third,
-        t1_linescore.fourth,  t1_linescore.fifth,  t1_linescore.sixth,
-        t1_linescore.seventh, t1_linescore.eighth,  t1_linescore.ninth
-        ]
-
-    t2_linescore = tgs2.teamgamelinescore_set.get()
-    tls2 = [
-        t2_linescore.first,   t2_linescore.second, t2_linescore.third,
-        t2_linescore.fourth,  t2_linescore.fifth,  t2_linescore.sixth,
-        t2_linescore.seventh, t2_linescore.eighth,  t2_linescore.ninth
-        ]
-    ths2 = total_hitting_stats(tgs2.playerhittinggamestats_set.all())
-    total_runs = runs_left = ths2["runs"]
-    total_homeruns = hr_left = ths2["homeruns"]
-
-
-    outs = 0
-    last_player = pgs.last()
-    for player in pgs:
-        pitch_outs = inning_outs[player.innings_pitched]
-        outs_left -= pitch_outs
-        rf = 0
-        ra = 0
-
-        for index in range(outs, outs+pitch_outs, 3):
-            inning_index = index//3
-            rf += tls1[inning_index]
-            ra += tls2[inning_index]
-            tls1[inning_index] = tls2[inning_index] = 0
-        outs+= pitch_outs
-
-        player.runs_allowed = ra
-        player.earned_runs = ra
-        runs_left -= ra
-
-        if player == last_player:
-            hr = hr_left
-        elif hr_left:
-            hr = floor((ra/total_runs)* total_homeruns)
-            hr_left -= hr
-        else:
-            hr = 0
-        player.homeruns_allowed = hr
-
-        player.save()
-
-
-
-'''
-For random_pitching_decision: Copy base into bash, tabs are spaces.
-
-from stats.models import TeamGameStats
-from league.models import SeasonStage, Game
-from stats.database_filler import random_pitching_decision
-ss = SeasonStage.objects.all()[2]
-games = Game.objects.all().filter(season=ss, date__year=2021)
-for game in games:
-    tgs = game.teamgamestats_set.all()
-    tgs1 = tgs[0]
-    tgs2 = tgs[1]
-    for g in tgs:
-        print(g, end='')
-        pgs = g.playerpitchinggamestats_set.all()
-        if g == tgs1:
-            random_pitching_decision(pgs, g, tgs2)
-        else:
-            random_pitching_decision(pgs, g, tgs1)
-    print("Done Game")
-'''
-def random_pitching_decision(pgs, tgs1, tgs2):
+    sides = np.arange(len(outs))
+    score = np.cumsum(linescore_for - linescore_against, axis=1)
+    margin = score[:, -1]
+    ahead = score * margin[:, None] > 0
+    took = ahead & ~np.pad(ahead[:, :-1], ((0, 0), (1, 0)))
+    inning = INNINGS - 1 - np.argmax(took[:, ::-1], axis=1)
+    deciding = inning_pitchers(outs)[sides, inning]
+
+    columns = {stat: np.zeros_like(outs) for stat in ["win", "loss",
+        "save_op", "save_converted"]}
+    for stat, decided in [("win", margin > 0), ("loss", margin < 0)]:
+        columns[stat][sides[decided], deciding[decided]] = 1
+    last = used - 1
+    saved = ((margin > 0) & (margin <= 3) & (deciding != last)
+        & (outs[sides, last] >= 3))
+    for stat in ["save_op", "save_converted"]:
+        columns[stat][sides[saved], last[saved]] = 1
+    return columns
+
+
+def random_games(rng, games, rosters):
     """
-    Params:
-        pgs - List of all PlayerPitchingGameStats for a team in a game.
-        tgs1 - TeamGameStats of the team listed in pgs
-        tgs2 - TeamGameStats of opposing team
+    Stats for a batch of scheduled games, for
+    bulk_load.write_game_columns(). Sets each game's score.
 
-        Asumptions:
-            1st pitcher pitches >5 innings, so sets leading teams
-            starter as initial winning pitcher.
+    Params:
+        games - Unsaved Games, see create_schedule().
+        rosters - dict of TeamSeason: (hitter pks, pitcher pks), the
+            PlayerSeason pks each team's lineup and staff come from. Every
+            team needs the same number of hitters and of pitchers.
     """
-    inning_outs = {0:0, 0.1:1, 0.2:2, 1:3, 1.1:4, 1.2:5, 2:6, 2.1:7, 2.2:8, 3:9,
-        3.1:10, 3.2:11, 4:12, 4.1:13, 4.2:14, 5:15, 5.1:16, 5.2:17, 6:18,
-        6.1:19, 6.2:20, 7:21, 7.1:22, 7.2:23, 8:24, 8.1:25, 8.2:26, 9:27}
-
-    outs_left = 27
-
-    t1_linescore = tgs1.teamgamelinescore_set.get()
-    tls1 = [
-        t1_linescore.first,   t1_linescore.second, t1_linescore.third,
-        t1_linescore.fourth,  t1_linescore.fifth,  t1_linescore.sixth,
-        t1_linescore.seventh, t1_linescore.eighth,  t1_linescore.ninth
-        ]
-
-    t2_linescore = tgs2.teamgamelinescore_set.get()
-    tls2 = [
-        t2_linescore.first,   t2_linescore.second, t2_linescore.third,
-        t2_linescore.fourth,  t2_linescore.fifth,  t2_linescore.sixth,
-        t2_linescore.seventh, t2_linescore.eighth,  t2_linescore.ninth
-        ]
-
-    outs = 0
-    lead = None
-    tied = None
-    deciding_pitcher = pgs.first()
-    pitcher_save = None
-    cur_rf = 0
-    cur_ra = 0
-    for player in pgs:
-        pitch_outs = inning_outs[player.innings_pitched]
-        outs_left -= pitch_outs
-        rf = 0
-        ra = 0
-
-        #update runs and score for current player.
-        for index in range(outs, outs+pitch_outs, 3):
-            inning_index = index//3
-            rf += tls1[inning_index]
-            ra += tls2[inning_index]
-            tls1[inning_index] = tls2[inning_index] = 0
-
-
-
-        outs+= pitch_outs
-        cur_rf += rf
-        cur_ra += ra
-
-        if cur_rf > cur_ra:
-            if lead:
-                #were winning, still winning - nothing
-                pass
-            else:
-                #tied/losing - now winning
-                deciding_pitcher = player
-            lead = True
-            tied = False
-        elif cur_rf == cur_ra:
-            #currently tied -- inline for win, lose, draw
-            deciding_pitcher = player
-            lead = False
-            tied = True
-        else:
-            #else covers losing cur_rf < cur_ra:
-            if lead:
-                #were winning, now losing
-                deciding_pitcher = player
-            elif tied:
-                #were tied, now losing
-                deciding_pitcher = player
-            else:
-                #were losing, still losing
-                pass
-
-            lead = False
-            tied = False
-
-        if inning_index == 8 and player.innings_pitched >= 1 and 1 <= cur_rf - cur_ra <= 3:
-            if player != deciding_pitcher:
-                player.save_op += 1
-                pitcher_save = player
-                player.save()
-        elif inning_index == 8 and player.innings_pitched >= 0.2 and 1 <= cur_rf - cur_ra >= 2:
-            if player != deciding_pitcher:
-                player.save_op += 1
-                pitcher_save = player
-                player.save()
-        elif inning_index == 7 and player.innings_pitched >= 1.1 and 1 <= cur_rf - cur_ra <= 3:
-            if player != deciding_pitcher:
-                player.save_op += 1
-                pitcher_save = player
-                player.save()
-        else:
-            player.save_op = 0
-
-    if tgs1.runs_for == tgs1.runs_against:
-        deciding_pitcher.win = 0
-        deciding_pitcher.loss = 0
-    elif lead:
-        deciding_pitcher.win = 1
-        deciding_pitcher.save_op = 0
-    elif not lead:
-        deciding_pitcher.loss = 1
-
-    deciding_pitcher.save()
-
-    if pitcher_save and pitcher_save != deciding_pitcher:
-        if tgs1.runs_for > tgs1.runs_against:
-            pitcher_save.save_converted = 1
-            pitcher_save.save()
-
-
+    teams = list(rosters)
+    team_index = {team.pk: index for index, team in enumerate(teams)}
+    hitters = np.array([rosters[team][0] for team in teams])
+    pitchers = np.array([rosters[team][1] for team in teams])
+    side_teams = np.array([team_index[team.pk] for game in games
+        for team in (game.home_team, game.away_team)])
+    sides, lineup = len(side_teams), hitters.shape[1]
+    opponents = np.arange(sides) ^ 1
+
+    hitting = random_hitting_stats(rng, sides * lineup)
+    hitting["runs_batted_in"] = random_runs_batted_in(rng, hitting, lineup)
+    totals = side_totals(hitting, lineup)
+    runs = totals["runs"]
+    opponent = {stat: column[opponents] for stat, column in totals.items()}
+    linescores = random_linescore(rng, runs)
+
+    staff = min(MAX_PITCHERS, pitchers.shape[1])
+    outs, used = random_pitching_innings(rng, staff, sides)
+    pitching = {"outs_recorded": outs, "innings_pitched": outs // 3,
+        "_innings": outs / 3, "game": (outs > 0).astype(np.int64)}
+    pitching["game_started"] = np.zeros_like(outs)
+    pitching["game_started"][:, 0] = 1
+    pitching["complete_game"] = pitching["game_started"] * (used == 1)[:, None]
+    charged = random_pitching_runs(outs, used, linescores[opponents],
+        opponent)
+    pitching.update(charged)
+    pitching.update(random_pitching_stats(outs, used, opponent, charged))
+    pitching.update(random_pitching_decision(outs, used, linescores,
+        linescores[opponents]))
+    order = np.argsort(rng.random((sides, pitchers.shape[1])), axis=1)
+    pitching["player_id"] = pitchers[side_teams[:, None], order[:, :staff]]
+    pitched = outs.ravel() > 0
+    pitching = {stat: column.ravel()[pitched]
+        for stat, column in pitching.items()}
+    pitching["team_stats"] = np.repeat(np.arange(sides), staff)[pitched]
+
+    hitting["player_id"] = hitters[side_teams].ravel()
+    hitting["batting_order_position"] = np.tile(np.arange(1, lineup + 1),
+        sides)
+    hitting["team_stats"] = np.repeat(np.arange(sides), lineup)
+
+    team_stats, lines = [], []
+    for game, (home, away) in zip(games, runs.reshape(-1, 2).tolist()):
+        game.home_score, game.away_score = home, away
+        game.stats_entered = game.home_stats_entered = True
+        game.away_stats_entered = True
+        for team, runs_for, runs_against in [(game.home_team, home, away),
+                (game.away_team, away, home)]:
+            team_stats.append(TeamGameStats(game=game, team=team,
+                season_id=team.season_id, league_id=team.team.league_id,
+                runs_for=runs_for, runs_against=runs_against,
+                win=runs_for > runs_against, loss=runs_for < runs_against,
+                tie=runs_for == runs_against))
+    for stats, innings in zip(team_stats, linescores.tolist()):
+        lines.append(TeamGameLineScore(game=stats, extras="None",
+            **dict(zip(TeamGameLineScore.INNINGS, innings))))
+
+    return {
+        Game: list(games),
+        TeamGameStats: team_stats,
+        TeamGameLineScore: lines,
+        PlayerHittingGameStats: hitting,
+        PlayerPitchingGameStats: pitching,
+        InningScore: {
+            "linescore": np.repeat(np.arange(sides), INNINGS),
+            "inning": np.tile(np.arange(1, INNINGS + 1), sides),
+            "runs": linescores.ravel(),
+            },
+        }
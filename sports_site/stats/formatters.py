@@ -0,0 +1,90 @@
+"""
+Display formatting for rate stats, run on every AVG/OBP/ERA/IP cell of
+every table. Output is identical to the string building these replaced
+in stat_calc.py, ie .3 -> ".300", 1.5 -> "1.500", 5.333 -> "5.1".
+
+Values are scaled to an integer count of thousandths/hundredths and
+read from lookup tables built at import. A value whose scaled fraction
+sits within TIE of .5 could round either way depending on its exact
+binary value, so it, along with negatives and values past the tables,
+goes through round() and format spec padding instead.
+"""
+import math
+
+
+def _pad(text, width):
+    """
+    Drops a leading 0 and pads with trailing 0's to width decimals,
+    ie "0.3" -> ".300", "1.5" -> "1.500" with width 3.
+    """
+    if text[0] == "0":
+        return format(text[1:], f"0<{width + 1}")
+    return format(text, f"0<{width + 2}")
+
+
+#".000", ".001" ... "9.999", indexed by thousandths.
+THOUSANDTHS = tuple(_pad(str(i / 1000), 3) for i in range(10000))
+#".00", ".01" ... "99.99", indexed by hundredths.
+HUNDREDTHS = tuple(_pad(str(i / 100), 2) for i in range(10000))
+#Innings pitched remainders, hundredths of an inning -> outs.
+THIRDS = {33: 1, 67: 2}
+#"0.0", "0.1", "0.2", "1.0" ... "999.2", indexed by outs.
+INNINGS = tuple(f"{i // 3}.{i % 3}" for i in range(3000))
+TIE = 1e-7
+
+
+def format_ratio(value):
+    """
+    AVG/OBP/SLG/OPS to 3 decimals, ie .3 -> ".300", None -> ".000"
+    """
+    if not value:
+        return ".000"
+    scaled = value * 1000 + .5
+    if value > 0 and scaled < 10000:
+        thousandths = int(scaled)
+        if TIE < scaled - thousandths < 1 - TIE:
+            return THOUSANDTHS[thousandths]
+    return _pad(str(round(value, 3)), 3)
+
+
+def format_pitching_ratio(value):
+    """
+    ERA/WHIP to 2 decimals, ie 3.5 -> "3.50", 0 -> "0.00", None -> ".000"
+    """
+    if value is None:
+        return ".000"
+    if value == 0:
+        return "0.00"
+    scaled = value * 100 + .5
+    if value > 0 and scaled < 10000:
+        hundredths = int(scaled)
+        if TIE < scaled - hundredths < 1 - TIE:
+            return HUNDREDTHS[hundredths]
+    return _pad(str(round(value, 2)), 2)
+
+
+def format_innings(value):
+    """
+    Innings pitched in thirds, ie 5.333 -> "5.1", 0 -> "0.0", None -> ".000"
+    """
+    if value is None:
+        return ".000"
+    if value == 0:
+        return "0.0"
+    if value > 0:
+        innings = int(value)
+        scaled = (value - innings) * 100 + .5
+        hundredths = int(scaled)
+        if innings < 1000 and TIE < scaled - hundredths < 1 - TIE:
+            return INNINGS[innings * 3 + THIRDS.get(hundredths, 0)]
+    remainder = round(value % 1, 2)
+    return f"{math.floor(value)}.{THIRDS.get(round(remainder * 100), 0)}"
+
+
+def format_outs(outs):
+    """
+    Innings pitched from outs recorded, ie 20 -> "6.2"
+    """
+    if outs < len(INNINGS):
+        return INNINGS[outs]
+    return f"{outs // 3}.{outs % 3}"
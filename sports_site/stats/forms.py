@@ -20,7 +20,7 @@ class PlayerStatsCreateForm(forms.Form):
         self._team_game_stats = kwargs.pop('team_game_stats', None)
         super(PlayerStatsCreateForm, self).__init__(*args, **kwargs)
         self.player_queryset = PlayerSeason.objects.filter(
-            team__team=self._team_season)
+            team__team=self._team_season).select_related("player")
 
         self.fields["player"] = forms.ModelChoiceField(
             queryset=self.player_queryset,
@@ -67,7 +67,7 @@ class PlayerPitchingStatsCreateForm(forms.Form):
         self._team_game_stats = kwargs.pop('team_game_stats')
         super(PlayerPitchingStatsCreateForm, self).__init__(*args, **kwargs)
         self.player_queryset = PlayerSeason.objects.filter(
-            team__team=self._team_season)
+            team__team=self._team_season).select_related("player")
 
         self.fields["player"] = forms.ModelChoiceField(
             queryset=self.player_queryset,
@@ -170,13 +170,19 @@ class PlayerHittingGameStatsForm(forms.ModelForm):
         self._team_game_stats = kwargs.pop('game_stats', None)
         super(PlayerHittingGameStatsForm, self).__init__(*args, **kwargs)
         self.fields['player'].queryset = PlayerSeason.objects.filter(
-            team__team=self._team_season)
+            team__team=self._team_season).select_related("player")
         self.fields['player'].label = False
 
 
-    def process(self):
-        player_stats = self.save()
-        player_stats.save()
+    def process(self, commit=True):
+        """
+        Params:
+            commit - False leaves saving to the caller, ie
+                stat_entry.save_hitting_stats() for a whole lineup.
+        """
+        player_stats = self.save(commit=False)
+        if commit:
+            player_stats.save()
         return player_stats
 
 
@@ -231,6 +237,7 @@ class PlayerPitchingGameStatsForm(forms.ModelForm):
     class Meta:
         model = PlayerPitchingGameStats
         exclude = ['team_stats', 'season', 'average','game', 'whip', 'era',
+        'outs_recorded',
         ]
 
     def __init__(self, *args, **kwargs):
@@ -238,18 +245,25 @@ class PlayerPitchingGameStatsForm(forms.ModelForm):
         self._team_game_stats = kwargs.pop('game_stats', None)
         super(PlayerPitchingGameStatsForm, self).__init__(*args, **kwargs)
         self.fields['player'].queryset = PlayerSeason.objects.filter(
-            team__team=self._team_season)
+            team__team=self._team_season).select_related("player")
         self.fields['player'].label = False
+        self.fields['outs'].initial = getattr(self.instance, 'outs_recorded', 0) % 3
 
 
-    def process(self):
+    def process(self, commit=True):
+        """
+        Params:
+            commit - False leaves saving to the caller, ie
+                stat_entry.save_pitching_stats() for a whole game.
+        """
         outs = self.cleaned_data["outs"]
         if outs == None:
             outs = 0
-        innings_pitched = self.cleaned_data["innings_pitched"]
-        player_stats = self.save()
-        player_stats._innings = innings_pitched + round((outs/3),2)
-        player_stats.save()
+        innings_pitched = self.cleaned_data["innings_pitched"] or 0
+        player_stats = self.save(commit=False)
+        player_stats.outs_recorded = innings_pitched * 3 + outs
+        if commit:
+            player_stats.save()
         return player_stats
 
 HittingGameStatsFormset = inlineformset_factory(TeamGameStats,
@@ -1,9 +1,35 @@
-from django.db.models import Sum
-from django.forms.models import model_to_dict
-from .models import (PlayerHittingGameStats, PlayerPitchingGameStats,
-    TeamGameStats)
-
-from .stats_defaults import (basic_stat_sums, ratio_stats, stats_dict_choices)
+import bisect
+import datetime
+import heapq
+import itertools
+import math
+from core.cache import get_version
+from django.core.cache import cache
+from django.db.models import (BooleanField, Case, F, Prefetch, Subquery, Sum,
+    Value, When)
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from league.models import Game, SeasonStage
+from .models import (LEADERS_CACHE_VERSION, InningScore,
+    PlayerHittingGameStats, PlayerHittingSeasonStats, PlayerPitchingGameStats,
+    TeamGameLineScore, TeamGameStats)
+
+from .stat_calc import _convert_to_str
+from .stats_defaults import (basic_stat_sums, below_boxscore_sums,
+    below_pitching_boxscore_sums, ratio_stats, rollup_dict_choices,
+    stats_dict_choices)
+
+
+LEADER_CATEGORIES = ["average", "homeruns", "runs_batted_in", "runs",
+    "stolen_bases"]
+LEADERS_CACHE_TIMEOUT = 60 * 60
+#AVG leaders need this many at bats per game played by the league's most
+#used hitter, ie 2 per game over a 10 game season -> 20 at bats.
+QUALIFYING_AT_BATS_PER_GAME = 2
+#True on a game row when the player's team was the home team.
+IS_HOME_GAME = Case(
+    When(team_stats__team=F("game__home_team"), then=Value(True)),
+    default=Value(False), output_field=BooleanField())
 
 
 
@@ -136,6 +162,30 @@ def _get_stats(queryset, filters, initial, default_stats, annotation_value):
     return return_stats
 
 
+def get_rollup_stats(queryset, stats_to_retrieve, fields=None):
+    """
+    Reads stored season rollup rows and returns them in the same shape
+    get_stats returns for the matching preset, so tables and templates
+    don't need to know which one they were given.
+
+    Params:
+        queryset - Queryset of a season rollup model,
+            ie PlayerHittingSeasonStats
+        stats_to_retrieve - str value to call proper defaults on a dict
+            Dict kept in stats_defaults.py - rollup_dict_choices
+        fields - Optional collection of the preset's fields to select,
+            defaults to all of them.
+
+    View - stats/views.py - StatsView
+    """
+    stats = rollup_dict_choices[str(stats_to_retrieve)]
+    initial, values = stats["initial"], stats["fields"]
+    if fields is not None:
+        initial = {k: v for k, v in initial.items() if k in fields}
+        values = [field for field in values if field in fields]
+    return queryset.values(*values, **initial)
+
+
 def get_stats_aggregate(queryset, stats_to_retrieve, extra_keys={}, filters={}):
     stats = stats_dict_choices[str(stats_to_retrieve)]
 
@@ -160,10 +210,14 @@ def add_additional_keys(dictionary, kv_pairs):
 
 def get_extra_innings(linescore_obj):
     """
-    Takes linescore object turns it into a dictionary, removes the
-    game and id values from it, then turns the extras values into
-    own key/value pairs in the dictionary and returns the dict for
-    use in django-tables.
+    Takes linescore object turns it into a dictionary of the innings,
+    then adds any extra innings from its InningScore rows as their own
+    key/value pairs in the dictionary and returns the dict for use in
+    django-tables.
+
+    Runs no queries when linescore_obj was fetched with
+    select_related("game__team__team") and
+    prefetch_related("inningscore_set"), or reached through load_boxscore.
 
     Data retured as a list of multiple obj of itself used as so:
     TeamGameLineScoreTable([-returned table_data-,])
@@ -172,56 +226,132 @@ def get_extra_innings(linescore_obj):
         linescore_obj - TeamGameLineScore model object - stats/models.py
 
     Views - league/views.py - game_boxscore_page_view
-    Templates Featured - league/game_boxscore_page.html
-    """
-    table_data = model_to_dict(
-                    linescore_obj,
-                    fields=[field.name for field in linescore_obj._meta.fields])
-    extra_innings = table_data.pop("extras")
-    game_pk = table_data.pop("game")
-    table_data.pop("id")
-
-    if 'None' != extra_innings != None:
-        extras = extra_innings.split("-")
-        table_data_len = len(table_data)
-        extras_len = len(extras)
-        for i in range(table_data_len, table_data_len + extras_len, 1):
-            list_i = i - table_data_len
-            table_data[str(i+1)] = int(extras[list_i])
+            stats/views/views.py - team_game_stats_info_view
+    Templates Featured - league/game_boxscore.html
+    """
+    table_data = {inning: getattr(linescore_obj, inning)
+        for inning in TeamGameLineScore.INNINGS}
+    regulation = len(TeamGameLineScore.INNINGS)
 
-    table_data["R"] = sum(table_data.values())
-    tgs = TeamGameStats.objects.get(pk=game_pk)
-    if tgs.team.team.abbreviation:
-        table_data["game"] = tgs.team.team.abbreviation
-    else:
-        table_data["game"] = tgs.team.team.name
+    for inning_score in linescore_obj.inningscore_set.all():
+        if inning_score.inning > regulation:
+            table_data[str(inning_score.inning)] = inning_score.runs
 
+    table_data["R"] = sum(table_data.values())
+    team = linescore_obj.game.team.team
+    table_data["game"] = team.abbreviation or team.name
 
     return table_data
 
 
-def _get_extra_stat_totals(player):
+def get_runs_by_inning(league, stage):
     """
-    Internal method used in get_stats_info. Retrieves the totals for
-    the extra stats from a playerhittinggamestats model object.
+    Total runs scored in each inning across a league's stage, in one
+    grouped query over InningScore.
+
+    Returns a list of dicts ordered by inning, ie [{"inning": 1, "runs": 12},]
 
     Params:
-        player - PlayerHittingGameStats object
+        league - League object
+        stage - SeasonStage object
+    """
+    return list(InningScore.objects.filter(
+        linescore__game__league=league,
+        linescore__game__season=stage,
+        ).values("inning").annotate(runs=Sum("runs")).order_by("inning"))
+
 
-    TODO: Remove hard coded date.
+def get_extra_stat_totals(stats_queryset, game,
+                                        stats_to_total=below_boxscore_sums):
     """
-    game = player.team_stats.game
-    hitting_stats = PlayerHittingGameStats.objects.filter(
-                        player__player=player.player.player,
-                        season=game.season,
-                        team_stats__game__date__range=["2021-05-14",game.date])
+    Season to date totals of the boxscore extra stats for every player in
+    stats_queryset, in one grouped query. The date range starts at the
+    stage's first game, so it stays on the game date rather than scanning
+    from a fixed date.
 
-    return_stats = get_stats_aggregate(hitting_stats, "below_boxscore_totals")
+    Returns a dict keyed by Player pk, ie {player_pk: {"doubles": 3, ...}}
 
-    return return_stats
+    Params:
+        stats_queryset - Queryset of PlayerHittingGameStats or
+            PlayerPitchingGameStats for a single team in a game.
+        game - Game object the stats belong to.
+        stats_to_total - list of fields to Sum, defaults to
+            below_boxscore_sums from stats_defaults.py
+    """
+    first_game_date = Game.objects.filter(
+        season=game.season_id).order_by("date").values("date")[:1]
+
+    totals = stats_queryset.model.objects.filter(
+        player__player__in=stats_queryset.values("player__player"),
+        season=game.season_id,
+        game_date__gte=Subquery(first_game_date),
+        game_date__lte=game.date,
+        ).values("player__player").annotate(
+            **{stat: Sum(stat) for stat in stats_to_total})
 
+    return {row.pop("player__player"): row for row in totals}
 
-def get_stats_info(stats_queryset):
+
+def load_boxscore(game_pk):
+    """
+    Loads everything the boxscore page shows for a game in a fixed number
+    of queries: the game, both TeamGameStats with their hitting, pitching
+    and linescore rows, the PlayerSeason/Player/Team rows they point to,
+    and the season to date extra stat totals for the hitters.
+
+    Returns a dict:
+        {"game": Game,
+         "home"/"away": {"game_stats": TeamGameStats, "hitting": [...],
+            "pitching": [...], "linescore": TeamGameLineScore or None},
+         "totals": {player_pk: {...}}}
+
+    Raises Http404 when the game or either team's TeamGameStats is missing.
+
+    Params:
+        game_pk - Game pk
+
+    Views - league/views.py game_boxscore_page_view
+    """
+    game = get_object_or_404(Game.objects.select_related(
+        "season__season", "home_team__team", "away_team__team"), pk=game_pk)
+
+    game_stats = TeamGameStats.objects.filter(
+        game=game, team__in=[game.home_team_id, game.away_team_id],
+        ).select_related("team__team").prefetch_related(
+            Prefetch("playerhittinggamestats_set",
+                queryset=PlayerHittingGameStats.objects.select_related(
+                    "player__player").order_by("pk")),
+            Prefetch("playerpitchinggamestats_set",
+                queryset=PlayerPitchingGameStats.objects.select_related(
+                    "player__player").order_by("pk")),
+            Prefetch("teamgamelinescore_set",
+                queryset=TeamGameLineScore.objects.prefetch_related(
+                    "inningscore_set").order_by("pk")),
+            )
+    by_team = {tgs.team_id: tgs for tgs in game_stats}
+
+    boxscore = {"game": game}
+    for side, team_pk in (("home", game.home_team_id),
+                          ("away", game.away_team_id)):
+        if team_pk not in by_team:
+            raise Http404("No TeamGameStats matches the given query.")
+        tgs = by_team[team_pk]
+        tgs.game = game
+        linescores = tgs.teamgamelinescore_set.all()
+        boxscore[side] = {
+            "game_stats": tgs,
+            "hitting": list(tgs.playerhittinggamestats_set.all()),
+            "pitching": list(tgs.playerpitchinggamestats_set.all()),
+            "linescore": linescores[0] if linescores else None,
+            }
+
+    boxscore["totals"] = get_extra_stat_totals(
+        PlayerHittingGameStats.objects.filter(team_stats__in=by_team.values()),
+        game)
+    return boxscore
+
+
+def get_stats_info(stats_queryset, game=None, totals=None):
     """
     get_stats_info - Get the extra info stats that shows under the
     boxscore of a game summary.
@@ -233,6 +363,11 @@ def get_stats_info(stats_queryset):
         stats_queryset: Queryset of multiple PlayerHittingGameStats.
             Often gathered in reverse from a TeamGameStats object.
             ie teamgamestatsobject.playerhittinggamestats_set.all()
+        game: Game object the stats belong to, looked up from the first
+            stat line when not given.
+        totals: Season totals from get_extra_stat_totals, ie from
+            load_boxscore. When given stats_queryset may be a list and no
+            queries are run.
 
     Views - league/views.py game_boxscore_page_view
     Templates - league/game_boxscore_page.html
@@ -249,8 +384,14 @@ def get_stats_info(stats_queryset):
     cs = ["CS:",]
     po = ["PO:",]
 
+    if totals is None:
+        stats_queryset = stats_queryset.select_related("player__player")
+        if game is None and stats_queryset:
+            game = stats_queryset[0].team_stats.game
+        totals = get_extra_stat_totals(stats_queryset, game) if game else {}
+
     for player in stats_queryset:
-        player_totals = _get_extra_stat_totals(player)
+        player_totals = totals.get(player.player.player_id, {})
         if player.hits:
             tb = player.singles
             if player.doubles:
@@ -325,7 +466,7 @@ def format_stats(stats):
     return stat_list
 
 
-def get_pitching_stats_info(stats_queryset):
+def get_pitching_stats_info(stats_queryset, game=None):
     """
     get_pitching_stats_info - Get the extra info stats that shows under
     the pitching stats of a game summary.
@@ -335,9 +476,11 @@ def get_pitching_stats_info(stats_queryset):
         ie format_pitching_stats(get_pitching_stats_info(-given_stats-))
 
     Params:
-        stats_queryset: Queryset of multiple PlayerHittingGameStats.
+        stats_queryset: Queryset of multiple PlayerPitchingGameStats.
             Often gathered in reverse from a TeamGameStats object.
-            ie teamgamestatsobject.playerhittinggamestats_set.all()
+            ie teamgamestatsobject.playerpitchinggamestats_set.all()
+        game: Game object the stats belong to, looked up from the first
+            stat line when not given.
 
     Views - league/views.py game_boxscore_page_view
     Templates - league/game_boxscore_page.html
@@ -346,8 +489,14 @@ def get_pitching_stats_info(stats_queryset):
     hit_batters = ["HBP:",]
     batters_faced = ["Batters faced:",]
 
+    stats_queryset = stats_queryset.select_related("player__player")
+    if game is None and stats_queryset:
+        game = stats_queryset[0].team_stats.game
+    totals = get_extra_stat_totals(stats_queryset, game,
+        below_pitching_boxscore_sums) if game else {}
+
     for player in stats_queryset:
-        player_totals = _get_extra_stat_totals(player)
+        player_totals = totals.get(player.player.player_id, {})
         if player.balk:
             balks.append((player, player.balk, None))
         if player.hit_batters:
@@ -361,3 +510,257 @@ def get_pitching_stats_info(stats_queryset):
     return (balks, hit_batters, batters_faced)
 
 
+def get_league_leaders(league, stage, top=1):
+    """
+    Top hitters of a stage in each of LEADER_CATEGORIES, read from the
+    stored season rollups in one query with the top rows picked per
+    category by heap. AVG only counts hitters with qualifying at bats.
+    Results are cached per stage until a hitting rollup in it changes.
+
+    Returns a dict of lists keyed by category, each row a dict with
+    player_id, first, last, team and the stats, ie
+        {"homeruns": [{"player_id": 1, "first": "Joe", "homeruns": 4,...}]}
+    average is formatted as a str, ie ".333"
+
+    Params:
+        league - League object
+        stage - SeasonStage object, often the featured stage.
+        top - int, number of leaders per category.
+
+    View - news/views.py - home
+    """
+    if stage is None:
+        return {category: [] for category in LEADER_CATEGORIES}
+
+    version = get_version(LEADERS_CACHE_VERSION.format(stage.pk))
+    cache_key = f"leaders:{stage.pk}:{top}:{version}"
+    leaders = cache.get(cache_key)
+    if leaders is not None:
+        return leaders
+
+    rows = list(PlayerHittingSeasonStats.objects.filter(
+        league=league, season=stage).order_by("player").values(
+            "games", "at_bats", "hits", *LEADER_CATEGORIES,
+            player_pk=F("player__player__pk"),
+            first=F("player__player__first_name"),
+            last=F("player__player__last_name"),
+            team=F("player__team__team__team__name")))
+    for row in rows:
+        row["player_id"] = row.pop("player_pk")
+
+    leaders = {}
+    for category in LEADER_CATEGORIES:
+        candidates = rows
+        if category == "average":
+            most_games = max((row["games"] for row in rows), default=0)
+            qualifying = math.ceil(most_games * QUALIFYING_AT_BATS_PER_GAME)
+            candidates = [row for row in rows if row["average"] is not None
+                and row["at_bats"] >= qualifying]
+        leaders[category] = [dict(row) for row in heapq.nlargest(
+            top, candidates, key=lambda row: row[category] or 0)]
+
+    for row in leaders["average"]:
+        row["average"] = _convert_to_str(row["average"])
+
+    cache.set(cache_key, leaders, LEADERS_CACHE_TIMEOUT)
+    return leaders
+
+
+def _prefix_sums(rows, stats):
+    """
+    Running totals of stats over rows, sums[i] being the totals of the
+    first i rows, so the totals of rows[i:j] are sums[j] - sums[i].
+    """
+    sums = [dict.fromkeys(stats, 0)]
+    for row in rows:
+        previous = sums[-1]
+        sums.append({stat: previous[stat] + (row[stat] or 0) for stat in stats})
+    return sums
+
+
+def _window(sums, start, end, **extra_keys):
+    """Totals of rows[start:end] from _prefix_sums, with ratios added."""
+    totals = {stat: sums[end][stat] - sums[start][stat] for stat in sums[0]}
+    totals.update(extra_keys)
+    return aggregate_ratios(totals)
+
+
+class HittingSplits:
+    """
+    Split engine over one player's game rows, oldest first. Prefix sums
+    per stat column are built once, after which every split is the
+    difference of two prefix entries:
+        last(10) - last 10 games
+        between(start, end) - games between two dates, inclusive
+        home() / away() - home or away games
+        month(2021, 6) - games in June 2021
+    Date ranges find their bounds by bisecting the game dates, every
+    other split is a direct index.
+
+    Each split is a dict of basic_stat_sums totals with ratios added,
+    and "duration" naming the split, ie "Last 10 Games".
+
+    Params:
+        rows - dicts of basic_stat_sums, with "date" and "home" keys,
+            ordered by date.
+    """
+    def __init__(self, rows):
+        self.dates = [row["date"] for row in rows]
+        self.sums = _prefix_sums(rows, basic_stat_sums)
+        self.home_sums = _prefix_sums(
+            [row for row in rows if row["home"]], basic_stat_sums)
+        self.away_sums = _prefix_sums(
+            [row for row in rows if not row["home"]], basic_stat_sums)
+        self.months = {}
+        start = 0
+        for month, month_rows in itertools.groupby(
+                self.dates, lambda date: (date.year, date.month)):
+            end = start + len(list(month_rows))
+            self.months[month] = (start, end)
+            start = end
+
+    @classmethod
+    def for_player(cls, player, stage=None):
+        """
+        Loads the player's game rows in a single query.
+
+        Params:
+            player - Player object
+            stage - SeasonStage object, defaults to the featured stage.
+        """
+        rows = PlayerHittingGameStats.objects.filter(player__player=player)
+        if stage is None:
+            rows = rows.filter(season__featured=True)
+        else:
+            rows = rows.filter(season=stage)
+        return cls(rows.order_by("game_date", "pk").values(
+            *basic_stat_sums,
+            date=F("game_date"),
+            home=IS_HOME_GAME))
+
+    def __len__(self):
+        return len(self.dates)
+
+    def last(self, games):
+        """Totals over the last games games played."""
+        return _window(self.sums, max(len(self) - games, 0), len(self),
+            duration=f"Last {games} Games")
+
+    def between(self, start, end):
+        """Totals over games played from start to end dates, inclusive."""
+        return _window(self.sums,
+            bisect.bisect_left(self.dates, start),
+            max(bisect.bisect_right(self.dates, end),
+                bisect.bisect_left(self.dates, start)),
+            duration=f"{start} - {end}")
+
+    def home(self):
+        return _window(self.home_sums, 0, len(self.home_sums) - 1,
+            duration="Home")
+
+    def away(self):
+        return _window(self.away_sums, 0, len(self.away_sums) - 1,
+            duration="Away")
+
+    def month(self, year, month):
+        """Totals over games played in the given month."""
+        start, end = self.months.get((year, month), (0, 0))
+        return _window(self.sums, start, end,
+            duration=datetime.date(year, month, 1).strftime("%B %Y"))
+
+    def split(self, name):
+        """
+        Split from its query string name, None when name is not a split.
+            "last-10" - last(10)
+            "home", "away" - home(), away()
+            "2021-06" - month(2021, 6)
+            "2021-06-01..2021-06-15" - between the two dates
+        """
+        try:
+            if name == "home":
+                return self.home()
+            if name == "away":
+                return self.away()
+            if name.startswith("last-"):
+                games = int(name[len("last-"):])
+                return self.last(games) if games > 0 else None
+            if ".." in name:
+                start, end = name.split("..")
+                return self.between(datetime.date.fromisoformat(start),
+                    datetime.date.fromisoformat(end))
+            year, month = name.split("-")
+            return self.month(int(year), int(month))
+        except ValueError:
+            return None
+
+
+def get_player_splits(player, names, stage=None):
+    """
+    Splits for the player by query string name, see HittingSplits.split,
+    skipping names that are not splits.
+
+    Params:
+        player - Player object
+        names - iterable of split names, ie ["last-10", "home", "2021-06"]
+        stage - SeasonStage object, defaults to the featured stage.
+    """
+    splits = HittingSplits.for_player(player, stage)
+    return [split for split in map(splits.split, names) if split is not None]
+
+
+def get_player_page_stats(player, last_x=(3, 5, 7), num_games=5):
+    """
+    Everything the player page shows from a single query over the
+    player's game rows, ordered by date. Totals for each window come from
+    prefix sums instead of one aggregate per window.
+
+    Returns a dict:
+        "career_by_year": regular season totals per year, ie
+            [{"year": "2021", "at_bats": 40, ..., "average": .300}]
+        "career": regular season totals, with "year": "Career"
+        "recent_games": featured stage totals for the last num_games
+            dates, most recent first, with "date"
+        "last_x": featured stage totals for the last 3/5/7 games, with
+            "duration": "Last 3 Games"
+        "splits": HittingSplits over the featured stage games
+
+    Params:
+        player - Player object
+        last_x - iterable of window sizes, in games.
+        num_games - int, number of game dates in recent_games.
+
+    View - league/views.py - player_page_view
+    """
+    rows = list(PlayerHittingGameStats.objects.filter(
+        player__player=player).order_by(
+            "game_date", "pk").values(
+                *basic_stat_sums,
+                year=F("season__season__year"),
+                stage=F("season__stage"),
+                featured=F("season__featured"),
+                date=F("game_date"),
+                home=IS_HOME_GAME))
+
+    regular = sorted((row for row in rows
+        if row["stage"] == SeasonStage.REGULAR), key=lambda row: row["year"])
+    regular_sums = _prefix_sums(regular, basic_stat_sums)
+    career_by_year = []
+    start = 0
+    for year, year_rows in itertools.groupby(regular, lambda row: row["year"]):
+        end = start + len(list(year_rows))
+        career_by_year.append(_window(regular_sums, start, end, year=year))
+        start = end
+    career = _window(regular_sums, 0, len(regular), year="Career")
+
+    splits = HittingSplits([row for row in rows if row["featured"]])
+    last_x_splits = [splits.last(games) for games in last_x]
+    recent_games = [dict(splits.between(date, date), date=date)
+        for date in sorted(set(splits.dates), reverse=True)[:num_games]]
+
+    return {
+        "career_by_year": career_by_year,
+        "career": career,
+        "recent_games": recent_games,
+        "last_x": last_x_splits,
+        "splits": splits,
+        }
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from stats.models import (PlayerHittingGameStats, PlayerPitchingGameStats,
+    TeamGameStats)
+
+
+class Command(BaseCommand):
+    help = ("Copies game and game_date from TeamGameStats onto the hitting "
+        "and pitching game rows. They are normally set on save, use this "
+        "after bulk loads or manual database edits.")
+
+
+    def add_arguments(self, parser):
+        parser.add_argument("--league", default=None,
+            help="League url slug, defaults to every league.")
+
+
+    def handle(self, *args, **options):
+        team_stats = TeamGameStats.objects.filter(pk=OuterRef("team_stats"))
+        counts = []
+        with transaction.atomic():
+            for model, game in [(PlayerHittingGameStats, "game"),
+                    (PlayerPitchingGameStats, "_game")]:
+                rows = model.objects.all()
+                if options["league"]:
+                    rows = rows.filter(team_stats__league__url=options["league"])
+                counts.append(rows.update(**{
+                    game: Subquery(team_stats.values("game")[:1]),
+                    "game_date": Subquery(team_stats.values("game__date")[:1]),
+                    }))
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled {counts[0]} hitting and {counts[1]} pitching rows."))
@@ -0,0 +1,172 @@
+import json
+import statistics
+import time
+
+from core.query_stats import QueryTimer
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from league.models import Game, League, Player, SeasonStage, Team
+from stats.get_stats import get_rollup_stats, get_stats, get_stats_aggregate
+from stats.models import (PlayerHittingGameStats, PlayerHittingSeasonStats,
+    PlayerPitchingGameStats, PlayerPitchingSeasonStats, TeamGameStats,
+    TeamPitchingSeasonStats, TeamStanding)
+
+
+#(name, URL name, URL kwarg), kwargs are the league's first game, team and
+#player.
+VIEWS = [
+    ("home", "news-home", None),
+    ("schedule", "schedule-page", None),
+    ("boxscore", "game-boxscore-page", "game_pk"),
+    ("team select", "team-select-page", None),
+    ("team", "team-page", "team_pk"),
+    ("player", "player-page", "player_pk"),
+    ("hitting", "stats-page", None),
+    ("pitching", "pitching-stats-page", None),
+    ("team hitting", "team-stats-page", None),
+    ("team pitching", "team-pitching-stats-page", None),
+    ("standings", "standings-page", None),
+    ]
+#(function, preset, queryset model), see stats_defaults.py.
+PRESETS = [
+    (get_stats, "all_season_hitting", PlayerHittingGameStats),
+    (get_stats, "all_season_pitching", PlayerPitchingGameStats),
+    (get_stats, "team_season_hitting", PlayerHittingGameStats),
+    (get_stats, "team_season_pitching", PlayerPitchingGameStats),
+    (get_stats, "hitting_league_leaders", PlayerHittingGameStats),
+    (get_stats, "last_x_hitting_date", PlayerHittingGameStats),
+    (get_stats, "player_career_hitting_stats", PlayerHittingGameStats),
+    (get_stats, "league_standings", TeamGameStats),
+    (get_stats_aggregate, "last_x_hitting_stats_totals",
+        PlayerHittingGameStats),
+    (get_stats_aggregate, "player_career_hitting_stats_totals",
+        PlayerHittingGameStats),
+    (get_rollup_stats, "all_season_hitting", PlayerHittingSeasonStats),
+    (get_rollup_stats, "all_season_pitching", PlayerPitchingSeasonStats),
+    (get_rollup_stats, "team_season_pitching", TeamPitchingSeasonStats),
+    (get_rollup_stats, "league_standings", TeamStanding),
+    ]
+#Views are timed against their own cache, never the site's shared one.
+BENCH_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "bench",
+        }
+    }
+
+
+def time_calls(function, repeat):
+    """
+    Runs function repeat times, returning its timings and the query count
+    of each run. Queries are counted with an execute wrapper, see
+    core/query_stats.py, as connection.queries stops growing once full.
+    """
+    times = []
+    queries = []
+    for _ in range(repeat):
+        timer = QueryTimer()
+        with connection.execute_wrapper(timer):
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+        queries.append(timer.count)
+    return {
+        "queries": queries,
+        "min_ms": round(min(times) * 1000, 3),
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        }
+
+
+class Command(BaseCommand):
+    help = ("Times every public league page and the get_stats presets "
+        "against a league's featured stage, ie one made with "
+        "generate_league, and prints the results as JSON to compare runs. "
+        "Pages are timed once with an empty cache, then warm, using a "
+        "cache of their own so the site's cache is left alone.")
+
+
+    def add_arguments(self, parser):
+        parser.add_argument("--league", default="GEN",
+            help="League url slug, default GEN.")
+        parser.add_argument("--repeat", type=int, default=5,
+            help="Warm runs of each view and preset, default 5.")
+        parser.add_argument("--output", default=None,
+            help="File to write the JSON to, defaults to stdout.")
+
+
+    def _bench_view(self, client, url, repeat):
+        cache.clear()
+        responses = []
+        cold = time_calls(lambda: responses.append(client.get(url)), 1)
+        return {"url": url, "status": responses[0].status_code, "cold": cold,
+            "warm": time_calls(lambda: client.get(url), repeat)}
+
+
+    def bench_views(self, league, stage, repeat):
+        kwargs = {
+            "game_pk": Game.objects.filter(season=stage).values_list(
+                "pk", flat=True).first(),
+            "team_pk": Team.objects.filter(league=league).values_list(
+                "pk", flat=True).first(),
+            "player_pk": Player.objects.filter(league=league).values_list(
+                "pk", flat=True).first(),
+            }
+        client = Client()
+        results = {}
+        with override_settings(CACHES=BENCH_CACHES,
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for name, url_name, kwarg in VIEWS:
+                if kwarg and kwargs[kwarg] is None:
+                    continue
+                url = reverse(url_name,
+                    kwargs={kwarg: kwargs[kwarg]} if kwarg else None)
+                results[name] = self._bench_view(client,
+                    f"{url}?league={league.url}", repeat)
+        return results
+
+
+    def bench_presets(self, league, stage, repeat):
+        results = {}
+        for function, preset, model in PRESETS:
+            queryset = model.objects.filter(league=league, season=stage)
+
+            def run():
+                stats = function(queryset, preset)
+                return stats if isinstance(stats, dict) else list(stats)
+
+            results[f"{function.__name__}:{preset}"] = time_calls(run, repeat)
+        return results
+
+
+    def handle(self, *args, **options):
+        try:
+            league = League.objects.get(url=options["league"])
+            stage = SeasonStage.objects.get(featured=True,
+                season__league=league)
+        except (League.DoesNotExist, SeasonStage.DoesNotExist):
+            raise CommandError(
+                f"No league {options['league']} with a featured stage.")
+        repeat = max(options["repeat"], 1)
+
+        results = {
+            "league": league.url,
+            "stage": stage.pk,
+            "repeat": repeat,
+            "rows": {model.__name__: model.objects.filter(season=stage).count()
+                for model in [Game, PlayerHittingGameStats,
+                    PlayerPitchingGameStats]},
+            "views": self.bench_views(league, stage, repeat),
+            "presets": self.bench_presets(league, stage, repeat),
+            }
+
+        output = json.dumps(results, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(output + "\n")
+        else:
+            self.stdout.write(output)
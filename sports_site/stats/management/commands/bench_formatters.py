@@ -0,0 +1,129 @@
+import random
+import time
+from math import floor
+
+from django.core.management.base import BaseCommand, CommandError
+from stats.formatters import (format_innings, format_pitching_ratio,
+    format_ratio)
+
+
+def legacy_normalize_str_length(str_value, req_length):
+    if len(str_value) != req_length:
+        for i in range(req_length - len(str_value)):
+            str_value +='0'
+    return str_value
+
+
+def legacy_convert_to_str(float_val):
+    if float_val == None:
+        return ".000"
+    if float_val == 0:
+        return ".000"
+
+    str_value = str(round(float_val,3))
+
+    if str_value[0] != '0':
+        str_value = legacy_normalize_str_length(str_value, 5)
+    else:
+        str_value = str_value[1:]
+        str_value = legacy_normalize_str_length(str_value, 4)
+    return str_value
+
+
+def legacy_convert_to_str_pitching(float_val):
+    if float_val == None:
+        return ".000"
+    if float_val == 0:
+        return "0.00"
+
+    str_value = str(round(float_val,2))
+
+    if str_value[0] != '0':
+        str_value = legacy_normalize_str_length(str_value, 4)
+    else:
+        str_value = str_value[1:]
+        str_value = legacy_normalize_str_length(str_value, 3)
+    return str_value
+
+
+def legacy_convert_to_str_ip(float_val):
+    if float_val == None:
+        return ".000"
+    if float_val == 0:
+        return "0.0"
+
+    remainder = str(round(float_val % 1, 2))
+    full_inn = floor(float_val)
+
+    if remainder == '0.33':
+        return f"{full_inn}.1"
+    elif remainder == '0.67':
+        return f"{full_inn}.2"
+    else:
+        return f"{full_inn}.0"
+
+
+def ratio_values(rng, count):
+    """Batting ratios, mostly hits/at bats, with some zeros and OPS."""
+    values = []
+    for _ in range(count):
+        at_bats = rng.randint(0, 600)
+        if not at_bats:
+            values.append(None)
+        else:
+            values.append(rng.randint(0, at_bats) / at_bats *
+                rng.choice((1, 1, 1, 2)))
+    return values
+
+
+def pitching_values(rng, count):
+    """ERA/WHIP, earned runs * 9 / innings over a season."""
+    return [rng.randint(0, 120) * 9 / (rng.randint(90, 700) / 3)
+        for _ in range(count)]
+
+
+def innings_values(rng, count):
+    return [rng.randint(0, 600) / 3 for _ in range(count)]
+
+
+class Command(BaseCommand):
+    help = ("Benchmarks stats/formatters.py against the stat_calc.py string "
+        "building it replaced. Checks both give identical output for every "
+        "value, then reports the time each took.")
+
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=1_000_000,
+            help="Values formatted per function, default 1,000,000.")
+        parser.add_argument("--seed", type=int, default=0,
+            help="Random seed for the generated values.")
+
+
+    def _time(self, function, values):
+        start = time.perf_counter()
+        output = [function(value) for value in values]
+        return output, time.perf_counter() - start
+
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        count = options["count"]
+        benches = [
+            ("format_ratio", legacy_convert_to_str, format_ratio,
+                ratio_values(rng, count)),
+            ("format_pitching_ratio", legacy_convert_to_str_pitching,
+                format_pitching_ratio, pitching_values(rng, count)),
+            ("format_innings", legacy_convert_to_str_ip, format_innings,
+                innings_values(rng, count)),
+            ]
+        for name, legacy, fast, values in benches:
+            expected, legacy_time = self._time(legacy, values)
+            output, fast_time = self._time(fast, values)
+            if output != expected:
+                value = next(value for value, old, new
+                    in zip(values, expected, output) if old != new)
+                raise CommandError(f"{name} differs from the old output "
+                    f"for {value!r}.")
+            self.stdout.write(f"{name}: {count} values, "
+                f"old {legacy_time:.3f}s, new {fast_time:.3f}s, "
+                f"{legacy_time / max(fast_time, 1e-9):.2f}x")
@@ -0,0 +1,155 @@
+import datetime
+import itertools
+import time
+
+import numpy as np
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from league.models import (League, Player, PlayerSeason, Roster, Season,
+    SeasonStage, Team, TeamSeason, bump_league_version)
+from stats.bulk_load import refresh_rollups, write_game_columns
+from stats.database_filler import (create_schedule, random_games,
+    random_schedule)
+from stats.models import PlayerHittingGameStats, PlayerPitchingGameStats
+
+
+PLACES = ["Springfield", "Riverside", "Fairview", "Kingston", "Lakewood",
+    "Brookfield", "Georgetown", "Clinton", "Madison", "Salem", "Ashland",
+    "Oakdale", "Milton", "Newport", "Dover", "Bristol"]
+NICKNAMES = ["Hawks", "Miners", "Pilots", "Foxes", "Comets", "Rivermen",
+    "Giants", "Owls", "Rangers", "Storm", "Bears", "Mariners"]
+FIRST_NAMES = ["James", "Michael", "Robert", "David", "John", "Daniel",
+    "Chris", "Matt", "Tyler", "Kevin", "Jose", "Luis", "Ryan", "Nick",
+    "Jake", "Brandon", "Eric", "Sam", "Alex", "Ben"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia",
+    "Miller", "Davis", "Martinez", "Lopez", "Wilson", "Anderson", "Thomas",
+    "Moore", "Martin", "Lee", "Walker", "Hall", "Young", "King"]
+POSITIONS = ["C", "1B", "2B", "3B", "SS", "LF", "CF", "RF", "DH"]
+HITTERS = len(POSITIONS)
+PITCHERS = 5
+MAX_TEAMS = 99
+
+
+class Command(BaseCommand):
+    help = ("Generates a league of random but consistent games for testing "
+        "and benchmarks, ie manage.py generate_league --teams 8 --games 40 "
+        "--seasons 3. The same seed always generates the same league. "
+        "Stats are generated with NumPy a batch of games at a time and "
+        "written with bulk inserts, then standings and season stats are "
+        "re-totaled, the last season being featured.")
+
+
+    def add_arguments(self, parser):
+        parser.add_argument("--teams", type=int, default=8,
+            help=f"Teams in the league, 2 to {MAX_TEAMS}, default 8.")
+        parser.add_argument("--games", type=int, default=20,
+            help="Games each team plays a season, default 20.")
+        parser.add_argument("--seasons", type=int, default=1,
+            help="Seasons, each with a regular season stage, default 1.")
+        parser.add_argument("--seed", type=int, default=0,
+            help="Random seed, default 0.")
+        parser.add_argument("--year", type=int,
+            default=datetime.date.today().year,
+            help="Year of the last season, default this year.")
+        parser.add_argument("--league", default="GEN",
+            help="Url slug of the new league, default GEN.")
+        parser.add_argument("--chunk-size", type=int, default=5000,
+            help="Games generated and written per batch, default 5000.")
+
+
+    def _players(self, rng, league, teams):
+        """A roster's worth of players for each team, hitters first."""
+        players = {team: [Player(league=league,
+            first_name=str(rng.choice(FIRST_NAMES)),
+            last_name=str(rng.choice(LAST_NAMES)),
+            bats=str(rng.choice(["R", "R", "L", "S"])),
+            throw=str(rng.choice(["R", "R", "L"])))
+            for _ in range(HITTERS + PITCHERS)] for team in teams}
+        Player.objects.bulk_create(itertools.chain(*players.values()))
+        return players
+
+
+    def _season(self, rng, league, year, players, options, featured):
+        """Creates a season's stage, rosters and games."""
+        season = Season.objects.create(year=str(year), league=league)
+        stage = SeasonStage.objects.create(season=season,
+            stage=SeasonStage.REGULAR, featured=featured)
+        team_seasons = TeamSeason.objects.bulk_create(
+            [TeamSeason(season=stage, team=team) for team in players])
+        #bulk_create skips TeamSeason.save(), which creates the roster.
+        rosters = Roster.objects.bulk_create(
+            [Roster(team=team_season) for team_season in team_seasons])
+
+        lineups = {}
+        for team_season, roster in zip(team_seasons, rosters):
+            player_seasons = PlayerSeason.objects.bulk_create([
+                PlayerSeason(player=player, team=roster, season=stage,
+                    number=number, position=(POSITIONS + ["P"] * PITCHERS)[i])
+                for i, (player, number) in enumerate(zip(
+                    players[team_season.team],
+                    rng.choice(range(1, 100), HITTERS + PITCHERS,
+                        replace=False).tolist()))])
+            pks = [player_season.pk for player_season in player_seasons]
+            lineups[team_season] = (pks[:HITTERS], pks[HITTERS:])
+
+        dates, schedule = random_schedule(rng, len(team_seasons),
+            options["games"], datetime.date(year, 4, 1))
+        games = iter(create_schedule(stage, dates, schedule,
+            dict(enumerate(team_seasons))))
+
+        chunk_size = max(options["chunk_size"], 1)
+        game_count = row_count = 0
+        player_pks = {"hitting": set(), "pitching": set()}
+        while True:
+            chunk = list(itertools.islice(games, chunk_size))
+            if not chunk:
+                break
+            objects = random_games(rng, chunk, lineups)
+            row_count += write_game_columns(objects)
+            game_count += len(chunk)
+            for stats, model in [("hitting", PlayerHittingGameStats),
+                    ("pitching", PlayerPitchingGameStats)]:
+                player_pks[stats].update(
+                    np.unique(objects[model]["player_id"]).tolist())
+        refresh_rollups(stage.pk, player_pks,
+            [team_season.pk for team_season in team_seasons])
+        return game_count, row_count
+
+
+    def handle(self, *args, **options):
+        if not 2 <= options["teams"] <= MAX_TEAMS:
+            raise CommandError(f"--teams must be between 2 and {MAX_TEAMS}.")
+        if options["games"] < 1 or options["seasons"] < 1:
+            raise CommandError("--games and --seasons must be at least 1.")
+        if League.objects.filter(url=options["league"]).exists():
+            raise CommandError(f"League {options['league']} already exists.")
+        rng = np.random.default_rng(options["seed"])
+
+        start = time.perf_counter()
+        game_count = row_count = 0
+        with transaction.atomic():
+            league = League.objects.create(url=options["league"],
+                name=f"{options['league']} Generated League")
+            teams = Team.objects.bulk_create([Team(league=league,
+                place=PLACES[i % len(PLACES)],
+                name=NICKNAMES[i % len(NICKNAMES)],
+                abbreviation=f"{PLACES[i % len(PLACES)][:2]}{i + 1}".upper())
+                for i in range(options["teams"])])
+            players = self._players(rng, league, teams)
+
+            last_year = options["year"]
+            for year in range(last_year - options["seasons"] + 1,
+                    last_year + 1):
+                games, rows = self._season(rng, league, year, players,
+                    options, featured=year == last_year)
+                game_count += games
+                row_count += rows
+            bump_league_version(league.pk)
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {league.url}: {options['teams']} teams, "
+            f"{options['seasons']} seasons, {game_count} games, {row_count} "
+            f"rows in {elapsed:.2f}s "
+            f"({row_count / max(elapsed, 1e-9):.0f} rows/sec)."))
@@ -0,0 +1,303 @@
+import csv
+import datetime
+import itertools
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from league.models import Game, PlayerSeason, SeasonStage, TeamSeason
+from stats.bulk_load import linescore_objects, refresh_rollups, write_games
+from stats.models import (InningScore, PlayerHittingGameStats,
+    PlayerPitchingGameStats, TeamGameLineScore, TeamGameStats)
+
+
+def _stat_fields(model, derived):
+    return {field.name for field in model._meta.concrete_fields
+        if field.get_internal_type() == "PositiveIntegerField"} - derived
+
+
+HITTING_FIELDS = _stat_fields(PlayerHittingGameStats, {"hits"})
+PITCHING_FIELDS = _stat_fields(PlayerPitchingGameStats, {"innings_pitched"})
+HITS = ["singles", "doubles", "triples", "homeruns"]
+
+
+def read_csv(file):
+    """
+    Yields games from a CSV file, one row per record. Each row's record
+    column is game, hitting, pitching or linescore, and the hitting,
+    pitching and linescore rows follow the game row they belong to.
+    Blank cells are skipped.
+
+    game: date, home, away, home_score, away_score, (time, location)
+    hitting/pitching: team, player, then a column per stat.
+    linescore: team, innings - runs by inning with dashes, ie 0-1-0-2...
+    """
+    game = None
+    for line, row in enumerate(csv.DictReader(file), start=2):
+        row = {key: value for key, value in row.items()
+            if key and value not in (None, "")}
+        record = row.pop("record", None)
+        if record == "game":
+            if game is not None:
+                yield game
+            game = dict(row, hitting=[], pitching=[], linescore={}, line=line)
+        elif game is None:
+            raise CommandError(f"Line {line}: {record} row before any game.")
+        elif record in ("hitting", "pitching"):
+            game[record].append(row)
+        elif record == "linescore":
+            game["linescore"][row.get("team")] = row.get(
+                "innings", "").split("-")
+        else:
+            raise CommandError(f"Line {line}: unknown record {record!r}.")
+    if game is not None:
+        yield game
+
+
+def read_json(file):
+    """
+    Yields games from a JSON array of game objects, or from JSON lines,
+    one game object per line, which are read one game at a time.
+
+    {"date": "2021-05-01", "home": "ABC", "away": "XYZ", "home_score": 5,
+     "away_score": 3, "hitting": [{"team": "ABC", "player": "First Last",
+     "at_bats": 4, ...}], "pitching": [...], "linescore": {"ABC": [0, 1,
+     ...], "XYZ": [...]}}
+    """
+    first = file.read(1)
+    while first.isspace():
+        first = file.read(1)
+    if first == "[":
+        for line, game in enumerate(json.loads(first + file.read()), start=1):
+            yield dict(game, line=line)
+        return
+    for line, text in enumerate(itertools.chain([first + file.readline()],
+            file), start=1):
+        if text.strip():
+            yield dict(json.loads(text), line=line)
+
+
+def count(value):
+    """A stat, score or run count as an int, rejecting negatives."""
+    value = int(value)
+    if value < 0:
+        raise ValueError(f"{value} is negative")
+    return value
+
+
+def outs_from_innings(innings):
+    """Outs recorded from innings pitched, ie "6.2" -> 20"""
+    full, _, outs = str(innings).partition(".")
+    return count(full or 0) * 3 + count(outs or 0)
+
+
+class Command(BaseCommand):
+    help = ("Imports a season of boxscores, games with their hitting, "
+        "pitching and linescores, from a CSV or JSON file. Teams are "
+        "matched by abbreviation and players by full name on the team's "
+        "roster. Games already in the stage, by date, home and away team, "
+        "are skipped. The whole file is imported in one transaction, "
+        "written with bulk inserts a chunk of games at a time, then "
+        "standings and season stats are re-totaled.")
+
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="A .csv, .json or .jsonl file.")
+        parser.add_argument("--league", required=True,
+            help="League url slug.")
+        parser.add_argument("--stage", type=int, default=None,
+            help="SeasonStage pk, defaults to the league's featured stage.")
+        parser.add_argument("--chunk-size", type=int, default=500,
+            help="Games written per batch of bulk inserts, default 500.")
+
+
+    def _load_lookups(self, stage):
+        """In-memory maps of the stage's teams, players and games."""
+        self.teams = {
+            team_season.team.abbreviation.lower(): team_season
+            for team_season in TeamSeason.objects.filter(
+                season=stage).select_related("team")
+            if team_season.team.abbreviation}
+        self.players = {
+            (team_pk, f"{first} {last}".lower()): player_pk
+            for player_pk, team_pk, first, last in PlayerSeason.objects.filter(
+                team__team__season=stage).values_list("pk", "team__team",
+                    "player__first_name", "player__last_name")}
+        self.games = set(Game.objects.filter(season=stage).values_list(
+            "date", "home_team", "away_team"))
+
+
+    def _team(self, abbreviation, game):
+        try:
+            return self.teams[str(abbreviation).lower()]
+        except KeyError:
+            raise CommandError(f"Game at line {game['line']}: no team "
+                f"{abbreviation!r} in {self.stage}.")
+
+
+    def _player(self, team_season, name, game):
+        try:
+            return self.players[(team_season.pk, str(name).lower())]
+        except KeyError:
+            raise CommandError(f"Game at line {game['line']}: no player "
+                f"{name!r} on {team_season}.")
+
+
+    def _rows(self, stats, fields, game_stats, game, game_field="game"):
+        """
+        Game stat rows as dicts for insert_rows(), each holding the
+        TeamGameStats and Game it belongs to until they have pks.
+        """
+        rows = []
+        for stat_line in stats:
+            team_stats = game_stats.get(self._team(stat_line.get("team"),
+                game).pk)
+            if team_stats is None:
+                raise CommandError(f"Game at line {game['line']}: "
+                    f"{stat_line.get('team')!r} didn't play in the game.")
+            row = {stat: count(stat_line[stat])
+                for stat in fields.intersection(stat_line)}
+            row.update({game_field: team_stats.game}, team_stats=team_stats,
+                player_id=self._player(team_stats.team,
+                    stat_line.get("player"), game),
+                season_id=team_stats.season_id,
+                league_id=team_stats.league_id,
+                game_date=team_stats.game.date)
+            rows.append((row, stat_line))
+        return rows
+
+
+    def _hitting(self, stats, game_stats, game):
+        rows = []
+        for row, _ in self._rows(stats, HITTING_FIELDS, game_stats, game):
+            row["hits"] = sum(row.get(stat, 0) for stat in HITS)
+            rows.append(row)
+        return rows
+
+
+    def _pitching(self, stats, game_stats, game):
+        rows = []
+        for row, stat_line in self._rows(stats, PITCHING_FIELDS, game_stats,
+                game, game_field="_game"):
+            if "outs_recorded" not in stat_line:
+                row["outs_recorded"] = outs_from_innings(
+                    stat_line.get("innings_pitched", 0))
+            row["innings_pitched"] = row["outs_recorded"] // 3
+            row["_innings"] = row["outs_recorded"] / 3
+            rows.append(row)
+        return rows
+
+
+    def _build(self, game):
+        """
+        Unsaved objects for one game, keyed by model, or None when the game
+        is already in the stage.
+        """
+        try:
+            return self._objects(game)
+        except (KeyError, TypeError, ValueError) as error:
+            raise CommandError(
+                f"Game at line {game['line']}: bad or missing value {error}.")
+
+
+    def _objects(self, game):
+        home = self._team(game["home"], game)
+        away = self._team(game["away"], game)
+        date = datetime.date.fromisoformat(game["date"])
+        if (date, home.pk, away.pk) in self.games:
+            return None
+        self.games.add((date, home.pk, away.pk))
+        home_score = count(game.get("home_score") or 0)
+        away_score = count(game.get("away_score") or 0)
+        new_game = Game(season=self.stage, home_team=home, away_team=away,
+            date=date,
+            location=game.get("location") or f"{home.team.place}",
+            home_score=home_score, away_score=away_score,
+            stats_entered=True, home_stats_entered=True,
+            away_stats_entered=True)
+        if game.get("time"):
+            new_game.start_time = datetime.time.fromisoformat(game["time"])
+
+        game_stats = {}
+        for team, runs_for, runs_against in [(home, home_score, away_score),
+                (away, away_score, home_score)]:
+            game_stats[team.pk] = TeamGameStats(game=new_game, team=team,
+                season_id=team.season_id, league_id=team.team.league_id,
+                runs_for=runs_for, runs_against=runs_against,
+                win=runs_for > runs_against, loss=runs_for < runs_against,
+                tie=runs_for == runs_against)
+
+        objects = {
+            Game: [new_game],
+            TeamGameStats: list(game_stats.values()),
+            PlayerHittingGameStats: self._hitting(game.get("hitting", []),
+                game_stats, game),
+            PlayerPitchingGameStats: self._pitching(game.get("pitching", []),
+                game_stats, game),
+            TeamGameLineScore: [],
+            InningScore: [],
+            }
+        for abbreviation, runs in (game.get("linescore") or {}).items():
+            team_stats = game_stats.get(self._team(abbreviation, game).pk)
+            if team_stats is None:
+                raise CommandError(f"Game at line {game['line']}: "
+                    f"{abbreviation!r} didn't play in the game.")
+            linescore, innings = linescore_objects(
+                [count(inning_runs) for inning_runs in runs], team_stats)
+            objects[TeamGameLineScore].append(linescore)
+            objects[InningScore].extend(innings)
+        return objects
+
+
+    def _open(self, path):
+        try:
+            return open(path, newline="", encoding="utf-8")
+        except OSError as error:
+            raise CommandError(f"Can't read {path}: {error.strerror}.")
+
+
+    def handle(self, *args, **options):
+        try:
+            if options["stage"]:
+                self.stage = SeasonStage.objects.get(pk=options["stage"],
+                    season__league__url=options["league"])
+            else:
+                self.stage = SeasonStage.objects.get(featured=True,
+                    season__league__url=options["league"])
+        except SeasonStage.DoesNotExist:
+            raise CommandError(f"No such stage for {options['league']}.")
+        chunk_size = max(options["chunk_size"], 1)
+        self._load_lookups(self.stage)
+
+        start = time.perf_counter()
+        game_count = row_count = skipped = 0
+        player_pks = {"hitting": set(), "pitching": set()}
+        team_pks = set()
+        reader = read_csv if options["path"].endswith(".csv") else read_json
+        with self._open(options["path"]) as file, transaction.atomic():
+            games = reader(file)
+            while True:
+                chunk = [self._build(game)
+                    for game in itertools.islice(games, chunk_size)]
+                if not chunk:
+                    break
+                skipped += chunk.count(None)
+                chunk = [game for game in chunk if game is not None]
+                row_count += write_games(chunk)
+                game_count += len(chunk)
+                for game in chunk:
+                    player_pks["hitting"].update(row["player_id"]
+                        for row in game[PlayerHittingGameStats])
+                    player_pks["pitching"].update(row["player_id"]
+                        for row in game[PlayerPitchingGameStats])
+                    team_pks.update(row.team_id
+                        for row in game[TeamGameStats])
+            refresh_rollups(self.stage.pk, player_pks, team_pks)
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {game_count} games, {row_count} rows in "
+            f"{elapsed:.2f}s "
+            f"({row_count / max(elapsed, 1e-9):.0f} rows/sec), skipped "
+            f"{skipped} games already imported."))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from stats.models import TeamStanding
+
+
+class Command(BaseCommand):
+    help = ("Rebuilds TeamStanding rows from TeamGameStats. Standings are "
+        "normally kept current on save, use this after bulk loads or "
+        "manual database edits.")
+
+
+    def add_arguments(self, parser):
+        parser.add_argument("--league", default=None,
+            help="League url slug, defaults to every league.")
+        parser.add_argument("--season", type=int, default=None,
+            help="SeasonStage pk, defaults to every stage.")
+
+
+    def handle(self, *args, **options):
+        count = TeamStanding.rebuild(
+            league_slug=options["league"], season_pk=options["season"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {count} team standings."))
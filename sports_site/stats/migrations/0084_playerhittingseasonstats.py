@@ -0,0 +1,102 @@
+# Generated by Django 4.0.9 on 2026-10-18 07:14
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+import django.db.models.deletion
+
+
+SUM_FIELDS = [
+    "at_bats", "plate_appearances", "runs", "hits", "singles", "doubles",
+    "triples", "homeruns", "runs_batted_in", "walks", "strikeouts",
+    "stolen_bases", "caught_stealing", "hit_by_pitch", "sacrifice_flies"]
+
+
+def build_hitting_rollups(apps, schema_editor):
+    """Backfills one rollup row per player per stage from existing games."""
+    PlayerHittingGameStats = apps.get_model("stats", "PlayerHittingGameStats")
+    PlayerHittingSeasonStats = apps.get_model("stats", "PlayerHittingSeasonStats")
+
+    totals = PlayerHittingGameStats.objects.filter(
+        player__isnull=False, season__isnull=False).values(
+            "player", "season").annotate(
+                league=Max("player__player__league"),
+                games=Count("id"),
+                **{stat: Sum(stat) for stat in SUM_FIELDS})
+
+    rollups = []
+    for row in totals:
+        rollup = PlayerHittingSeasonStats(
+            player_id=row["player"],
+            season_id=row["season"],
+            league_id=row["league"],
+            games=row["games"],
+            **{stat: row[stat] or 0 for stat in SUM_FIELDS})
+        obp_top = rollup.hits + rollup.walks + rollup.hit_by_pitch
+        obp_bot = (rollup.at_bats + rollup.walks + rollup.hit_by_pitch +
+            rollup.sacrifice_flies)
+        total_bases = (rollup.singles + rollup.doubles*2 + rollup.triples*3 +
+            rollup.homeruns*4)
+        if rollup.at_bats:
+            rollup.average = rollup.hits / rollup.at_bats
+            rollup.slugging_percentage = total_bases / rollup.at_bats
+        if obp_bot:
+            rollup.on_base_percentage = obp_top / obp_bot
+        if rollup.average is not None and rollup.on_base_percentage is not None:
+            rollup.on_base_plus_slugging = (
+                rollup.on_base_percentage + rollup.slugging_percentage)
+        rollups.append(rollup)
+
+    PlayerHittingSeasonStats.objects.bulk_create(rollups, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0033_alter_team_abbreviation'),
+        ('stats', '0083_delete_playerhittingstatschoice'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerHittingSeasonStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('games', models.PositiveIntegerField(default=0, verbose_name='G')),
+                ('at_bats', models.PositiveIntegerField(default=0, verbose_name='AB')),
+                ('plate_appearances', models.PositiveIntegerField(default=0, verbose_name='PA')),
+                ('runs', models.PositiveIntegerField(default=0, verbose_name='R')),
+                ('hits', models.PositiveIntegerField(default=0, verbose_name='H')),
+                ('singles', models.PositiveIntegerField(default=0, verbose_name='1B')),
+                ('doubles', models.PositiveIntegerField(default=0, verbose_name='2B')),
+                ('triples', models.PositiveIntegerField(default=0, verbose_name='3B')),
+                ('homeruns', models.PositiveIntegerField(default=0, verbose_name='HR')),
+                ('runs_batted_in', models.PositiveIntegerField(default=0, verbose_name='RBI')),
+                ('walks', models.PositiveIntegerField(default=0, verbose_name='BB')),
+                ('strikeouts', models.PositiveIntegerField(default=0, verbose_name='SO')),
+                ('stolen_bases', models.PositiveIntegerField(default=0, verbose_name='SB')),
+                ('caught_stealing', models.PositiveIntegerField(default=0, verbose_name='CS')),
+                ('hit_by_pitch', models.PositiveIntegerField(default=0, verbose_name='HBP')),
+                ('sacrifice_flies', models.PositiveIntegerField(default=0, verbose_name='SF')),
+                ('average', models.FloatField(blank=True, null=True, verbose_name='AVG')),
+                ('on_base_percentage', models.FloatField(blank=True, null=True, verbose_name='OBP')),
+                ('slugging_percentage', models.FloatField(blank=True, null=True, verbose_name='SLG')),
+                ('on_base_plus_slugging', models.FloatField(blank=True, null=True, verbose_name='OPS')),
+                ('league', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='league.league')),
+                ('player', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='league.playerseason')),
+                ('season', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='league.seasonstage')),
+            ],
+            options={
+                'verbose_name': "Hitter's Season Stats",
+                'verbose_name_plural': "Hitter's Season Stats",
+            },
+        ),
+        migrations.AddIndex(
+            model_name='playerhittingseasonstats',
+            index=models.Index(fields=['league', 'season', 'hits'], name='hitting_season_league_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='playerhittingseasonstats',
+            constraint=models.UniqueConstraint(fields=('player', 'season'), name='unique_player_hitting_season'),
+        ),
+        migrations.RunPython(build_hitting_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,158 @@
+# Generated by Django 4.0.9 on 2026-10-18 07:17
+
+from django.db import migrations, models
+from django.db.models import Max, Sum
+import django.db.models.deletion
+
+
+SUM_FIELDS = {
+    "win": "win", "loss": "loss", "game": "game",
+    "game_started": "game_started", "complete_game": "complete_game",
+    "shutout": "shutout", "save_converted": "save_converted",
+    "save_op": "save_op", "hits_allowed": "hits_allowed",
+    "runs_allowed": "runs_allowed", "earned_runs": "earned_runs",
+    "homeruns_allowed": "homeruns_allowed", "hit_batters": "hit_batters",
+    "walks_allowed": "walks_allowed", "strikeouts": "strikeouts",
+    "innings_pitched": "_innings"}
+TEAM_SUM_FIELDS = dict(SUM_FIELDS, game="game_started")
+
+
+def _set_ratios(rollup):
+    if rollup.innings_pitched:
+        rollup.era = (rollup.earned_runs * 9) / rollup.innings_pitched
+        rollup.whip = (
+            (rollup.walks_allowed + rollup.hits_allowed) /
+            rollup.innings_pitched)
+    return rollup
+
+
+def build_pitching_rollups(apps, schema_editor):
+    """Backfills player and team season pitching rollups from existing games."""
+    PlayerPitchingGameStats = apps.get_model("stats", "PlayerPitchingGameStats")
+    PlayerPitchingSeasonStats = apps.get_model("stats", "PlayerPitchingSeasonStats")
+    TeamPitchingSeasonStats = apps.get_model("stats", "TeamPitchingSeasonStats")
+
+    player_totals = PlayerPitchingGameStats.objects.filter(
+        player__isnull=False, season__isnull=False).values(
+            "player", "season").annotate(
+                league=Max("player__player__league"),
+                **{k: Sum(v) for k, v in SUM_FIELDS.items()})
+    PlayerPitchingSeasonStats.objects.bulk_create([
+        _set_ratios(PlayerPitchingSeasonStats(
+            player_id=row["player"],
+            season_id=row["season"],
+            league_id=row["league"],
+            **{stat: row[stat] or 0 for stat in SUM_FIELDS}))
+        for row in player_totals], batch_size=500)
+
+    team_totals = PlayerPitchingGameStats.objects.filter(
+        team_stats__team__isnull=False).values(
+            "team_stats__team").annotate(
+                league=Max("team_stats__team__team__league"),
+                season=Max("team_stats__team__season"),
+                **{k: Sum(v) for k, v in TEAM_SUM_FIELDS.items()})
+    TeamPitchingSeasonStats.objects.bulk_create([
+        _set_ratios(TeamPitchingSeasonStats(
+            team_season_id=row["team_stats__team"],
+            season_id=row["season"],
+            league_id=row["league"],
+            **{stat: row[stat] or 0 for stat in TEAM_SUM_FIELDS}))
+        for row in team_totals], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0033_alter_team_abbreviation'),
+        ('stats', '0084_playerhittingseasonstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamPitchingSeasonStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('win', models.PositiveIntegerField(default=0, verbose_name='W')),
+                ('loss', models.PositiveIntegerField(default=0, verbose_name='L')),
+                ('game', models.PositiveIntegerField(default=0, verbose_name='G')),
+                ('game_started', models.PositiveIntegerField(default=0, verbose_name='GS')),
+                ('complete_game', models.PositiveIntegerField(default=0, verbose_name='CG')),
+                ('shutout', models.PositiveIntegerField(default=0, verbose_name='SHO')),
+                ('save_converted', models.PositiveIntegerField(default=0, verbose_name='SV')),
+                ('save_op', models.PositiveIntegerField(default=0, verbose_name='SVO')),
+                ('hits_allowed', models.PositiveIntegerField(default=0, verbose_name='H')),
+                ('runs_allowed', models.PositiveIntegerField(default=0, verbose_name='R')),
+                ('earned_runs', models.PositiveIntegerField(default=0, verbose_name='ER')),
+                ('homeruns_allowed', models.PositiveIntegerField(default=0, verbose_name='HR')),
+                ('hit_batters', models.PositiveIntegerField(default=0, verbose_name='HB')),
+                ('walks_allowed', models.PositiveIntegerField(default=0, verbose_name='BB')),
+                ('strikeouts', models.PositiveIntegerField(default=0, verbose_name='K')),
+                ('innings_pitched', models.FloatField(default=0, verbose_name='IP')),
+                ('era', models.FloatField(blank=True, null=True, verbose_name='ERA')),
+                ('whip', models.FloatField(blank=True, null=True, verbose_name='WHIP')),
+                ('league', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='league.league')),
+                ('season', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='league.seasonstage')),
+                ('team_season', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='league.teamseason')),
+            ],
+            options={
+                'verbose_name': 'Team Season Pitching Stats',
+                'verbose_name_plural': 'Team Season Pitching Stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='PlayerPitchingSeasonStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('win', models.PositiveIntegerField(default=0, verbose_name='W')),
+                ('loss', models.PositiveIntegerField(default=0, verbose_name='L')),
+                ('game', models.PositiveIntegerField(default=0, verbose_name='G')),
+                ('game_started', models.PositiveIntegerField(default=0, verbose_name='GS')),
+                ('complete_game', models.PositiveIntegerField(default=0, verbose_name='CG')),
+                ('shutout', models.PositiveIntegerField(default=0, verbose_name='SHO')),
+                ('save_converted', models.PositiveIntegerField(default=0, verbose_name='SV')),
+                ('save_op', models.PositiveIntegerField(default=0, verbose_name='SVO')),
+                ('hits_allowed', models.PositiveIntegerField(default=0, verbose_name='H')),
+                ('runs_allowed', models.PositiveIntegerField(default=0, verbose_name='R')),
+                ('earned_runs', models.PositiveIntegerField(default=0, verbose_name='ER')),
+                ('homeruns_allowed', models.PositiveIntegerField(default=0, verbose_name='HR')),
+                ('hit_batters', models.PositiveIntegerField(default=0, verbose_name='HB')),
+                ('walks_allowed', models.PositiveIntegerField(default=0, verbose_name='BB')),
+                ('strikeouts', models.PositiveIntegerField(default=0, verbose_name='K')),
+                ('innings_pitched', models.FloatField(default=0, verbose_name='IP')),
+                ('era', models.FloatField(blank=True, null=True, verbose_name='ERA')),
+                ('whip', models.FloatField(blank=True, null=True, verbose_name='WHIP')),
+                ('league', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='league.league')),
+                ('player', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='league.playerseason')),
+                ('season', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='league.seasonstage')),
+            ],
+            options={
+                'verbose_name': "Pitcher's Season Stats",
+                'verbose_name_plural': "Pitcher's Season Stats",
+            },
+        ),
+        migrations.AddIndex(
+            model_name='teampitchingseasonstats',
+            index=models.Index(fields=['league', 'season', 'era'], name='team_pitching_season_era_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teampitchingseasonstats',
+            index=models.Index(fields=['league', 'season', 'whip'], name='team_pitching_season_whip_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='teampitchingseasonstats',
+            constraint=models.UniqueConstraint(fields=('team_season',), name='unique_team_pitching_season'),
+        ),
+        migrations.AddIndex(
+            model_name='playerpitchingseasonstats',
+            index=models.Index(fields=['league', 'season', 'era'], name='pitching_season_era_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playerpitchingseasonstats',
+            index=models.Index(fields=['league', 'season', 'whip'], name='pitching_season_whip_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='playerpitchingseasonstats',
+            constraint=models.UniqueConstraint(fields=('player', 'season'), name='unique_player_pitching_season'),
+        ),
+        migrations.RunPython(build_pitching_rollups, migrations.RunPython.noop),
+    ]
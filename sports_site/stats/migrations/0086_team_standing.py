@@ -0,0 +1,75 @@
+# Generated by Django 4.0.9 on 2026-10-18 07:22
+
+from django.db import migrations, models
+from django.db.models import Case, Count, Max, Sum, When
+import django.db.models.deletion
+
+
+def build_team_standings(apps, schema_editor):
+    """Backfills one standing per TeamSeason from existing game results."""
+    TeamGameStats = apps.get_model("stats", "TeamGameStats")
+    TeamStanding = apps.get_model("stats", "TeamStanding")
+
+    totals = TeamGameStats.objects.filter(team__isnull=False).values(
+        "team").annotate(
+            league=Max("team__team__league"),
+            season=Max("team__season"),
+            win=Count(Case(When(win=True, then=1))),
+            loss=Count(Case(When(loss=True, then=1))),
+            tie=Count(Case(When(tie=True, then=1))),
+            runs_for=Sum("runs_for"),
+            runs_against=Sum("runs_against"))
+
+    standings = []
+    for row in totals:
+        standing = TeamStanding(
+            team_id=row["team"],
+            league_id=row["league"],
+            season_id=row["season"],
+            win=row["win"],
+            loss=row["loss"],
+            tie=row["tie"],
+            runs_for=row["runs_for"] or 0,
+            runs_against=row["runs_against"] or 0)
+        games = standing.win + standing.loss + standing.tie
+        if games:
+            standing.pct = (standing.win + (standing.tie * 0.5)) / games
+        standing.differential = standing.runs_for - standing.runs_against
+        standings.append(standing)
+    TeamStanding.objects.bulk_create(standings, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0033_alter_team_abbreviation'),
+        ('stats', '0085_pitching_season_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamStanding',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('win', models.PositiveIntegerField(default=0, verbose_name='W')),
+                ('loss', models.PositiveIntegerField(default=0, verbose_name='L')),
+                ('tie', models.PositiveIntegerField(default=0, verbose_name='T')),
+                ('runs_for', models.PositiveIntegerField(default=0, verbose_name='RF')),
+                ('runs_against', models.PositiveIntegerField(default=0, verbose_name='RA')),
+                ('pct', models.FloatField(blank=True, null=True, verbose_name='PCT')),
+                ('differential', models.IntegerField(default=0, verbose_name='DIFF')),
+                ('league', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='league.league')),
+                ('season', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='league.seasonstage')),
+                ('team', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='league.teamseason')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='teamstanding',
+            index=models.Index(fields=['league', 'season', 'pct'], name='standing_league_pct_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='teamstanding',
+            constraint=models.UniqueConstraint(fields=('team',), name='unique_team_standing'),
+        ),
+        migrations.RunPython(build_team_standings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.0.9 on 2026-10-18 07:32
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+INNINGS = ["first", "second", "third", "fourth", "fifth", "sixth", "seventh",
+    "eighth", "ninth"]
+
+
+def build_inning_scores(apps, schema_editor):
+    """
+    Creates InningScore rows from each linescore's inning fields and its
+    dash separated extras string. Extras parts that aren't numbers are
+    skipped rather than failing the migration.
+    """
+    TeamGameLineScore = apps.get_model("stats", "TeamGameLineScore")
+    InningScore = apps.get_model("stats", "InningScore")
+
+    inning_scores = []
+    for linescore in TeamGameLineScore.objects.iterator(chunk_size=500):
+        runs = [getattr(linescore, inning) or 0 for inning in INNINGS]
+        if linescore.extras not in (None, "None", ""):
+            runs += [int(extra) for extra in linescore.extras.split("-")
+                if extra.strip().isdigit()]
+        inning_scores += [
+            InningScore(linescore_id=linescore.pk, inning=inning, runs=inning_runs)
+            for inning, inning_runs in enumerate(runs, start=1)]
+    InningScore.objects.bulk_create(inning_scores, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stats', '0086_team_standing'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='teamgamelinescore',
+            name='extras',
+            field=models.CharField(blank=True, default='None', help_text='Extra innings score, formatted with dashes, - to separate each score. Ex for 3 extra innings, 0-1-1.', max_length=50, null=True, validators=[django.core.validators.RegexValidator('^(None|\\d+(-\\d+)*)?$', 'Extra innings must be runs separated by dashes, ex 0-1-1.')], verbose_name='extras'),
+        ),
+        migrations.CreateModel(
+            name='InningScore',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('inning', models.PositiveSmallIntegerField()),
+                ('runs', models.PositiveIntegerField(default=0)),
+                ('linescore', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='stats.teamgamelinescore')),
+            ],
+            options={
+                'ordering': ['inning'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='inningscore',
+            constraint=models.UniqueConstraint(fields=('linescore', 'inning'), name='unique_linescore_inning'),
+        ),
+        migrations.RunPython(build_inning_scores, migrations.RunPython.noop),
+    ]
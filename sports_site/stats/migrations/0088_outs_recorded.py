@@ -0,0 +1,86 @@
+# Generated by Django 4.0.9 on 2026-10-18 07:57
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def set_ratios(rollup):
+    rollup.innings_pitched = rollup.outs_recorded / 3
+    if rollup.outs_recorded:
+        rollup.era = (rollup.earned_runs * 27) / rollup.outs_recorded
+        rollup.whip = ((rollup.walks_allowed + rollup.hits_allowed) * 3 /
+            rollup.outs_recorded)
+    else:
+        rollup.era = None
+        rollup.whip = None
+
+
+def backfill_outs_recorded(apps, schema_editor):
+    """
+    Sets outs recorded on each pitching row from the float innings, or
+    the whole innings where those were never set, then re-totals the
+    season rollups from outs.
+    """
+    PlayerPitchingGameStats = apps.get_model("stats", "PlayerPitchingGameStats")
+    PlayerPitchingSeasonStats = apps.get_model(
+        "stats", "PlayerPitchingSeasonStats")
+    TeamPitchingSeasonStats = apps.get_model("stats", "TeamPitchingSeasonStats")
+
+    rows = []
+    for row in PlayerPitchingGameStats.objects.iterator(chunk_size=500):
+        if row._innings:
+            row.outs_recorded = round(row._innings * 3)
+        else:
+            row.outs_recorded = (row.innings_pitched or 0) * 3
+        rows.append(row)
+    PlayerPitchingGameStats.objects.bulk_update(rows, ["outs_recorded"],
+        batch_size=500)
+
+    fields = ["outs_recorded", "innings_pitched", "era", "whip"]
+    player_outs = {
+        (row["player"], row["season"]): row["outs"]
+        for row in PlayerPitchingGameStats.objects.values(
+            "player", "season").annotate(outs=Sum("outs_recorded"))}
+    rollups = list(PlayerPitchingSeasonStats.objects.all())
+    for rollup in rollups:
+        rollup.outs_recorded = player_outs.get(
+            (rollup.player_id, rollup.season_id)) or 0
+        set_ratios(rollup)
+    PlayerPitchingSeasonStats.objects.bulk_update(rollups, fields,
+        batch_size=500)
+
+    team_outs = dict(PlayerPitchingGameStats.objects.values_list(
+        "team_stats__team").annotate(outs=Sum("outs_recorded")))
+    rollups = list(TeamPitchingSeasonStats.objects.all())
+    for rollup in rollups:
+        rollup.outs_recorded = team_outs.get(rollup.team_season_id) or 0
+        set_ratios(rollup)
+    TeamPitchingSeasonStats.objects.bulk_update(rollups, fields,
+        batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stats', '0087_inning_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playerpitchinggamestats',
+            name='outs_recorded',
+            field=models.PositiveIntegerField(default=0, help_text='Outs recorded, 3 per inning. Innings pitched are set from it.', verbose_name='Outs'),
+        ),
+        migrations.AddField(
+            model_name='playerpitchingseasonstats',
+            name='outs_recorded',
+            field=models.PositiveIntegerField(default=0, verbose_name='Outs'),
+        ),
+        migrations.AddField(
+            model_name='teampitchingseasonstats',
+            name='outs_recorded',
+            field=models.PositiveIntegerField(default=0, verbose_name='Outs'),
+        ),
+        migrations.RunPython(backfill_outs_recorded,
+            migrations.RunPython.noop),
+    ]
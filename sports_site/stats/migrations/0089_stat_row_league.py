@@ -0,0 +1,59 @@
+# Generated by Django 4.0.9 on 2026-10-18 08:01
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def copy_league(apps, schema_editor):
+    """
+    Fills the league copied onto TeamGameStats from its team, then onto
+    the hitting and pitching rows from their TeamGameStats.
+    """
+    TeamSeason = apps.get_model("league", "TeamSeason")
+    TeamGameStats = apps.get_model("stats", "TeamGameStats")
+    TeamGameStats.objects.update(league=Subquery(TeamSeason.objects.filter(
+        pk=OuterRef("team")).values("team__league")[:1]))
+    for name in ["PlayerHittingGameStats", "PlayerPitchingGameStats"]:
+        apps.get_model("stats", name).objects.update(league=Subquery(
+            TeamGameStats.objects.filter(
+                pk=OuterRef("team_stats")).values("league")[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0033_alter_team_abbreviation'),
+        ('stats', '0088_outs_recorded'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playerhittinggamestats',
+            name='league',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='league.league'),
+        ),
+        migrations.AddField(
+            model_name='playerpitchinggamestats',
+            name='league',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='league.league'),
+        ),
+        migrations.AddField(
+            model_name='teamgamestats',
+            name='league',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='league.league'),
+        ),
+        migrations.AddIndex(
+            model_name='playerhittinggamestats',
+            index=models.Index(fields=['league', 'season'], name='hitting_game_league_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playerpitchinggamestats',
+            index=models.Index(fields=['league', 'season'], name='pitching_game_league_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teamgamestats',
+            index=models.Index(fields=['league', 'season'], name='team_game_league_idx'),
+        ),
+        migrations.RunPython(copy_league, migrations.RunPython.noop),
+    ]
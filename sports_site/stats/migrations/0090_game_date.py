@@ -0,0 +1,60 @@
+# Generated by Django 4.0.9 on 2026-10-18 08:04
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def copy_game_date(apps, schema_editor):
+    """
+    Fills the game and game_date copied onto the hitting and pitching rows
+    from their TeamGameStats.
+    """
+    TeamGameStats = apps.get_model("stats", "TeamGameStats")
+    team_stats = TeamGameStats.objects.filter(pk=OuterRef("team_stats"))
+    for name, game in [("PlayerHittingGameStats", "game"),
+            ("PlayerPitchingGameStats", "_game")]:
+        apps.get_model("stats", name).objects.update(**{
+            game: Subquery(team_stats.values("game")[:1]),
+            "game_date": Subquery(team_stats.values("game__date")[:1]),
+            })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0033_alter_team_abbreviation'),
+        ('stats', '0089_stat_row_league'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playerhittinggamestats',
+            name='game',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='league.game'),
+        ),
+        migrations.AddField(
+            model_name='playerhittinggamestats',
+            name='game_date',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='playerpitchinggamestats',
+            name='_game',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='league.game'),
+        ),
+        migrations.AddField(
+            model_name='playerpitchinggamestats',
+            name='game_date',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='playerhittinggamestats',
+            index=models.Index(fields=['player', 'game_date'], name='hitting_game_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playerpitchinggamestats',
+            index=models.Index(fields=['player', 'game_date'], name='pitching_game_date_idx'),
+        ),
+        migrations.RunPython(copy_game_date, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,21 @@
-from django.db import models
-from league.models import Game, PlayerSeason, SeasonStage, TeamSeason
+from core.cache import bump_version_on_commit
+from django.core.validators import RegexValidator
+from django.db import models, transaction
+from django.db.models import Case, Count, Max, Sum, When
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from league.models import (Game, League, Player, PlayerSeason, SeasonStage,
+    Team, TeamSeason, bump_league_version, track_league_data)
 
 
+BOXSCORE_CACHE_VERSION = "boxscore-version:{}"
+LEADERS_CACHE_VERSION = "leaders-version:{}"
+
 
 """Game Related Models"""
 class TeamGameStats(models.Model):
+    #league is copied from team on save, so league filters skip the joins.
+    league = models.ForeignKey(League, on_delete=models.CASCADE, null=True, blank=True, editable=False)
     season = models.ForeignKey(SeasonStage, on_delete=models.CASCADE, null=True)
     team = models.ForeignKey(TeamSeason, on_delete=models.CASCADE, null=True)
     game = models.ForeignKey(Game, on_delete=models.CASCADE, null=True)
@@ -16,13 +27,218 @@ class TeamGameStats(models.Model):
     tie = models.BooleanField(null=True, default=None)
 
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["league", "season"],
+                name="team_game_league_idx"),
+            ]
+
+
     def __str__(self):
         return f"{self.game} Game Stats"
 
 
     def save(self, *args, **kwargs):
         self.season = self.team.season
-        super(TeamGameStats,self).save(*args, **kwargs)
+        self.league_id = self.team.team.league_id
+
+        previous = None
+        if self.pk:
+            previous = TeamGameStats.objects.filter(pk=self.pk).values(
+                "team", *TeamStanding.RESULT_FIELDS).first()
+
+        with transaction.atomic():
+            super(TeamGameStats,self).save(*args, **kwargs)
+
+            current = TeamStanding.result(self)
+            if previous is None:
+                TeamStanding.apply(self.team_id, current)
+            else:
+                previous_team = previous.pop("team")
+                previous = TeamStanding.result(previous)
+                if previous_team == self.team_id:
+                    TeamStanding.apply(self.team_id,
+                        {k: current[k] - previous[k] for k in current})
+                else:
+                    TeamStanding.apply(previous_team,
+                        {k: -v for k, v in previous.items()})
+                    TeamStanding.apply(self.team_id, current)
+
+
+
+class TeamStanding(models.Model):
+    """
+    Record and run totals for a TeamSeason. Updated by delta from
+    TeamGameStats.save() and the post_delete receiver below, so the
+    standings page reads one row per team. Rebuild from scratch with
+    manage.py rebuild_standings.
+
+    Used: stats/views/views.py
+        StandingsView()
+    """
+    RESULT_FIELDS = ["win", "loss", "tie", "runs_for", "runs_against"]
+
+    league = models.ForeignKey(League, on_delete=models.CASCADE, null=True)
+    season = models.ForeignKey(SeasonStage, on_delete=models.CASCADE, null=True)
+    team = models.ForeignKey(TeamSeason, on_delete=models.CASCADE, null=True)
+
+    win = models.PositiveIntegerField(default=0, verbose_name="W")
+    loss = models.PositiveIntegerField(default=0, verbose_name="L")
+    tie = models.PositiveIntegerField(default=0, verbose_name="T")
+    runs_for = models.PositiveIntegerField(default=0, verbose_name="RF")
+    runs_against = models.PositiveIntegerField(default=0, verbose_name="RA")
+    pct = models.FloatField(null=True, blank=True, verbose_name="PCT")
+    differential = models.IntegerField(default=0, verbose_name="DIFF")
+
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["team"],
+                name="unique_team_standing"),
+            ]
+        indexes = [
+            models.Index(fields=["league", "season", "pct"],
+                name="standing_league_pct_idx"),
+            ]
+
+
+    def __str__(self):
+        return f"{self.team} Standing"
+
+
+    def calculate_ratios(self):
+        """
+        Sets pct and differential. pct is None before any results, matching
+        the SQL Cast expression in stats_defaults.py.
+        """
+        games = self.win + self.loss + self.tie
+        self.pct = (self.win + (self.tie * 0.5)) / games if games else None
+        self.differential = self.runs_for - self.runs_against
+
+
+    @staticmethod
+    def result(game_stats):
+        """
+        What a single TeamGameStats row adds to a standing, given either
+        the model object or a dict of its RESULT_FIELDS.
+        """
+        if not isinstance(game_stats, dict):
+            game_stats = {
+                field: getattr(game_stats, field)
+                for field in TeamStanding.RESULT_FIELDS}
+        return {
+            "win": 1 if game_stats["win"] else 0,
+            "loss": 1 if game_stats["loss"] else 0,
+            "tie": 1 if game_stats["tie"] else 0,
+            "runs_for": game_stats["runs_for"] or 0,
+            "runs_against": game_stats["runs_against"] or 0,
+            }
+
+
+    @classmethod
+    def apply(cls, team_pk, delta):
+        """
+        Adds delta, a dict of RESULT_FIELDS changes, to the TeamSeason's
+        standing. A standing that is missing, or that the delta would take
+        below zero, is out of step with its games, so it is recomputed
+        instead, see recompute().
+
+        Params:
+            team_pk - TeamSeason pk
+            delta - dict, ie {"win": 1, "runs_for": 5}
+        """
+        if team_pk is None:
+            return None
+
+        with transaction.atomic():
+            standing = cls.objects.select_for_update().filter(
+                team=team_pk).first()
+            if standing is None or any(getattr(standing, field) + value < 0
+                    for field, value in delta.items()):
+                return cls.recompute(team_pk)
+            for field, value in delta.items():
+                setattr(standing, field, getattr(standing, field) + value)
+            standing.calculate_ratios()
+            standing.save()
+        return standing
+
+
+    @classmethod
+    def recompute(cls, team_pk):
+        """
+        Sets the TeamSeason's standing from its saved TeamGameStats,
+        creating it if missing. Used by apply() when a delta can't be
+        trusted.
+
+        Params:
+            team_pk - TeamSeason pk
+        """
+        team_season = TeamSeason.objects.select_related("team").get(
+            pk=team_pk)
+        totals = TeamGameStats.objects.filter(team=team_pk).aggregate(
+            win=Count(Case(When(win=True, then=1))),
+            loss=Count(Case(When(loss=True, then=1))),
+            tie=Count(Case(When(tie=True, then=1))),
+            runs_for=Sum("runs_for"),
+            runs_against=Sum("runs_against"))
+
+        with transaction.atomic():
+            standing = cls.objects.select_for_update().filter(
+                team=team_pk).first()
+            if standing is None:
+                standing = cls(team=team_season)
+            standing.season_id = team_season.season_id
+            standing.league_id = team_season.team.league_id
+            for field, value in totals.items():
+                setattr(standing, field, value or 0)
+            standing.calculate_ratios()
+            standing.save()
+        return standing
+
+
+    @classmethod
+    def rebuild(cls, league_slug=None, season_pk=None):
+        """
+        Recreates standings from scratch with one grouped query over
+        TeamGameStats. Returns the number of standings written.
+
+        Params:
+            league_slug - League url slug, defaults to every league.
+            season_pk - SeasonStage pk, defaults to every stage.
+        """
+        game_stats = TeamGameStats.objects.filter(team__isnull=False)
+        standings = cls.objects.all()
+        if league_slug:
+            game_stats = game_stats.filter(league__url=league_slug)
+            standings = standings.filter(team__team__league__url=league_slug)
+        if season_pk:
+            game_stats = game_stats.filter(team__season=season_pk)
+            standings = standings.filter(team__season=season_pk)
+
+        totals = game_stats.values("team").annotate(
+            league=Max("league"),
+            season=Max("team__season"),
+            win=Count(Case(When(win=True, then=1))),
+            loss=Count(Case(When(loss=True, then=1))),
+            tie=Count(Case(When(tie=True, then=1))),
+            runs_for=Sum("runs_for"),
+            runs_against=Sum("runs_against"))
+
+        rebuilt = []
+        for row in totals:
+            standing = cls(team_id=row.pop("team"),
+                league_id=row.pop("league"),
+                season_id=row.pop("season"),
+                **{field: value or 0 for field, value in row.items()})
+            standing.calculate_ratios()
+            rebuilt.append(standing)
+
+        with transaction.atomic():
+            standings.delete()
+            cls.objects.bulk_create(rebuilt, batch_size=500)
+        for league_pk in {standing.league_id for standing in rebuilt}:
+            bump_league_version(league_pk)
+        return len(rebuilt)
 
 
 
@@ -39,16 +255,79 @@ class TeamGameLineScore(models.Model):
     eighth = models.PositiveIntegerField(null=True, blank=True, default=0, verbose_name="8")
     ninth = models.PositiveIntegerField(null=True, blank=True, default=0, verbose_name="9")
 
-    extras = models.CharField(max_length=50, null=True, default="None", blank=True, help_text="Extra innings score, formatted with dashes, - to separate each score. Ex for 3 extra innings, 0-1-1.", verbose_name="extras")
+    extras = models.CharField(max_length=50, null=True, default="None", blank=True, help_text="Extra innings score, formatted with dashes, - to separate each score. Ex for 3 extra innings, 0-1-1.", verbose_name="extras", validators=[RegexValidator(r"^(None|\d+(-\d+)*)?$", "Extra innings must be runs separated by dashes, ex 0-1-1.")])
+
+    INNINGS = ["first", "second", "third", "fourth", "fifth", "sixth",
+        "seventh", "eighth", "ninth"]
 
 
     def __str__(self):
         return f"{self.game.team.team} Linescore for {self.game}"
 
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super(TeamGameLineScore, self).save(*args, **kwargs)
+            self.set_inning_scores()
+
+
+    def extra_innings(self):
+        """Extra inning runs parsed from extras, ie "0-1-1" -> [0, 1, 1]"""
+        if self.extras in (None, "None", ""):
+            return []
+        return [int(runs) for runs in self.extras.split("-")]
+
+
+    def set_inning_scores(self):
+        """
+        Rewrites this linescore's InningScore rows, one per inning played
+        including extras, from the inning fields and extras.
+        """
+        runs = [getattr(self, inning) or 0 for inning in self.INNINGS]
+        runs += self.extra_innings()
+        self.inningscore_set.all().delete()
+        InningScore.objects.bulk_create([
+            InningScore(linescore=self, inning=inning, runs=inning_runs)
+            for inning, inning_runs in enumerate(runs, start=1)])
+
+
+
+class InningScore(models.Model):
+    """
+    Runs scored by a team in a single inning, kept in sync with the
+    TeamGameLineScore inning fields and extras string on save. Lets runs by
+    inning and game totals be summed in the database, ie
+        InningScore.objects.values("inning").annotate(runs=Sum("runs"))
+
+    Used: stats/get_stats.py
+        get_extra_innings(), get_runs_by_inning()
+    """
+    linescore = models.ForeignKey(TeamGameLineScore, on_delete=models.CASCADE)
+    inning = models.PositiveSmallIntegerField()
+    runs = models.PositiveIntegerField(default=0)
+
+
+    class Meta:
+        ordering = ["inning"]
+        constraints = [
+            models.UniqueConstraint(fields=["linescore", "inning"],
+                name="unique_linescore_inning"),
+            ]
+
+
+    def __str__(self):
+        return f"{self.linescore} Inning {self.inning}"
+
+
 
 class PlayerHittingGameStats(models.Model):
+    #league is copied from team_stats on save, so league filters skip the joins.
+    league = models.ForeignKey(League, on_delete=models.CASCADE, null=True, blank=True, editable=False)
     team_stats = models.ForeignKey(TeamGameStats, on_delete=models.CASCADE, null=True, blank=True)
+    #game and game_date are copied from team_stats on save, so date range
+    #queries filter and order on this table alone.
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, null=True, blank=True, editable=False)
+    game_date = models.DateField(null=True, blank=True, editable=False)
     season = models.ForeignKey(SeasonStage, on_delete=models.CASCADE, null=True, blank=True)
     player = models.ForeignKey(PlayerSeason, on_delete=models.CASCADE, null=True, blank=True)
 
@@ -89,6 +368,12 @@ class PlayerHittingGameStats(models.Model):
     class Meta:
         verbose_name = "Hitter's Game Stats"
         verbose_name_plural = "Hitter's Game Stats"
+        indexes = [
+            models.Index(fields=["league", "season"],
+                name="hitting_game_league_idx"),
+            models.Index(fields=["player", "game_date"],
+                name="hitting_game_date_idx"),
+            ]
 
 
     def __str__(self):
@@ -97,14 +382,203 @@ class PlayerHittingGameStats(models.Model):
 
     def save(self, *args, **kwargs):
         self.game = self.team_stats.game
+        self.game_date = self.game.date if self.game else None
         self.season = self.team_stats.season
+        self.league_id = self.team_stats.league_id
         self.hits = (self.singles + self.doubles + self.triples + self.homeruns)
-        super(PlayerHittingGameStats, self).save(*args , **kwargs)
+
+        previous = None
+        if self.pk:
+            previous = PlayerHittingGameStats.objects.filter(
+                pk=self.pk).values_list("player", "season").first()
+
+        #The post_save version bumps wait for the commit, after the refresh.
+        with transaction.atomic():
+            super(PlayerHittingGameStats, self).save(*args , **kwargs)
+
+            PlayerHittingSeasonStats.refresh(self.player_id, self.season_id)
+            if previous and previous != (self.player_id, self.season_id):
+                PlayerHittingSeasonStats.refresh(*previous)
+
+
+
+"""Season Rollup Models"""
+def _write_rollups(model, totals, player_pks, season_pk):
+    """
+    Writes player season rollups from grouped game row totals, creating,
+    updating or removing one row per player with at most one query each.
+
+    Params:
+        model - PlayerHittingSeasonStats or PlayerPitchingSeasonStats
+        totals - dict of PlayerSeason pk: summed columns, with "league".
+        player_pks - set of PlayerSeason pks refreshed, those missing from
+            totals have no game rows left and lose their rollup.
+        season_pk - SeasonStage pk
+    """
+    emptied = player_pks - totals.keys()
+    if emptied:
+        model.objects.filter(player__in=emptied, season=season_pk).delete()
+    if not totals:
+        return {}
+
+    rollups = {rollup.player_id: rollup for rollup in model.objects.filter(
+        player__in=totals.keys(), season=season_pk)}
+    existing = list(rollups.values())
+    created = []
+    for player_pk, row in totals.items():
+        rollup = rollups.get(player_pk)
+        if rollup is None:
+            rollup = rollups[player_pk] = model(
+                player_id=player_pk, season_id=season_pk)
+            created.append(rollup)
+        rollup.league_id = row.pop("league")
+        for stat, value in row.items():
+            setattr(rollup, stat, value or 0)
+        rollup.calculate_ratios()
+
+    if created:
+        model.objects.bulk_create(created)
+    if existing:
+        model.objects.bulk_update(existing, [field.name for field in
+            model._meta.concrete_fields
+            if field.name not in ("id", "player", "season")])
+    return rollups
+
+
+class PlayerHittingSeasonStats(models.Model):
+    """
+    Season to date hitting totals for a PlayerSeason in a SeasonStage, one
+    row per player per stage. Kept current by PlayerHittingGameStats.save()
+    and the post_delete receiver below, so the stats page reads a single
+    row per player instead of aggregating every game row.
+
+    Used: stats/views/views.py
+        StatsView()
+    """
+    SUM_FIELDS = [
+        "at_bats", "plate_appearances", "runs", "hits", "singles", "doubles",
+        "triples", "homeruns", "runs_batted_in", "walks", "strikeouts",
+        "stolen_bases", "caught_stealing", "hit_by_pitch", "sacrifice_flies"]
+
+    league = models.ForeignKey(League, on_delete=models.CASCADE, null=True)
+    season = models.ForeignKey(SeasonStage, on_delete=models.CASCADE, null=True)
+    player = models.ForeignKey(PlayerSeason, on_delete=models.CASCADE, null=True)
+
+    games = models.PositiveIntegerField(default=0, verbose_name="G")
+    at_bats = models.PositiveIntegerField(default=0, verbose_name="AB")
+    plate_appearances = models.PositiveIntegerField(default=0, verbose_name="PA")
+    runs = models.PositiveIntegerField(default=0, verbose_name="R")
+    hits = models.PositiveIntegerField(default=0, verbose_name="H")
+    singles = models.PositiveIntegerField(default=0, verbose_name="1B")
+    doubles = models.PositiveIntegerField(default=0, verbose_name="2B")
+    triples = models.PositiveIntegerField(default=0, verbose_name="3B")
+    homeruns = models.PositiveIntegerField(default=0, verbose_name="HR")
+    runs_batted_in = models.PositiveIntegerField(default=0, verbose_name="RBI")
+    walks = models.PositiveIntegerField(default=0, verbose_name="BB")
+    strikeouts = models.PositiveIntegerField(default=0, verbose_name="SO")
+    stolen_bases = models.PositiveIntegerField(default=0, verbose_name="SB")
+    caught_stealing = models.PositiveIntegerField(default=0, verbose_name="CS")
+    hit_by_pitch = models.PositiveIntegerField(default=0, verbose_name="HBP")
+    sacrifice_flies = models.PositiveIntegerField(default=0, verbose_name="SF")
+    average = models.FloatField(null=True, blank=True, verbose_name="AVG")
+    on_base_percentage = models.FloatField(null=True, blank=True, verbose_name="OBP")
+    slugging_percentage = models.FloatField(null=True, blank=True, verbose_name="SLG")
+    on_base_plus_slugging = models.FloatField(null=True, blank=True, verbose_name="OPS")
+
+
+    class Meta:
+        verbose_name = "Hitter's Season Stats"
+        verbose_name_plural = "Hitter's Season Stats"
+        constraints = [
+            models.UniqueConstraint(fields=["player", "season"],
+                name="unique_player_hitting_season"),
+            ]
+        indexes = [
+            models.Index(fields=["league", "season", "hits"],
+                name="hitting_season_league_idx"),
+            ]
+
+
+    def __str__(self):
+        return f"Player: {self.player.player} Season: {self.season}"
+
+
+    def calculate_ratios(self):
+        """
+        Sets AVG/OBP/SLG/OPS from the summed columns. Ratios with a zero
+        denominator are left as None, matching the SQL Cast expressions in
+        stats_defaults.py.
+        """
+        obp_top = self.hits + self.walks + self.hit_by_pitch
+        obp_bot = (self.at_bats + self.walks + self.hit_by_pitch +
+            self.sacrifice_flies)
+        total_bases = (self.singles + (self.doubles*2) + (self.triples*3) +
+            (self.homeruns*4))
+
+        self.average = self.hits / self.at_bats if self.at_bats else None
+        self.on_base_percentage = obp_top / obp_bot if obp_bot else None
+        self.slugging_percentage = (
+            total_bases / self.at_bats if self.at_bats else None)
+        if (self.on_base_percentage is not None and
+                self.slugging_percentage is not None):
+            self.on_base_plus_slugging = (
+                self.on_base_percentage + self.slugging_percentage)
+        else:
+            self.on_base_plus_slugging = None
+
+
+    @classmethod
+    def refresh(cls, player_pk, season_pk):
+        """
+        Re-totals the given PlayerSeason's game rows for a SeasonStage in a
+        single aggregate, and writes or removes the matching rollup row.
+
+        Params:
+            player_pk - PlayerSeason pk
+            season_pk - SeasonStage pk
+        """
+        return cls.refresh_many([player_pk], season_pk).get(player_pk)
+
+
+    @classmethod
+    def refresh_many(cls, player_pks, season_pk):
+        """
+        refresh() for several PlayerSeasons in one SeasonStage, with one
+        grouped aggregate and bulk writes, for saving a whole lineup.
+
+        Returns a dict of the written rollups keyed by PlayerSeason pk.
+
+        Params:
+            player_pks - iterable of PlayerSeason pks
+            season_pk - SeasonStage pk
+        """
+        player_pks = {pk for pk in player_pks if pk is not None}
+        if not player_pks or season_pk is None:
+            return {}
+
+        totals = {row.pop("player"): row for row in
+            PlayerHittingGameStats.objects.filter(
+                player__in=player_pks, season=season_pk).values(
+                    "player").annotate(
+                        league=Max("league"),
+                        games=Count("id"),
+                        **{stat: Sum(stat) for stat in cls.SUM_FIELDS}
+                    ).order_by()}
+
+        rollups = _write_rollups(cls, totals, player_pks, season_pk)
+        bump_version_on_commit(LEADERS_CACHE_VERSION.format(season_pk))
+        return rollups
 
 
 
 class PlayerPitchingGameStats(models.Model):
+    #league is copied from team_stats on save, so league filters skip the joins.
+    league = models.ForeignKey(League, on_delete=models.CASCADE, null=True, blank=True, editable=False)
     team_stats = models.ForeignKey(TeamGameStats, on_delete=models.CASCADE, null=True)
+    #_game and game_date are copied from team_stats on save, see
+    #PlayerHittingGameStats. game is already the games pitched column.
+    _game = models.ForeignKey(Game, on_delete=models.CASCADE, null=True, blank=True, editable=False)
+    game_date = models.DateField(null=True, blank=True, editable=False)
     season = models.ForeignKey(SeasonStage, on_delete=models.CASCADE, null=True)
     player = models.ForeignKey(PlayerSeason, on_delete=models.CASCADE, null=True)
 
@@ -118,6 +592,7 @@ class PlayerPitchingGameStats(models.Model):
     save_op = models.PositiveIntegerField(null=True, blank=True, default=0, verbose_name="SVO")
     innings_pitched = models.PositiveIntegerField(null=True, blank=True, default=0, verbose_name="IP", help_text="Full Innings Pitched\nFor 1/3, 2/3 innings use outs field.")
     _innings = models.FloatField(null=True, blank=True, default=0, verbose_name="IP")
+    outs_recorded = models.PositiveIntegerField(default=0, verbose_name="Outs", help_text="Outs recorded, 3 per inning. Innings pitched are set from it.")
     hits_allowed = models.PositiveIntegerField(null=True, blank=True, default=0, verbose_name="H")
     runs_allowed = models.PositiveIntegerField(null=True, blank=True, default=0, verbose_name="R")
     earned_runs = models.PositiveIntegerField(null=True, blank=True, default=0, verbose_name="ER")
@@ -134,6 +609,12 @@ class PlayerPitchingGameStats(models.Model):
     class Meta:
         verbose_name = "Pitching's Game Stats"
         verbose_name_plural = "Pitcher's Game Stats"
+        indexes = [
+            models.Index(fields=["league", "season"],
+                name="pitching_game_league_idx"),
+            models.Index(fields=["player", "game_date"],
+                name="pitching_game_date_idx"),
+            ]
 
 
     def __str__(self):
@@ -142,19 +623,339 @@ class PlayerPitchingGameStats(models.Model):
 
     def save(self, *args, **kwargs):
         self._game = self.team_stats.game
+        self.game_date = self._game.date if self._game else None
         self.season = self.team_stats.season
-        super(PlayerPitchingGameStats, self).save(*args , **kwargs)
+        self.league_id = self.team_stats.league_id
+        #outs_recorded is the source of truth, the innings columns follow it.
+        self.innings_pitched = self.outs_recorded // 3
+        self._innings = self.outs_recorded / 3
+
+        previous = None
+        if self.pk:
+            previous = PlayerPitchingGameStats.objects.filter(
+                pk=self.pk).values_list(
+                    "player", "season", "team_stats__team").first()
+
+        #The post_save version bumps wait for the commit, after the refresh.
+        with transaction.atomic():
+            super(PlayerPitchingGameStats, self).save(*args , **kwargs)
+
+            current = (self.player_id, self.season_id,
+                self.team_stats.team_id)
+            PlayerPitchingSeasonStats.refresh(current[0], current[1])
+            TeamPitchingSeasonStats.refresh(current[2])
+            if previous and previous != current:
+                PlayerPitchingSeasonStats.refresh(previous[0], previous[1])
+                TeamPitchingSeasonStats.refresh(previous[2])
+
+
+
+class PitchingSeasonStats(models.Model):
+    """
+    Abstract base holding the season pitching columns shared by the
+    player and team pitching rollups. ERA and WHIP are stored so the
+    stats pages can sort on an index instead of a per row expression.
+    """
+    league = models.ForeignKey(League, on_delete=models.CASCADE, null=True)
+    season = models.ForeignKey(SeasonStage, on_delete=models.CASCADE, null=True)
+
+    win = models.PositiveIntegerField(default=0, verbose_name="W")
+    loss = models.PositiveIntegerField(default=0, verbose_name="L")
+    game = models.PositiveIntegerField(default=0, verbose_name="G")
+    game_started = models.PositiveIntegerField(default=0, verbose_name="GS")
+    complete_game = models.PositiveIntegerField(default=0, verbose_name="CG")
+    shutout = models.PositiveIntegerField(default=0, verbose_name="SHO")
+    save_converted = models.PositiveIntegerField(default=0, verbose_name="SV")
+    save_op = models.PositiveIntegerField(default=0, verbose_name="SVO")
+    hits_allowed = models.PositiveIntegerField(default=0, verbose_name="H")
+    runs_allowed = models.PositiveIntegerField(default=0, verbose_name="R")
+    earned_runs = models.PositiveIntegerField(default=0, verbose_name="ER")
+    homeruns_allowed = models.PositiveIntegerField(default=0, verbose_name="HR")
+    hit_batters = models.PositiveIntegerField(default=0, verbose_name="HB")
+    walks_allowed = models.PositiveIntegerField(default=0, verbose_name="BB")
+    strikeouts = models.PositiveIntegerField(default=0, verbose_name="K")
+    outs_recorded = models.PositiveIntegerField(default=0, verbose_name="Outs")
+    innings_pitched = models.FloatField(default=0, verbose_name="IP")
+    era = models.FloatField(null=True, blank=True, verbose_name="ERA")
+    whip = models.FloatField(null=True, blank=True, verbose_name="WHIP")
 
 
+    class Meta:
+        abstract = True
+
+
+    def calculate_ratios(self):
+        """
+        Sets innings pitched, ERA and WHIP from the summed outs, so each
+        is a single division of whole numbers. ERA and WHIP are left as
+        None with no outs recorded, matching the SQL expressions in
+        stats_defaults.py.
+        """
+        self.innings_pitched = self.outs_recorded / 3
+        if self.outs_recorded:
+            self.era = (self.earned_runs * 27) / self.outs_recorded
+            self.whip = (
+                (self.walks_allowed + self.hits_allowed) * 3 /
+                self.outs_recorded)
+        else:
+            self.era = None
+            self.whip = None
+
+
+class PlayerPitchingSeasonStats(PitchingSeasonStats):
+    """
+    Season to date pitching totals for a PlayerSeason in a SeasonStage.
+    Kept current by PlayerPitchingGameStats.save() and the post_delete
+    receiver below.
+
+    Used: stats/views/views.py
+        PitchingStatsView()
+    """
+    #rollup field: PlayerPitchingGameStats field
+    SUM_FIELDS = {
+        "win": "win", "loss": "loss", "game": "game",
+        "game_started": "game_started", "complete_game": "complete_game",
+        "shutout": "shutout", "save_converted": "save_converted",
+        "save_op": "save_op", "hits_allowed": "hits_allowed",
+        "runs_allowed": "runs_allowed", "earned_runs": "earned_runs",
+        "homeruns_allowed": "homeruns_allowed", "hit_batters": "hit_batters",
+        "walks_allowed": "walks_allowed", "strikeouts": "strikeouts",
+        "outs_recorded": "outs_recorded"}
+
+    player = models.ForeignKey(PlayerSeason, on_delete=models.CASCADE, null=True)
+
 
+    class Meta:
+        verbose_name = "Pitcher's Season Stats"
+        verbose_name_plural = "Pitcher's Season Stats"
+        constraints = [
+            models.UniqueConstraint(fields=["player", "season"],
+                name="unique_player_pitching_season"),
+            ]
+        indexes = [
+            models.Index(fields=["league", "season", "era"],
+                name="pitching_season_era_idx"),
+            models.Index(fields=["league", "season", "whip"],
+                name="pitching_season_whip_idx"),
+            ]
+
+
+    def __str__(self):
+        return f"Player: {self.player.player} Season: {self.season}"
 
 
+    @classmethod
+    def refresh(cls, player_pk, season_pk):
+        """
+        Re-totals the given PlayerSeason's pitching rows for a SeasonStage
+        in a single aggregate, and writes or removes the rollup row.
 
+        Params:
+            player_pk - PlayerSeason pk
+            season_pk - SeasonStage pk
+        """
+        return cls.refresh_many([player_pk], season_pk).get(player_pk)
 
 
+    @classmethod
+    def refresh_many(cls, player_pks, season_pk):
+        """
+        refresh() for several PlayerSeasons in one SeasonStage, see
+        PlayerHittingSeasonStats.refresh_many().
 
+        Params:
+            player_pks - iterable of PlayerSeason pks
+            season_pk - SeasonStage pk
+        """
+        player_pks = {pk for pk in player_pks if pk is not None}
+        if not player_pks or season_pk is None:
+            return {}
 
+        totals = {row.pop("player"): row for row in
+            PlayerPitchingGameStats.objects.filter(
+                player__in=player_pks, season=season_pk).values(
+                    "player").annotate(
+                        league=Max("league"),
+                        **{k: Sum(v) for k, v in cls.SUM_FIELDS.items()}
+                    ).order_by()}
 
+        return _write_rollups(cls, totals, player_pks, season_pk)
 
 
+class TeamPitchingSeasonStats(PitchingSeasonStats):
+    """
+    Season to date pitching totals for a TeamSeason. Games are counted
+    from games started, as one pitcher starts each game.
 
+    Used: stats/views/views.py
+        TeamPitchingStatsView()
+    """
+    #rollup field: PlayerPitchingGameStats field
+    SUM_FIELDS = dict(PlayerPitchingSeasonStats.SUM_FIELDS,
+        game="game_started")
+
+    team_season = models.ForeignKey(TeamSeason, on_delete=models.CASCADE, null=True)
+
+
+    class Meta:
+        verbose_name = "Team Season Pitching Stats"
+        verbose_name_plural = "Team Season Pitching Stats"
+        constraints = [
+            models.UniqueConstraint(fields=["team_season"],
+                name="unique_team_pitching_season"),
+            ]
+        indexes = [
+            models.Index(fields=["league", "season", "era"],
+                name="team_pitching_season_era_idx"),
+            models.Index(fields=["league", "season", "whip"],
+                name="team_pitching_season_whip_idx"),
+            ]
+
+
+    def __str__(self):
+        return f"{self.team_season} Pitching Stats"
+
+
+    @classmethod
+    def refresh(cls, team_season_pk):
+        """
+        Re-totals every pitching row for the given TeamSeason in a single
+        aggregate, and writes or removes the rollup row.
+
+        Params:
+            team_season_pk - TeamSeason pk
+        """
+        if team_season_pk is None:
+            return None
+
+        totals = PlayerPitchingGameStats.objects.filter(
+            team_stats__team=team_season_pk).aggregate(
+                league=Max("league"),
+                season=Max("team_stats__team__season"),
+                rows=Count("id"),
+                **{k: Sum(v) for k, v in cls.SUM_FIELDS.items()})
+
+        if not totals.pop("rows"):
+            cls.objects.filter(team_season=team_season_pk).delete()
+            return None
+
+        rollup = cls.objects.filter(team_season=team_season_pk).first()
+        if rollup is None:
+            rollup = cls(team_season_id=team_season_pk)
+        rollup.league_id = totals.pop("league")
+        rollup.season_id = totals.pop("season")
+        for stat, value in totals.items():
+            setattr(rollup, stat, value or 0)
+        rollup.calculate_ratios()
+        rollup.save()
+        return rollup
+
+
+
+@receiver(post_delete, sender=TeamGameStats)
+def remove_team_game_result(sender, instance, **kwargs):
+    if TeamStanding.objects.filter(team=instance.team_id).exists():
+        TeamStanding.apply(instance.team_id,
+            {k: -v for k, v in TeamStanding.result(instance).items()})
+
+
+@receiver(post_delete, sender=PlayerHittingGameStats)
+def refresh_hitting_season_stats(sender, instance, **kwargs):
+    PlayerHittingSeasonStats.refresh(instance.player_id, instance.season_id)
+
+
+@receiver(post_delete, sender=PlayerPitchingGameStats)
+def refresh_pitching_season_stats(sender, instance, **kwargs):
+    PlayerPitchingSeasonStats.refresh(instance.player_id, instance.season_id)
+    team_season_pk = TeamGameStats.objects.filter(
+        pk=instance.team_stats_id).values_list("team", flat=True).first()
+    TeamPitchingSeasonStats.refresh(team_season_pk)
+
+
+
+"""Boxscore cache invalidation"""
+def bump_boxscore_version(game_pk):
+    """
+    Invalidates the cached boxscore page for the given Game pk, once the
+    current transaction commits.
+    """
+    if game_pk is not None:
+        bump_version_on_commit(BOXSCORE_CACHE_VERSION.format(game_pk))
+
+
+@receiver(post_save, sender=Game)
+@receiver(post_delete, sender=Game)
+def game_boxscore_changed(sender, instance, **kwargs):
+    bump_boxscore_version(instance.pk)
+
+
+@receiver(post_save, sender=Game)
+def copy_game_date(sender, instance, created, **kwargs):
+    """Keeps the copied game_date current when a game is rescheduled."""
+    if created:
+        return
+    PlayerHittingGameStats.objects.filter(game=instance).exclude(
+        game_date=instance.date).update(game_date=instance.date)
+    PlayerPitchingGameStats.objects.filter(_game=instance).exclude(
+        game_date=instance.date).update(game_date=instance.date)
+
+
+@receiver(post_save, sender=TeamGameStats)
+@receiver(post_delete, sender=TeamGameStats)
+def team_game_stats_boxscore_changed(sender, instance, **kwargs):
+    bump_boxscore_version(instance.game_id)
+
+
+@receiver(post_save, sender=TeamGameLineScore)
+@receiver(post_delete, sender=TeamGameLineScore)
+@receiver(post_save, sender=PlayerHittingGameStats)
+@receiver(post_delete, sender=PlayerHittingGameStats)
+@receiver(post_save, sender=PlayerPitchingGameStats)
+@receiver(post_delete, sender=PlayerPitchingGameStats)
+def player_game_stats_boxscore_changed(sender, instance, **kwargs):
+    team_stats_pk = (instance.game_id if sender is TeamGameLineScore
+        else instance.team_stats_id)
+    bump_boxscore_version(TeamGameStats.objects.filter(
+        pk=team_stats_pk).values_list("game", flat=True).first())
+
+
+@receiver(post_save, sender=Player)
+def player_names_changed(sender, instance, created, **kwargs):
+    """
+    Boxscores and league leaders show player names, so a renamed player
+    invalidates the games they played in and their stages' leaders.
+    """
+    if created:
+        return
+    game_pks = set(PlayerHittingGameStats.objects.filter(
+        player__player=instance).values_list("game", flat=True).distinct())
+    game_pks.update(PlayerPitchingGameStats.objects.filter(
+        player__player=instance).values_list("_game", flat=True).distinct())
+    for game_pk in game_pks:
+        bump_boxscore_version(game_pk)
+    for season_pk in PlayerSeason.objects.filter(player=instance).values_list(
+            "season", flat=True).distinct():
+        bump_version_on_commit(LEADERS_CACHE_VERSION.format(season_pk))
+
+
+@receiver(post_save, sender=Team)
+def team_names_changed(sender, instance, created, **kwargs):
+    """
+    Boxscores and league leaders show team names, so a renamed team
+    invalidates its games and its stages' leaders.
+    """
+    if created:
+        return
+    for game_pk in Game.objects.filter(
+            models.Q(home_team__team=instance) |
+            models.Q(away_team__team=instance)).values_list("pk", flat=True):
+        bump_boxscore_version(game_pk)
+    for season_pk in TeamSeason.objects.filter(team=instance).values_list(
+            "season", flat=True).distinct():
+        bump_version_on_commit(LEADERS_CACHE_VERSION.format(season_pk))
+
+
+track_league_data(TeamGameStats)
+track_league_data(TeamGameLineScore, "game__league")
+track_league_data(PlayerHittingGameStats)
+track_league_data(PlayerPitchingGameStats)
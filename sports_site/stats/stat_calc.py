@@ -1,76 +1,19 @@
-from math import floor
+from .formatters import format_innings, format_pitching_ratio, format_ratio
+
 
 def _convert_to_int(string_value):
     if '.' in string_value:
-        ret_val = ''
-        for char in string_value:
-            if char != '.':
-                ret_val += char
-        return int(ret_val)
-    elif string_value[0:1] == '.' :
-        return int(string_value[1:])
+        return int(string_value.replace('.', ''))
 
 def _normalize_str_length(str_value, req_length):
-    if len(str_value) != req_length:
-        for i in range(req_length - len(str_value)):
-            str_value +='0'
-    return str_value
-
-
-def _convert_to_str(float_val):
-    """
-    Used in news/views.py
-        home view to convert the average to string to display.
-    """
-    if float_val == None:
-        return ".000"
-    if float_val == 0:
-        return ".000"
-
-    str_value = str(round(float_val,3))
-
-    if str_value[0] != '0':
-        str_value = _normalize_str_length(str_value, 5)
-    else:
-        str_value = str_value[1:]
-        str_value = _normalize_str_length(str_value, 4)
-    return str_value
-
-
-def _convert_to_str_pitching(float_val):
-    if float_val == None:
-        return ".000"
-    if float_val == 0:
-        return "0.00"
-
-    str_value = str(round(float_val,2))
-
-    if str_value[0] != '0':
-        str_value = _normalize_str_length(str_value, 4)
-    else:
-        str_value = str_value[1:]
-        str_value = _normalize_str_length(str_value, 3)
-    return str_value
-
-
-def _convert_to_str_ip(float_val):
-    if float_val == None:
-        return ".000"
-    if float_val == 0:
-        return "0.0"
-
-    remainder = str(round(float_val % 1, 2))
-    full_inn = floor(float_val)
-
-    if remainder == '0.33':
-        return f"{full_inn}.1"
-    elif remainder == '0.67':
-        return f"{full_inn}.2"
-    else:
-        return f"{full_inn}.0"
-
+    return format(str_value, f"0<{req_length}")
 
 
+#Display formatting lives in formatters.py, names kept for the tables,
+#templatetags and views that import them from here.
+_convert_to_str = format_ratio
+_convert_to_str_pitching = format_pitching_ratio
+_convert_to_str_ip = format_innings
 
 
 def _calc_average(hits, at_bats):
@@ -0,0 +1,148 @@
+"""
+Bulk stat entry, for saving a team's whole lineup for a game at once.
+
+Game rows are filled in here the way PlayerHittingGameStats.save() and
+PlayerPitchingGameStats.save() would, from a TeamGameStats loaded once,
+then written with bulk_create/bulk_update in a single transaction. The
+season rollups and boxscore cache they feed are refreshed once per
+lineup instead of once per row, as is the league data version.
+
+Used: views/tgs_hitting_views.py, views/tgs_pitching_views.py
+"""
+from django.db import transaction
+from league.models import bump_league_version
+from .models import (PlayerHittingGameStats, PlayerHittingSeasonStats,
+    PlayerPitchingGameStats, PlayerPitchingSeasonStats,
+    TeamPitchingSeasonStats, bump_boxscore_version)
+
+
+def _fill_hitting(row, team_game_stats):
+    row.team_stats = team_game_stats
+    row.season_id = team_game_stats.season_id
+    row.league_id = team_game_stats.league_id
+    row.game = team_game_stats.game
+    row.game_date = row.game.date if row.game else None
+    row.hits = (row.singles + row.doubles + row.triples + row.homeruns)
+
+
+def _fill_pitching(row, team_game_stats):
+    row.team_stats = team_game_stats
+    row.season_id = team_game_stats.season_id
+    row.league_id = team_game_stats.league_id
+    row._game = team_game_stats.game
+    row.game_date = row._game.date if row._game else None
+    row.innings_pitched = row.outs_recorded // 3
+    row._innings = row.outs_recorded / 3
+
+
+def _refresh_hitting(team_game_stats, player_pks):
+    PlayerHittingSeasonStats.refresh_many(player_pks,
+        team_game_stats.season_id)
+
+
+def _refresh_pitching(team_game_stats, player_pks):
+    PlayerPitchingSeasonStats.refresh_many(player_pks,
+        team_game_stats.season_id)
+    TeamPitchingSeasonStats.refresh(team_game_stats.team_id)
+
+
+HITTING = (PlayerHittingGameStats, _fill_hitting, _refresh_hitting)
+PITCHING = (PlayerPitchingGameStats, _fill_pitching, _refresh_pitching)
+
+
+def _create(kind, team_game_stats, players):
+    model, fill, refresh = kind
+    players = list({player.pk: player
+        for player in players if player}.values())
+    existing = {row.player_id: row for row in model.objects.filter(
+        team_stats=team_game_stats, player__in=players).select_related(
+            "player__player")}
+
+    created = []
+    for player in players:
+        if player.pk not in existing:
+            row = model(player=player)
+            fill(row, team_game_stats)
+            created.append(row)
+
+    with transaction.atomic():
+        model.objects.bulk_create(created)
+        refresh(team_game_stats, [row.player_id for row in created])
+    if created:
+        bump_boxscore_version(team_game_stats.game_id)
+        bump_league_version(team_game_stats.league_id)
+    return created, [existing[player.pk] for player in players
+        if player.pk in existing]
+
+
+def _save(kind, team_game_stats, rows):
+    model, fill, refresh = kind
+    rows = list(rows)
+    new = [row for row in rows if row.pk is None]
+    changed = [row for row in rows if row.pk is not None]
+    #Rows can be moved to another player, whose rollup must drop the game.
+    player_pks = set(model.objects.filter(
+        pk__in=[row.pk for row in changed]).values_list("player", flat=True))
+
+    for row in rows:
+        fill(row, team_game_stats)
+        player_pks.add(row.player_id)
+
+    with transaction.atomic():
+        model.objects.bulk_create(new)
+        model.objects.bulk_update(changed, [field.name for field in
+            model._meta.concrete_fields if not field.primary_key])
+        refresh(team_game_stats, player_pks)
+    if rows:
+        bump_boxscore_version(team_game_stats.game_id)
+        bump_league_version(team_game_stats.league_id)
+    return rows
+
+
+def create_hitting_stats(team_game_stats, players):
+    """
+    Creates blank hitting rows in a game for every player that doesn't
+    already have one, in one insert.
+
+    Returns (created, existing) lists of PlayerHittingGameStats.
+
+    Params:
+        team_game_stats - TeamGameStats object, with game loaded.
+        players - iterable of PlayerSeason objects, None's are skipped.
+    """
+    return _create(HITTING, team_game_stats, players)
+
+
+def create_pitching_stats(team_game_stats, players):
+    """
+    Creates blank pitching rows, see create_hitting_stats.
+
+    Returns (created, existing) lists of PlayerPitchingGameStats.
+    """
+    return _create(PITCHING, team_game_stats, players)
+
+
+def save_hitting_stats(team_game_stats, rows):
+    """
+    Saves a lineup's hitting rows, ie from a formset saved with
+    commit=False, with one insert for new rows and one update for the
+    rest.
+
+    Returns the saved rows.
+
+    Params:
+        team_game_stats - TeamGameStats object the rows belong to, with
+            game loaded.
+        rows - iterable of PlayerHittingGameStats.
+    """
+    return _save(HITTING, team_game_stats, rows)
+
+
+def save_pitching_stats(team_game_stats, rows):
+    """
+    Saves a game's pitching rows, see save_hitting_stats. Innings are set
+    from outs_recorded.
+
+    Returns the saved rows.
+    """
+    return _save(PITCHING, team_game_stats, rows)
@@ -1,5 +1,5 @@
 from django.db.models import  F, FloatField, Sum, Count, Case, When
-from django.db.models.functions import Cast
+from django.db.models.functions import Cast, NullIf
 
 
 basic_stat_defaults = {
@@ -49,18 +49,21 @@ slugging_percentage = (
     )
 
 
+#Pitching ratios are worked out from summed outs, 3 per inning, so
+#innings are only ever divided once, after summing.
+innings_pitched = Cast(F('outs_recorded'), FloatField()) / 3
+
 era = (
-            Cast(F('earned_runs'),FloatField()) * 9 /
-            Cast(F('innings_pitched'), FloatField())
-            )
+    Cast(F('earned_runs'), FloatField()) * 27 /
+    Cast(NullIf(F('outs_recorded'), 0), FloatField())
+    )
 whip = (
     (
     Cast(F('walks_allowed'), FloatField())
     + Cast(F('hits_allowed'), FloatField())
-    ) /
-    (
-    Cast(F('innings_pitched'), FloatField())
-    ))
+    ) * 3 /
+    Cast(NullIf(F('outs_recorded'), 0), FloatField())
+    )
 
 
 #Team Options -- Standings
@@ -105,14 +108,15 @@ basic_pitching_sums_team = [
     "win", "loss", ("game", "game_started"), "game_started", "complete_game", "shutout",
     "save_converted", "save_op", "hits_allowed", "runs_allowed", "earned_runs",
     "homeruns_allowed", "hit_batters", "walks_allowed", "strikeouts",
-    ("innings_pitched", "_innings")]
+    "outs_recorded"]
 basic_pitching_sums_league = [
     "win", "loss", "game", "game_started", "complete_game", "shutout",
     "save_converted", "save_op", "hits_allowed", "runs_allowed", "earned_runs",
     "homeruns_allowed", "hit_batters", "walks_allowed", "strikeouts",
-    ("innings_pitched", "_innings")]
+    "outs_recorded"]
 #Need to fix to add earned runs, innings pitched, walk, hits for league leader pages
-basic_pitching_ratios = {"era": era, "whip": whip}
+basic_pitching_ratios = {
+    "innings_pitched": innings_pitched, "era": era, "whip": whip}
 
 
 #Team Record/Stast default --> Standings
@@ -122,6 +126,7 @@ basic_team_ratios = {"win": win, "loss": loss, "tie": tie, "pct": pct, "differen
 ## Extra stats below boxscore defaults:
 below_boxscore_sums = ["doubles", "triples", "homeruns", "runs_batted_in",
     "two_out_runs_batted_in", "stolen_bases", "caught_stealing"]
+below_pitching_boxscore_sums = ["hit_batters"]
 
 
 ##Default dict
@@ -171,10 +176,10 @@ hitting_league_leaders_defaults = {
 """Player Stats Page Defaults"""
 last_x_hitting_stats_defaults = {
     "initial": {
-        "date": F("team_stats__game__date")
+        "date": F("game_date")
         },
     "default_stats": [basic_stat_sums, ratio_stats],
-    "annotation_value": "team_stats__game__date"
+    "annotation_value": "game_date"
     }
 
 player_career_hitting_stats = {
@@ -198,18 +203,49 @@ player_career_hitting_stats_totals = {
     "additional_keys": {"year": "Career"},
     }
 
-below_boxscore_totals = {
-    "initial": {},
-    "default_stats": [below_boxscore_sums, {}],
-    "additional_keys": {},
-    }
-
 league_standings = {
     "initial": {'team_name': F("team__team__name")},
     "default_stats": [basic_team_sums, basic_team_ratios],
     "annotation_value": "team"
     }
 
+"""Season Rollup Defaults --> read stored totals, no annotation"""
+season_rollup_hitting = {
+    "initial": {
+        'first': F("player__player__first_name"),
+        'last': F("player__player__last_name")},
+    "fields": ["player"] + basic_stat_sums + list(ratio_stats),
+    }
+
+season_rollup_pitching = {
+    "initial": {
+        'first': F("player__player__first_name"),
+        'last': F("player__player__last_name")},
+    "fields": ["player"] + [
+        val[0] if type(val) == tuple else val
+        for val in basic_pitching_sums_league] + list(basic_pitching_ratios),
+    }
+
+team_season_rollup_pitching = {
+    "initial": {
+        "team": F("team_season__team__name")},
+    "fields": ["team_season"] + [
+        val[0] if type(val) == tuple else val
+        for val in basic_pitching_sums_team] + list(basic_pitching_ratios),
+    }
+
+standings_rollup = {
+    "initial": {'team_name': F("team__team__name")},
+    "fields": ["team"] + basic_team_sums + list(basic_team_ratios),
+    }
+
+rollup_dict_choices = {
+    "all_season_hitting": season_rollup_hitting,
+    "all_season_pitching": season_rollup_pitching,
+    "team_season_pitching": team_season_rollup_pitching,
+    "league_standings": standings_rollup,
+    }
+
 stats_dict_choices = {
     "all_season_hitting": stats_page_hitting_defaults,
     "all_season_pitching": stats_page_pitching_defaults,
@@ -220,7 +256,6 @@ stats_dict_choices = {
     "last_x_hitting_stats_totals": last_x_hitting_stats_totals_defaults,
     "player_career_hitting_stats": player_career_hitting_stats,
     "player_career_hitting_stats_totals": player_career_hitting_stats_totals,
-    "below_boxscore_totals": below_boxscore_totals,
     "league_standings": league_standings,
     }
 
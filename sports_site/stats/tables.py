@@ -1,10 +1,34 @@
 import django_tables2 as tables
-from .models import (PlayerHittingGameStats, PlayerPitchingGameStats,
-    TeamGameLineScore, TeamGameStats)
+from .models import (PlayerHittingGameStats, PlayerHittingSeasonStats,
+    PlayerPitchingGameStats, PlayerPitchingSeasonStats, TeamGameLineScore,
+    TeamGameStats, TeamPitchingSeasonStats, TeamStanding)
+from .columnar import add_hitting_ratios, add_pitching_ratios
+from .formatters import format_outs
 from .stat_calc import (_convert_to_str, _convert_to_str_ip,
     _convert_to_str_pitching)
 
 
+class ColumnarRatiosMixin:
+    """
+    Mixin for tables of aggregated dict rows. Computes the ratio columns
+    of every row on the page, and their display strings, in one pass
+    before rendering, see stats/columnar.py. Cells then read the
+    preformatted "<stat>_display" strings.
+    """
+    add_ratios = staticmethod(add_hitting_ratios)
+
+    def before_render(self, request):
+        super().before_render(request)
+        self.add_ratios(self.paginated_rows.data)
+
+    def display(self, record, stat, convert):
+        """Preformatted stat, or convert(stat) if before_render didn't run."""
+        try:
+            return record[f"{stat}_display"]
+        except KeyError:
+            return convert(record[stat])
+
+
 
 class ASPlayerHittingGameStatsTable(tables.Table):
     """
@@ -64,10 +88,10 @@ class ASPlayerPitchingGameStatsTable(tables.Table):
 
 
     def render_innings_pitched(self, record):
-        return _convert_to_str_ip(record.innings_pitched)
+        return format_outs(record.outs_recorded)
 
 
-class TeamHittingStatsTable(tables.Table):
+class TeamHittingStatsTable(ColumnarRatiosMixin, tables.Table):
     """
     Table used to display hitting stats aggregates for given team.
 
@@ -84,16 +108,22 @@ class TeamHittingStatsTable(tables.Table):
 
 
     def render_average(self, record):
-        return _convert_to_str(record['average'])
+        return self.display(record, "average", _convert_to_str)
 
     def render_on_base_percentage(self, record):
-        return _convert_to_str(record['on_base_percentage'])
+        return self.display(record, "on_base_percentage", _convert_to_str)
 
 
-class PlayerHittingStatsTable(tables.Table):
-    """Table used to display stats for given game"""
+class PlayerHittingStatsTable(ColumnarRatiosMixin, tables.Table):
+    """
+    Table used to display season hitting stats, read from the season
+    rollup rows.
+
+    Used: stats/views/views.py
+        StatsView()
+    """
     class Meta:
-        model = PlayerHittingGameStats
+        model = PlayerHittingSeasonStats
         template_name = "stats/bootstrap4-responsive-custom.html"
         fields = ("first", "last", "at_bats", "plate_appearances",
             "runs", "hits", "doubles", "triples", "homeruns", "runs_batted_in",
@@ -102,10 +132,10 @@ class PlayerHittingStatsTable(tables.Table):
 
 
     def render_average(self, record):
-        return _convert_to_str(record['average'])
+        return self.display(record, "average", _convert_to_str)
 
     def render_on_base_percentage(self, record):
-        return _convert_to_str(record['on_base_percentage'])
+        return self.display(record, "on_base_percentage", _convert_to_str)
 
 
 """TEST TABLE for CLASS BASED VIEW"""
@@ -127,7 +157,7 @@ class PlayerHittingStatsTable2(tables.Table):
         return _convert_to_str(record['on_base_percentage'])
 
 
-class PlayerPitchingStatsTable(tables.Table):
+class PlayerPitchingStatsTable(ColumnarRatiosMixin, tables.Table):
     """
     Table used to display pitching stats for season.
 
@@ -136,8 +166,9 @@ class PlayerPitchingStatsTable(tables.Table):
     """
     era = tables.Column(verbose_name="ERA")
     whip = tables.Column(verbose_name="WHIP")
+    add_ratios = staticmethod(add_pitching_ratios)
     class Meta:
-        model = PlayerPitchingGameStats
+        model = PlayerPitchingSeasonStats
         template_name = "stats/bootstrap4-responsive-custom.html"
         fields = ("first", "last", "win", "loss", "era", "game", "game_started",
             "complete_game", "shutout", "save_converted", "save_op",
@@ -147,28 +178,29 @@ class PlayerPitchingStatsTable(tables.Table):
 
 
     def render_era(self, record):
-        return _convert_to_str_pitching(record['era'])
+        return self.display(record, "era", _convert_to_str_pitching)
 
 
     def render_whip(self, record):
-        return _convert_to_str_pitching(record['whip'])
+        return self.display(record, "whip", _convert_to_str_pitching)
 
 
     def render_innings_pitched(self, record):
-        return _convert_to_str_ip(record['innings_pitched'])
+        return self.display(record, "innings_pitched", _convert_to_str_ip)
 
 
-class TeamPitchingStatsTable(tables.Table):
+class TeamPitchingStatsTable(ColumnarRatiosMixin, tables.Table):
     """
     Table used to display pitching stats for season.
 
     Used: stats/views/views.py
-        team_pitching_stats_display_view()
+        TeamPitchingStatsView()
     """
     era = tables.Column(verbose_name="ERA")
     whip = tables.Column(verbose_name="WHIP")
+    add_ratios = staticmethod(add_pitching_ratios)
     class Meta:
-        model = PlayerPitchingGameStats
+        model = TeamPitchingSeasonStats
         template_name = "stats/bootstrap4-responsive-custom.html"
         fields = ("team", "win", "loss", "era", "game", "game_started",
             "complete_game", "shutout", "save_converted", "save_op",
@@ -178,15 +210,15 @@ class TeamPitchingStatsTable(tables.Table):
 
 
     def render_era(self, record):
-        return _convert_to_str_pitching(record['era'])
+        return self.display(record, "era", _convert_to_str_pitching)
 
 
     def render_whip(self, record):
-        return _convert_to_str_pitching(record['whip'])
+        return self.display(record, "whip", _convert_to_str_pitching)
 
 
     def render_innings_pitched(self, record):
-        return _convert_to_str_ip(record['innings_pitched'])
+        return self.display(record, "innings_pitched", _convert_to_str_ip)
 
 
 class TeamGameLineScoreTable(tables.Table):
@@ -242,10 +274,10 @@ class TeamGameLineScoreTable(tables.Table):
 class StandingsTable(tables.Table):
     """
     Used: stats/views/views.py
-        standings_display_view()
+        StandingsView()
     """
     class Meta:
-        model = TeamGameStats
+        model = TeamStanding
         template_name = "stats/bootstrap4-responsive-custom.html"
         fields = ["team_name", "win", "loss", "tie", "pct", "runs_for",
             "runs_against", "differential",]
@@ -302,6 +334,8 @@ class PitchingOrderTable(tables.Table):
         "earned_runs", "walks_allowed", "strikeouts", "homeruns_allowed")
 
 
+    def render_innings_pitched(self, record):
+        return format_outs(record.outs_recorded)
 
 
 class PlayerPitchingGameStatsTable(tables.Table):
@@ -319,6 +353,10 @@ class PlayerPitchingGameStatsTable(tables.Table):
             )
 
 
+    def render_innings_pitched(self, record):
+        return format_outs(record.outs_recorded)
+
+
 class PlayerPageHittingStatsTable(tables.Table):
     """
     Table used to display personal hitting stats for given player on their
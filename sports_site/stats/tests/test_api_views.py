@@ -0,0 +1,139 @@
+from django.test import TestCase
+from django.urls import reverse
+from league.models import League, Player, PlayerSeason, Roster, SeasonStage
+from stats.models import PlayerHittingSeasonStats, TeamStanding
+from stats.views.api_views import decode_cursor, encode_cursor
+
+
+
+class StatsAPIViewTest(TestCase):
+    """
+    Tests stats_api_view
+    from stats/views/api_views.py
+
+    'api/<slug:endpoint>/',
+    views.stats_api_view,
+    name='stats-api'
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.league = League.objects.get(id=1)
+        cls.stage = SeasonStage.objects.get(id=3)
+        roster = Roster.objects.filter(team__season=cls.stage).first()
+        for i, hits in enumerate([5, 5, 5, 3, 3, 1, 0, 0]):
+            player = Player.objects.create(league=cls.league,
+                first_name="Api", last_name=f"Player {i}")
+            player_season = PlayerSeason.objects.create(player=player,
+                team=roster, season=cls.stage, number=i, position="LF")
+            PlayerHittingSeasonStats.objects.update_or_create(
+                player=player_season, season=cls.stage,
+                defaults={"league": cls.league, "hits": hits,
+                    "at_bats": 10 if hits else 0,
+                    "average": hits / 10 if hits else None})
+
+
+    def get(self, endpoint, headers={}, **params):
+        params.setdefault("league", self.league.url)
+        return self.client.get(reverse("stats-api", args=[endpoint]), params,
+            **headers)
+
+
+    def expected_order(self, sort):
+        rows = PlayerHittingSeasonStats.objects.filter(league=self.league,
+            season=self.stage).values("player", sort)
+        with_value = sorted((row for row in rows if row[sort] is not None),
+            key=lambda row: (-row[sort], row["player"]))
+        without = sorted((row for row in rows if row[sort] is None),
+            key=lambda row: row["player"])
+        return [row["player"] for row in with_value + without]
+
+
+    def read_all(self, endpoint, **params):
+        rows, pages = [], 0
+        response = self.get(endpoint, **params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            rows += data["results"]
+            pages += 1
+            if data["next"] is None:
+                return rows, pages
+            response = self.client.get(data["next"])
+
+
+    def test_keyset_pages_cover_every_row_once(self):
+        rows, pages = self.read_all("hitting", limit=3)
+        self.assertEqual([row["player"] for row in rows],
+            self.expected_order("hits"))
+        self.assertEqual(pages, -(-len(rows) // 3))
+
+
+    def test_keyset_pages_with_null_sort_values(self):
+        rows, _ = self.read_all("hitting", limit=2, sort="-average")
+        self.assertEqual([row["player"] for row in rows],
+            self.expected_order("average"))
+
+
+    def test_ascending_sort(self):
+        rows, _ = self.read_all("hitting", limit=3, sort="hits",
+            fields="hits")
+        hits = [row["hits"] for row in rows]
+        self.assertEqual(hits, sorted(hits))
+
+
+    def test_fields_projection(self):
+        response = self.get("hitting", fields="first,last,hits")
+        for row in response.json()["results"]:
+            self.assertEqual(list(row), ["player", "first", "last", "hits"])
+
+
+    def test_unknown_field_or_sort(self):
+        response = self.get("hitting", fields="hits,nonsense")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("nonsense", response.json()["error"])
+        response = self.get("hitting", sort="-nonsense")
+        self.assertEqual(response.status_code, 400)
+
+
+    def test_bad_params(self):
+        self.assertEqual(self.get("hitting", limit=0).status_code, 400)
+        self.assertEqual(self.get("hitting", limit="x").status_code, 400)
+        self.assertEqual(self.get("hitting", cursor="x").status_code, 400)
+        self.assertEqual(self.get("hitting", season="x").status_code, 400)
+        self.assertEqual(self.get("nonsense").status_code, 404)
+        self.assertEqual(self.get("hitting", league="nonsense").status_code,
+            404)
+
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(.333, 12)), (.333, 12))
+        self.assertEqual(decode_cursor(encode_cursor(None, 4)), (None, 4))
+
+
+    def test_etag(self):
+        response = self.get("hitting")
+        etag = response["ETag"]
+        response = self.get("hitting", headers={"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, 304)
+
+        PlayerHittingSeasonStats.objects.filter(league=self.league).update(
+            hits=20)
+        response = self.get("hitting", headers={"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+    def test_other_endpoints(self):
+        for endpoint in ["pitching", "team-hitting", "team-pitching",
+                "standings"]:
+            rows, _ = self.read_all(endpoint, limit=1)
+            self.assertTrue(all(len(row) > 1 for row in rows))
+
+        rows, _ = self.read_all("standings", limit=1, fields="team_name,win")
+        self.assertEqual(len(rows), TeamStanding.objects.filter(
+            league=self.league, season=self.stage).count())
+
+
+    def test_post_not_allowed(self):
+        response = self.client.post(reverse("stats-api", args=["hitting"]))
+        self.assertEqual(response.status_code, 405)
@@ -0,0 +1,96 @@
+import random
+from django.test import TestCase
+from stats.columnar import (add_hitting_ratios, add_pitching_ratios,
+    format_innings, format_pitching_ratios, format_ratios,
+    hitting_ratio_columns)
+from stats.stat_calc import (_convert_to_str, _convert_to_str_ip,
+    _convert_to_str_pitching)
+
+
+#Values where str(round()) and fixed width formatting disagree, plus ties.
+EDGE_VALUES = [None, 0, 0.0, 1.0, 0.0005, 0.0004999, 0.9995, 0.99949, 0.005,
+    0.004999, 9.9995, 10.0, 12.5, 123.456, -0.5, 0.125, 1/3, 2/3, 5 + 1/3,
+    5 + 2/3, 7.0]
+
+
+class FormatTests(TestCase):
+    """
+    Tests format_ratios, format_pitching_ratios and format_innings from
+    stats/columnar.py against the scalar functions in stat_calc.py
+    """
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(13)
+        cls.values = EDGE_VALUES + [
+            rng.randint(0, 400) / rng.randint(1, 600) for _ in range(5000)] + [
+            rng.randint(0, 300) / 3 for _ in range(1000)]
+
+
+    def assertMatches(self, vectorized, scalar):
+        for value, text in zip(self.values, vectorized(self.values)):
+            self.assertEqual(scalar(value), text, value)
+
+
+    def test_format_ratios(self):
+        self.assertMatches(format_ratios, _convert_to_str)
+
+
+    def test_format_pitching_ratios(self):
+        self.assertMatches(format_pitching_ratios, _convert_to_str_pitching)
+
+
+    def test_format_innings(self):
+        self.assertMatches(format_innings, _convert_to_str_ip)
+
+
+    def test_empty(self):
+        self.assertEqual(format_ratios([]), [])
+        self.assertEqual(add_hitting_ratios([]), [])
+
+
+class RatioColumnsTests(TestCase):
+    """
+    Tests the ratio columns from stats/columnar.py
+    """
+    def test_hitting_ratios(self):
+        rows = [
+            {"hits": 3, "at_bats": 10, "walks": 1, "hit_by_pitch": 1,
+             "sacrifice_flies": 1, "doubles": 1, "triples": 0, "homeruns": 1},
+            {"hits": 0, "at_bats": 0, "walks": 0, "hit_by_pitch": 0,
+             "sacrifice_flies": 0, "doubles": 0, "triples": 0, "homeruns": 0},
+            {"hits": None, "at_bats": 4},
+            ]
+        add_hitting_ratios(rows)
+        self.assertEqual(rows[0]["average"], 3 / 10)
+        self.assertEqual(rows[0]["on_base_percentage"], 5 / 13)
+        self.assertEqual(rows[0]["slugging_percentage"], 7 / 10)
+        self.assertEqual(rows[0]["on_base_plus_slugging"], 5 / 13 + 7 / 10)
+        self.assertEqual(rows[0]["average_display"], ".300")
+        self.assertEqual(rows[0]["on_base_plus_slugging_display"], "1.085")
+        self.assertIsNone(rows[1]["average"])
+        self.assertIsNone(rows[1]["on_base_percentage"])
+        self.assertEqual(rows[1]["average_display"], ".000")
+        self.assertEqual(rows[2]["average"], 0)
+        self.assertEqual(rows[2]["average_display"], ".000")
+
+
+    def test_columns_are_arrays(self):
+        columns = hitting_ratio_columns([{"hits": 1, "at_bats": 2}] * 3)
+        self.assertEqual(columns["average"].tolist(), [0.5] * 3)
+
+
+    def test_pitching_ratios(self):
+        rows = [
+            {"earned_runs": 2, "walks_allowed": 1, "hits_allowed": 4,
+             "outs_recorded": 19},
+            {"earned_runs": 0, "walks_allowed": 1, "hits_allowed": 0,
+             "outs_recorded": 0},
+            ]
+        add_pitching_ratios(rows)
+        self.assertEqual(rows[0]["era"], 54 / 19)
+        self.assertEqual(rows[0]["era_display"], "2.84")
+        self.assertEqual(rows[0]["whip_display"], ".79")
+        self.assertEqual(rows[0]["innings_pitched_display"], "6.1")
+        self.assertIsNone(rows[1]["era"])
+        self.assertEqual(rows[1]["era_display"], ".000")
+        self.assertEqual(rows[1]["innings_pitched_display"], "0.0")
@@ -0,0 +1,305 @@
+import datetime
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.db.models import Sum
+from league.models import Game, SeasonStage, TeamSeason
+from stats.models import (InningScore, PlayerHittingGameStats,
+    PlayerHittingSeasonStats, PlayerPitchingGameStats,
+    PlayerPitchingSeasonStats, TeamGameLineScore, TeamGameStats,
+    TeamStanding)
+
+
+class RebuildStandingsCommandTest(TestCase):
+    """
+    Tests stats/management/commands/rebuild_standings.py
+    """
+    def test_rebuild_all(self):
+        TeamStanding.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_standings", stdout=out)
+        self.assertTrue(TeamStanding.objects.exists())
+        self.assertIn(f"Rebuilt {TeamStanding.objects.count()}", out.getvalue())
+
+
+    def test_rebuild_filtered_by_league(self):
+        TeamStanding.objects.all().delete()
+        call_command("rebuild_standings", league="TL", stdout=StringIO())
+        teams = TeamSeason.objects.filter(
+            teamstanding__isnull=False).values_list(
+                "team__league__url", flat=True)
+        self.assertEqual(set(teams), {"TL"})
+
+
+class BenchFormattersCommandTest(TestCase):
+    """
+    Tests stats/management/commands/bench_formatters.py
+    """
+    def test_reports_each_formatter(self):
+        out = StringIO()
+        call_command("bench_formatters", count=1000, stdout=out)
+        for name in ["format_ratio", "format_pitching_ratio",
+                "format_innings"]:
+            self.assertIn(f"{name}: 1000 values", out.getvalue())
+
+
+class BackfillGameDatesCommandTest(TestCase):
+    """
+    Tests stats/management/commands/backfill_game_dates.py
+    """
+    def test_backfill(self):
+        PlayerHittingGameStats.objects.update(game=None, game_date=None)
+        PlayerPitchingGameStats.objects.update(_game=None, game_date=None)
+        out = StringIO()
+        call_command("backfill_game_dates", league="TL", stdout=out)
+        hitting = PlayerHittingGameStats.objects.all()
+        self.assertTrue(hitting.exists())
+        for row in hitting.select_related("team_stats__game"):
+            self.assertEqual(row.game, row.team_stats.game)
+            self.assertEqual(row.game_date, row.team_stats.game.date)
+        self.assertFalse(PlayerPitchingGameStats.objects.filter(
+            game_date__isnull=True).exists())
+        self.assertIn(f"Backfilled {hitting.count()} hitting", out.getvalue())
+
+
+class ImportBoxscoresCommandTest(TestCase):
+    """
+    Tests stats/management/commands/import_boxscores.py
+    """
+    CSV = (
+        "record,date,home,away,home_score,away_score,team,player,at_bats,"
+        "singles,doubles,innings_pitched,earned_runs,innings\n"
+        "game,2020-06-01,TTO,TTT,4,3,,,,,,,,\n"
+        "hitting,,,,,,TTO,Player One,4,1,1,,,\n"
+        "pitching,,,,,,TTT,player two,,,,6.2,2,\n"
+        "linescore,,,,,,TTO,,,,,,,1-0-0-0-2-0-0-0-0-1\n"
+        "linescore,,,,,,TTT,,,,,,,0-0-3\n")
+
+
+    def _file(self, suffix, text):
+        with tempfile.NamedTemporaryFile("w", suffix=suffix,
+                delete=False) as file:
+            file.write(text)
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+
+    def test_import_csv(self):
+        at_bats = PlayerHittingSeasonStats.objects.get(
+            player__player__first_name="Player",
+            player__player__last_name="One").at_bats
+        out = StringIO()
+        call_command("import_boxscores", self._file(".csv", self.CSV),
+            league="TL", stdout=out)
+        self.assertIn("Imported 1 games, ", out.getvalue())
+
+        game = Game.objects.get(date=datetime.date(2020, 6, 1))
+        self.assertEqual((game.home_score, game.away_score), (4, 3))
+        home = TeamGameStats.objects.get(game=game, team=game.home_team)
+        self.assertTrue(home.win)
+        self.assertEqual(home.league.url, "TL")
+
+        hitting = PlayerHittingGameStats.objects.get(team_stats=home)
+        self.assertEqual((hitting.at_bats, hitting.hits), (4, 2))
+        self.assertEqual(hitting.game_date, game.date)
+        self.assertEqual(hitting.season, home.season)
+        pitching = PlayerPitchingGameStats.objects.get(_game=game)
+        self.assertEqual(pitching.outs_recorded, 20)
+        self.assertEqual(pitching.innings_pitched, 6)
+
+        linescore = TeamGameLineScore.objects.get(game=home)
+        self.assertEqual((linescore.fifth, linescore.extras), (2, "1"))
+        self.assertEqual(InningScore.objects.filter(
+            linescore__game__game=game).count(), 19)
+
+        self.assertEqual(PlayerHittingSeasonStats.objects.get(
+            player=hitting.player).at_bats, at_bats + 4)
+        self.assertEqual(TeamStanding.objects.get(team=home.team).win, 1)
+
+
+    def test_import_json_lines_in_chunks(self):
+        games = [{"date": f"2020-06-0{day}", "home": "TTO", "away": "TTT",
+            "home_score": 1, "away_score": 1,
+            "hitting": [{"team": "TTT", "player": "Player Two",
+                "walks": 1}]} for day in (1, 2, 3)]
+        path = self._file(".jsonl",
+            "\n".join(json.dumps(game) for game in games))
+        count = Game.objects.count()
+        call_command("import_boxscores", path, league="TL", chunk_size=2,
+            stdout=StringIO())
+        self.assertEqual(Game.objects.count(), count + 3)
+        self.assertEqual(PlayerHittingGameStats.objects.filter(
+            game__date__gte=datetime.date(2020, 6, 1), walks=1).count(), 3)
+
+
+    def test_unknown_player_imports_nothing(self):
+        count = Game.objects.count()
+        path = self._file(".csv", self.CSV.replace("Player One", "Nobody"))
+        with self.assertRaisesMessage(CommandError, "no player 'Nobody'"):
+            call_command("import_boxscores", path, league="TL",
+                stdout=StringIO())
+        self.assertEqual(Game.objects.count(), count)
+
+
+    def test_reimport_skips_existing_games(self):
+        path = self._file(".csv", self.CSV)
+        call_command("import_boxscores", path, league="TL", stdout=StringIO())
+        counts = (Game.objects.count(), PlayerHittingGameStats.objects.count())
+        out = StringIO()
+        call_command("import_boxscores", path, league="TL", stdout=out)
+        self.assertIn("Imported 0 games, ", out.getvalue())
+        self.assertIn("skipped 1 games", out.getvalue())
+        self.assertEqual(counts, (Game.objects.count(),
+            PlayerHittingGameStats.objects.count()))
+        home = TeamGameStats.objects.get(game__date=datetime.date(2020, 6, 1),
+            team__team__abbreviation="TTO")
+        self.assertEqual(TeamStanding.objects.get(team=home.team).win, 1)
+
+
+    def test_negative_value_reports_line(self):
+        count = Game.objects.count()
+        path = self._file(".csv", self.CSV.replace(
+            "TTO,Player One,4,", "TTO,Player One,-4,"))
+        with self.assertRaisesMessage(CommandError,
+                "Game at line 2: bad or missing value -4 is negative."):
+            call_command("import_boxscores", path, league="TL",
+                stdout=StringIO())
+        self.assertEqual(Game.objects.count(), count)
+
+
+class GenerateLeagueCommandTest(TestCase):
+    """
+    Tests stats/management/commands/generate_league.py
+    """
+    def _generate(self, league="GEN", **options):
+        options = {"teams": 4, "games": 6, "seasons": 2, "year": 2020,
+            **options}
+        call_command("generate_league", league=league, stdout=StringIO(),
+            **options)
+        return Game.objects.filter(season__season__league__url=league)
+
+
+    def _hitting(self, league):
+        return list(PlayerHittingGameStats.objects.filter(
+            league__url=league).order_by("game_date", "pk").values_list(
+                "game_date", "at_bats", "hits", "runs", "runs_batted_in",
+                "walks", "strikeouts"))
+
+
+    def test_generate_league(self):
+        games = self._generate()
+        stage = SeasonStage.objects.get(season__league__url="GEN",
+            featured=True)
+        self.assertEqual(stage.season.year, "2020")
+        self.assertEqual(games.count(), 24)
+        for team in TeamSeason.objects.filter(season=stage):
+            standing = TeamStanding.objects.get(team=team)
+            self.assertEqual(standing.win + standing.loss + standing.tie, 6)
+        self.assertTrue(PlayerHittingSeasonStats.objects.filter(
+            season=stage).exists())
+        self.assertTrue(PlayerPitchingSeasonStats.objects.filter(
+            season=stage).exists())
+
+
+    def test_games_are_consistent(self):
+        games = self._generate(seasons=1)
+        for team_stats in TeamGameStats.objects.filter(game__in=games):
+            hitting = team_stats.playerhittinggamestats_set.aggregate(
+                runs=Sum("runs"), rbi=Sum("runs_batted_in"))
+            pitching = team_stats.playerpitchinggamestats_set.aggregate(
+                outs=Sum("outs_recorded"), runs=Sum("runs_allowed"),
+                wins=Sum("win"), losses=Sum("loss"))
+            linescore = team_stats.teamgamelinescore_set.get()
+            self.assertEqual(hitting["runs"], team_stats.runs_for)
+            self.assertEqual(hitting["rbi"], hitting["runs"])
+            self.assertEqual(pitching["outs"], 27)
+            self.assertEqual(pitching["runs"], team_stats.runs_against)
+            self.assertEqual(pitching["wins"], int(team_stats.win))
+            self.assertEqual(pitching["losses"], int(team_stats.loss))
+            self.assertEqual(InningScore.objects.filter(
+                linescore=linescore).aggregate(runs=Sum("runs"))["runs"],
+                team_stats.runs_for)
+        for row in PlayerHittingGameStats.objects.filter(game__in=games):
+            self.assertEqual(row.hits, row.singles + row.doubles +
+                row.triples + row.homeruns)
+            self.assertLessEqual(row.hits, row.at_bats)
+        for row in PlayerPitchingGameStats.objects.filter(_game__in=games):
+            self.assertEqual(row.innings_pitched, row.outs_recorded // 3)
+            self.assertGreater(row.outs_recorded, 0)
+            self.assertLessEqual(row.homeruns_allowed, row.runs_allowed)
+            self.assertLessEqual(row.homeruns_allowed, row.hits_allowed)
+            self.assertLessEqual(row.runs_allowed, row.hits_allowed +
+                row.walks_allowed + row.hit_batters + row.homeruns_allowed)
+
+
+    def test_same_seed_same_league(self):
+        self._generate("GENA", seed=3)
+        self._generate("GENB", seed=3)
+        self._generate("GENC", seed=4)
+        self.assertEqual(self._hitting("GENA"), self._hitting("GENB"))
+        self.assertNotEqual(self._hitting("GENA"), self._hitting("GENC"))
+
+
+    def test_existing_league(self):
+        with self.assertRaisesMessage(CommandError, "TL already exists"):
+            self._generate("TL")
+
+
+class BenchCommandTest(TestCase):
+    """
+    Tests stats/management/commands/bench.py
+    """
+    def test_bench_json(self):
+        call_command("generate_league", league="GEN", teams=2, games=2,
+            stdout=StringIO())
+        out = StringIO()
+        call_command("bench", league="GEN", repeat=1, stdout=out)
+        results = json.loads(out.getvalue())
+        self.assertEqual(results["rows"]["Game"], 2)
+        self.assertIn("standings", results["views"])
+        for name, view in results["views"].items():
+            self.assertEqual(view["status"], 200, name)
+            self.assertGreater(view["cold"]["queries"][0], 0)
+            self.assertEqual(len(view["warm"]["queries"]), 1)
+        self.assertIn("get_stats:all_season_hitting", results["presets"])
+        self.assertIn("get_rollup_stats:league_standings",
+            results["presets"])
+
+
+    def test_queries_counted_after_query_log_full(self):
+        call_command("generate_league", league="GEN", teams=2, games=2,
+            stdout=StringIO())
+        with CaptureQueriesContext(connection), connection.cursor() as cursor:
+            for _ in range(connection.queries_limit + 1):
+                cursor.execute("SELECT 1")
+        out = StringIO()
+        call_command("bench", league="GEN", repeat=1, stdout=out)
+        results = json.loads(out.getvalue())
+        self.assertGreater(results["views"]["standings"]["cold"]["queries"][0],
+            0)
+        self.assertGreater(
+            results["presets"]["get_stats:all_season_hitting"]["queries"][0],
+            0)
+
+
+    @override_settings(CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "bench-tests"}})
+    def test_site_cache_left_alone(self):
+        call_command("generate_league", league="GEN", teams=2, games=2,
+            stdout=StringIO())
+        cache.set("kept", 1)
+        call_command("bench", league="GEN", repeat=2, stdout=StringIO())
+        self.assertEqual(cache.get("kept"), 1)
+
+
+    def test_unknown_league(self):
+        with self.assertRaisesMessage(CommandError, "No league NOPE"):
+            call_command("bench", league="NOPE", stdout=StringIO())
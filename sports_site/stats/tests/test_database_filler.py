@@ -0,0 +1,134 @@
+import datetime
+import numpy as np
+from django.test import TestCase
+from stats.database_filler import (MAX_PITCHERS, TOTAL_OUTS, inning_pitchers,
+    random_hitting_stats, random_linescore, random_pitching_decision,
+    random_pitching_innings, random_pitching_runs, random_pitching_stats,
+    random_runs_batted_in, random_schedule, side_totals)
+
+
+SIDES = 2000
+LINEUP = 9
+
+
+class DatabaseFillerTests(TestCase):
+    """
+    Tests the generators in stats/database_filler.py over a large batch of
+    sides, one team in one game each.
+    """
+    def setUp(self):
+        self.rng = np.random.default_rng(7)
+        self.hitting = random_hitting_stats(self.rng, SIDES * LINEUP)
+        self.hitting["runs_batted_in"] = random_runs_batted_in(self.rng,
+            self.hitting, LINEUP)
+        self.totals = side_totals(self.hitting, LINEUP)
+        self.opponents = np.arange(SIDES) ^ 1
+        self.opponent = {stat: column[self.opponents]
+            for stat, column in self.totals.items()}
+        self.linescores = random_linescore(self.rng, self.totals["runs"])
+        self.outs, self.used = random_pitching_innings(self.rng,
+            MAX_PITCHERS, SIDES)
+
+
+    def test_hitting_stats(self):
+        hitting = self.hitting
+        self.assertTrue((hitting["hits"] <= hitting["at_bats"]).all())
+        self.assertTrue((hitting["hits"] + hitting["strikeouts"]
+            <= hitting["at_bats"]).all())
+        self.assertTrue((hitting["plate_appearances"] == hitting["at_bats"] +
+            hitting["walks"] + hitting["hit_by_pitch"]).all())
+        self.assertTrue((hitting["runs"] <= hitting["hits"] +
+            hitting["walks"] + hitting["hit_by_pitch"]).all())
+
+
+    def test_runs_batted_in_match_runs(self):
+        self.assertTrue((self.totals["runs_batted_in"] ==
+            self.totals["runs"]).all())
+        self.assertTrue((self.hitting["runs_batted_in"] >=
+            self.hitting["homeruns"]).all())
+
+
+    def test_linescore_adds_up_to_runs(self):
+        self.assertEqual(self.linescores.shape, (SIDES, 9))
+        self.assertTrue((self.linescores.sum(axis=1) ==
+            self.totals["runs"]).all())
+
+
+    def test_pitching_innings(self):
+        self.assertTrue((self.outs.sum(axis=1) == TOTAL_OUTS).all())
+        self.assertTrue(((self.outs > 0).sum(axis=1) == self.used).all())
+        starters = self.outs[self.used > 1, 0]
+        self.assertTrue(((starters >= 15) & (starters <= 21)).all())
+        pitchers = inning_pitchers(self.outs)
+        self.assertTrue((pitchers[:, 0] == 0).all())
+        self.assertTrue((np.diff(pitchers, axis=1) >= 0).all())
+
+
+    def test_pitching_charged_with_opposing_totals(self):
+        runs = random_pitching_runs(self.outs, self.used,
+            self.linescores[self.opponents], self.opponent)
+        stats = random_pitching_stats(self.outs, self.used, self.opponent,
+            runs)
+        for hitting, pitching in [("hits", "hits_allowed"),
+                ("walks", "walks_allowed"), ("hit_by_pitch", "hit_batters"),
+                ("strikeouts", "strikeouts")]:
+            self.assertTrue((stats[pitching].sum(axis=1) ==
+                self.opponent[hitting]).all())
+            self.assertTrue((stats[pitching] >= 0).all())
+        self.assertTrue((stats["hits_allowed"][self.outs == 0] == 0).all())
+        self.assertTrue((runs["runs_allowed"].sum(axis=1) ==
+            self.opponent["runs"]).all())
+        self.assertTrue((runs["homeruns_allowed"].sum(axis=1) ==
+            self.opponent["homeruns"]).all())
+        self.assertTrue((runs["homeruns_allowed"] >= 0).all())
+        self.assertTrue((runs["homeruns_allowed"] <=
+            runs["runs_allowed"]).all())
+        self.assertTrue((runs["homeruns_allowed"] <=
+            stats["hits_allowed"]).all())
+        self.assertTrue((runs["runs_allowed"] <= stats["hits_allowed"] +
+            stats["walks_allowed"] + stats["hit_batters"]).all())
+
+
+    def test_homeruns_allowed_capped_at_runs_allowed(self):
+        outs = np.array([[15, 9, 3]])
+        linescore = np.array([[1, 2, 0, 0, 0, 1, 0, 0, 0]])
+        runs = random_pitching_runs(outs, np.array([3]), linescore,
+            {"runs": np.array([4]), "homeruns": np.array([2])})
+        self.assertEqual(runs["runs_allowed"].tolist(), [[3, 1, 0]])
+        self.assertEqual(runs["homeruns_allowed"].tolist(), [[1, 1, 0]])
+
+
+    def test_pitching_decision(self):
+        decision = random_pitching_decision(self.outs, self.used,
+            self.linescores, self.linescores[self.opponents])
+        margin = self.totals["runs"] - self.opponent["runs"]
+        self.assertTrue((decision["win"].sum(axis=1) == (margin > 0)).all())
+        self.assertTrue((decision["loss"].sum(axis=1) == (margin < 0)).all())
+        self.assertFalse((decision["win"] & decision["save_converted"]).any())
+        self.assertFalse((decision["save_op"][margin <= 0]).any())
+
+
+    def test_pitching_decision_lead_for_good(self):
+        outs = np.array([[18, 9, 0], [27, 0, 0]])
+        used = np.array([2, 1])
+        home = np.array([[0, 0, 0, 0, 0, 0, 0, 2, 0]])
+        away = np.array([[1, 0, 0, 0, 0, 0, 0, 0, 0]])
+        linescores = np.concatenate([home, away])
+        decision = random_pitching_decision(outs, used, linescores,
+            linescores[::-1])
+        #Home took the lead for good in the 8th, with its reliever in.
+        self.assertEqual(decision["win"].tolist(), [[0, 1, 0], [0, 0, 0]])
+        self.assertEqual(decision["loss"].tolist(), [[0, 0, 0], [1, 0, 0]])
+        self.assertEqual(decision["save_op"].sum(), 0)
+
+
+    def test_schedule(self):
+        dates, games = random_schedule(self.rng, 5, 8,
+            datetime.date(2021, 4, 1))
+        played = [team for day in games for game in day for team in game]
+        self.assertEqual(len(dates), len(games))
+        for team in range(5):
+            self.assertIn(played.count(team), (7, 8))
+        for day in games:
+            teams = [team for game in day for team in game]
+            self.assertEqual(len(teams), len(set(teams)))
@@ -0,0 +1,63 @@
+import random
+from django.test import TestCase
+from stats.formatters import (format_innings, format_outs,
+    format_pitching_ratio, format_ratio)
+from stats.management.commands.bench_formatters import (
+    legacy_convert_to_str, legacy_convert_to_str_ip,
+    legacy_convert_to_str_pitching)
+
+
+#Exact and near ties, values past the lookup tables, negatives.
+EDGE_VALUES = [None, 0, 0.0, -0.0, -0.0001, 1e-300, 1.0, 0.0005, 0.0015,
+    0.0025, 0.0035, 0.005, 0.015, 0.025, 0.035, 0.125, 0.9995, 0.99949,
+    9.9995, 9.99949, 10.0, 12.5, 99.995, 99.994999, 100.0, 123.456, -0.5,
+    -3.25, 1/3, 2/3, 5 + 1/3, 5 + 2/3, 999 + 2/3, 1000 + 1/3]
+
+
+class FormattersTests(TestCase):
+    """
+    Tests stats/formatters.py gives the same output as the string
+    building in stat_calc.py it replaced.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(14)
+        cls.values = (EDGE_VALUES +
+            [i / 1000 for i in range(11000)] +
+            [i / 2000 for i in range(2000)] +
+            [i / 200 for i in range(2000)] +
+            [i / 3 for i in range(3100)] +
+            [rng.randint(0, 800) / rng.randint(1, 900) for _ in range(5000)] +
+            [rng.random() * rng.choice((1, 10, 100)) for _ in range(5000)])
+
+
+    def assertMatches(self, formatter, legacy):
+        for value in self.values:
+            self.assertEqual(legacy(value), formatter(value), value)
+
+
+    def test_format_ratio(self):
+        self.assertMatches(format_ratio, legacy_convert_to_str)
+
+
+    def test_format_pitching_ratio(self):
+        self.assertMatches(format_pitching_ratio,
+            legacy_convert_to_str_pitching)
+
+
+    def test_format_innings(self):
+        self.assertMatches(format_innings, legacy_convert_to_str_ip)
+
+
+    def test_examples(self):
+        self.assertEqual(format_ratio(.3), ".300")
+        self.assertEqual(format_ratio(1.5), "1.500")
+        self.assertEqual(format_pitching_ratio(0), "0.00")
+        self.assertEqual(format_pitching_ratio(3.5), "3.50")
+        self.assertEqual(format_innings(5 + 1/3), "5.1")
+        self.assertEqual(format_innings(None), ".000")
+
+
+    def test_format_outs(self):
+        for outs in [0, 1, 2, 3, 20, 27, 2999, 3000, 3001]:
+            self.assertEqual(format_outs(outs), format_innings(outs / 3))
@@ -1,6 +1,7 @@
 from django.test import TestCase
 from league.models import Game, PlayerSeason, SeasonStage, TeamSeason
-from stats.models import TeamGameStats, TeamGameLineScore
+from stats.models import (PlayerPitchingGameStats, TeamGameStats,
+    TeamGameLineScore)
 from stats.forms import (PlayerStatsCreateForm, PlayerPitchingStatsCreateForm,
     LinescoreEditForm, PlayerHittingGameStatsForm, PlayerPitchingGameStatsForm)
 
@@ -155,6 +156,13 @@ class LineScoreEditFormTest(TestCase):
         self.assertTrue(form.is_valid())
 
 
+    def test_form_rejects_bad_extras(self):
+        form_data = {"first": 5, "extras": "1,0"}
+
+        form = LinescoreEditForm(data=form_data, instance=self.tgls)
+        self.assertFalse(form.is_valid())
+
+
 class PlayerHittingGameStatsFormTest(TestCase):
     @classmethod
     def setUpTestData(cls) -> None:
@@ -348,4 +356,20 @@ class PlayerPitchingGameStatsFormTest(TestCase):
         self.assertTrue(form.is_valid())
 
 
-        
\ No newline at end of file
+        
+
+    def test_process_sets_outs_recorded(self):
+        stats = PlayerPitchingGameStats.objects.create(team_stats=self.tgs,
+            player=PlayerSeason.objects.get(id=1), outs_recorded=4)
+        form = PlayerPitchingGameStatsForm(instance=stats,
+            team_season=self.ts, game_stats=self.tgs)
+        self.assertEqual(form.fields["outs"].initial, 1)
+
+        form = PlayerPitchingGameStatsForm(
+            data={"player": 1, "innings_pitched": 6, "outs": 2},
+            instance=stats, team_season=self.ts, game_stats=self.tgs)
+        self.assertTrue(form.is_valid(), form.errors)
+        stats = form.process()
+        stats.refresh_from_db()
+        self.assertEqual(stats.outs_recorded, 20)
+        self.assertEqual(stats.innings_pitched, 6)
@@ -0,0 +1,390 @@
+from core.cache import get_version
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.db.models import Sum
+from league.models import Game, League, PlayerSeason, SeasonStage, TeamSeason
+from datetime import date, datetime
+from stats.get_stats import (HittingSplits, get_extra_innings,
+    get_extra_stat_totals, get_league_leaders, get_player_page_stats,
+    get_player_splits, get_runs_by_inning, get_stats, get_stats_aggregate,
+    get_stats_info, load_boxscore)
+from stats.stat_calc import _convert_to_str
+from stats.models import (LEADERS_CACHE_VERSION, PlayerHittingGameStats,
+    PlayerHittingSeasonStats, TeamGameLineScore, TeamGameStats)
+
+
+class GetExtraStatTotalsTests(TestCase):
+    """
+    Tests get_extra_stat_totals from stats/get_stats.py
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.stage = SeasonStage.objects.get(id=3)
+        cls.game1 = Game.objects.get(id=1)
+        cls.game2 = Game.objects.get(id=2)
+        cls.player = PlayerSeason.objects.get(id=1)
+        cls.tgs1 = TeamGameStats.objects.get(game=cls.game1,
+            team=cls.game1.home_team)
+        cls.tgs2 = TeamGameStats.objects.create(game=cls.game2,
+            team=cls.game2.home_team)
+
+        PlayerHittingGameStats.objects.filter(team_stats=cls.tgs1,
+            player=cls.player).update(doubles=1, runs_batted_in=2)
+        cls.later = PlayerHittingGameStats.objects.create(
+            team_stats=cls.tgs2, player=cls.player, doubles=2, homeruns=1,
+            runs_batted_in=3, stolen_bases=1)
+
+
+    def test_totals_keyed_by_player(self):
+        qs = self.tgs2.playerhittinggamestats_set.all()
+        totals = get_extra_stat_totals(qs, self.game2)
+        player_totals = totals[self.player.player_id]
+        self.assertEqual(player_totals["doubles"], 3)
+        self.assertEqual(player_totals["homeruns"], 1)
+        self.assertEqual(player_totals["runs_batted_in"], 5)
+
+
+    def test_totals_stop_at_game_date(self):
+        qs = self.tgs1.playerhittinggamestats_set.all()
+        totals = get_extra_stat_totals(qs, self.game1)
+        self.assertEqual(totals[self.player.player_id]["doubles"], 1)
+
+
+    def test_totals_single_query(self):
+        qs = self.tgs2.playerhittinggamestats_set.all()
+        with self.assertNumQueries(1):
+            get_extra_stat_totals(qs, self.game2)
+
+
+    def test_get_stats_info_uses_totals(self):
+        qs = self.tgs2.playerhittinggamestats_set.all()
+        with self.assertNumQueries(2):
+            info = get_stats_info(qs, self.game2)
+        doubles = info[0]
+        self.assertEqual(doubles[1][1:], (2, 3))
+
+
+
+class LoadBoxscoreTests(TestCase):
+    """
+    Tests load_boxscore from stats/get_stats.py
+    """
+    def test_loads_both_teams(self):
+        game = Game.objects.get(id=1)
+        with self.assertNumQueries(7):
+            boxscore = load_boxscore(game.pk)
+            home = boxscore["home"]
+            names = [str(stats.player.player) for stats in home["hitting"]]
+            str(home["linescore"].game.team.team)
+        self.assertEqual(boxscore["game"], game)
+        self.assertEqual(home["game_stats"].team, game.home_team)
+        self.assertEqual(boxscore["away"]["game_stats"].team, game.away_team)
+        self.assertEqual(names, ["One, Player"])
+
+
+
+class GetExtraInningsTests(TestCase):
+    """
+    Tests get_extra_innings from stats/get_stats.py
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.tgs = TeamGameStats.objects.get(game=1, team__team__name="Team One")
+        cls.linescore = TeamGameLineScore.objects.create(
+            game=cls.tgs, first=2, ninth=1, extras="0-3")
+
+
+    def test_row_without_queries(self):
+        linescore = TeamGameLineScore.objects.select_related(
+            "game__team__team").prefetch_related("inningscore_set").get(
+                pk=self.linescore.pk)
+        with self.assertNumQueries(0):
+            row = get_extra_innings(linescore)
+        self.assertEqual(row["first"], 2)
+        self.assertEqual(row["ninth"], 1)
+        self.assertEqual(row["10"], 0)
+        self.assertEqual(row["11"], 3)
+        self.assertEqual(row["R"], 6)
+        self.assertEqual(row["game"], "TTO")
+        self.assertEqual(len(row), 13)
+
+
+    def test_no_extras(self):
+        linescore = TeamGameLineScore.objects.get(game=self.tgs, extras="None")
+        row = get_extra_innings(linescore)
+        self.assertNotIn("10", row)
+        self.assertEqual(row["R"], 0)
+
+
+    def test_runs_by_inning(self):
+        away = TeamGameStats.objects.get(game=1, team__team__name="Team Two")
+        TeamGameLineScore.objects.create(game=away, first=1, extras="1-0")
+        league = League.objects.get(id=1)
+        stage = SeasonStage.objects.get(id=3)
+        with self.assertNumQueries(1):
+            runs = get_runs_by_inning(league, stage)
+        runs = {row["inning"]: row["runs"] for row in runs}
+        self.assertEqual(runs[1], 3)
+        self.assertEqual(runs[9], 1)
+        self.assertEqual(runs[10], 1)
+        self.assertEqual(runs[11], 3)
+
+
+
+class GetLeagueLeadersTests(TestCase):
+    """
+    Tests get_league_leaders from stats/get_stats.py
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.league = League.objects.get(id=1)
+        cls.stage = SeasonStage.objects.get(id=3)
+        cls.player = PlayerSeason.objects.get(id=1)
+        cls.player2 = PlayerSeason.objects.get(id=2)
+        cls.stats = PlayerHittingGameStats.objects.get(player=cls.player)
+        cls.stats.at_bats, cls.stats.singles, cls.stats.homeruns = 4, 1, 1
+        cls.stats.runs_batted_in = 3
+        cls.stats.save()
+        cls.stats2 = PlayerHittingGameStats.objects.get(player=cls.player2)
+        cls.stats2.at_bats, cls.stats2.singles, cls.stats2.stolen_bases = 1, 1, 2
+        cls.stats2.save()
+
+
+    def test_leaders_single_query(self):
+        with self.assertNumQueries(1):
+            leaders = get_league_leaders(self.league, self.stage)
+        self.assertEqual(leaders["homeruns"][0]["player_id"],
+            self.player.player_id)
+        self.assertEqual(leaders["stolen_bases"][0]["player_id"],
+            self.player2.player_id)
+        self.assertEqual(leaders["runs_batted_in"][0]["runs_batted_in"], 3)
+
+
+    def test_average_requires_qualifying_at_bats(self):
+        leaders = get_league_leaders(self.league, self.stage, top=2)
+        self.assertEqual([row["player_id"] for row in leaders["average"]],
+            [self.player.player_id])
+        self.assertEqual(leaders["average"][0]["average"], ".500")
+
+
+    def test_no_stage(self):
+        leaders = get_league_leaders(self.league, None)
+        self.assertFalse(any(leaders.values()))
+
+
+    @override_settings(CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "leaders-tests"}})
+    def test_cached_until_stats_change(self):
+        cache.clear()
+        get_league_leaders(self.league, self.stage)
+        with self.assertNumQueries(0):
+            get_league_leaders(self.league, self.stage)
+
+        self.stats2.homeruns = 3
+        with self.captureOnCommitCallbacks(execute=True):
+            self.stats2.save()
+        leaders = get_league_leaders(self.league, self.stage)
+        self.assertEqual(leaders["homeruns"][0]["player_id"],
+            self.player2.player_id)
+
+
+    @override_settings(CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "leaders-tests"}})
+    def test_version_bumped_on_commit(self):
+        cache.clear()
+        name = LEADERS_CACHE_VERSION.format(self.stage.pk)
+        version = get_version(name)
+        with self.captureOnCommitCallbacks(execute=True):
+            PlayerHittingSeasonStats.refresh(self.player2.pk, self.stage.pk)
+            self.assertEqual(get_version(name), version)
+        self.assertNotEqual(get_version(name), version)
+
+
+    @override_settings(CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "leaders-tests"}})
+    def test_cached_until_names_change(self):
+        cache.clear()
+        get_league_leaders(self.league, self.stage)
+        player = self.player.player
+        player.last_name = "Renamed"
+        team = self.player.team.team.team
+        team.name = "Renamed Team"
+        with self.captureOnCommitCallbacks(execute=True):
+            player.save()
+            team.save()
+        leaders = get_league_leaders(self.league, self.stage)
+        row = next(row for row in leaders["homeruns"]
+            if row["player_id"] == player.pk)
+        self.assertEqual(row["last"], "Renamed")
+        self.assertEqual(row["team"], "Renamed Team")
+
+
+
+class GetPlayerPageStatsTests(TestCase):
+    """
+    Tests get_player_page_stats from stats/get_stats.py against the
+    aggregates the player page used to run.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.player_season = PlayerSeason.objects.get(id=1)
+        cls.player = cls.player_season.player
+        cls.stage = SeasonStage.objects.get(id=3)
+        team_season = cls.player_season.team.team
+        for day, (at_bats, singles, walks) in enumerate(
+                [(4, 2, 0), (3, 0, 1), (0, 0, 2), (5, 1, 0), (4, 3, 1),
+                 (2, 1, 0), (4, 0, 0), (3, 2, 1)], start=1):
+            game = Game.objects.create(season=cls.stage,
+                home_team=team_season, away_team=team_season,
+                date=datetime(2020, 6, day))
+            tgs = TeamGameStats.objects.create(game=game, team=team_season)
+            PlayerHittingGameStats.objects.create(team_stats=tgs,
+                player=cls.player_season, at_bats=at_bats, singles=singles,
+                walks=walks, runs=day % 2, plate_appearances=at_bats + walks)
+        cls.qs = PlayerHittingGameStats.objects.filter(player__player=cls.player)
+        cls.splits_qs = cls.qs.filter(
+            season__featured=True).order_by("-team_stats__game__date")
+
+
+    def assertStatsEqual(self, expected, actual, keys):
+        for key in keys:
+            self.assertEqual(expected[key], actual[key], key)
+        for ratio in ("average", "on_base_percentage"):
+            self.assertEqual(_convert_to_str(expected[ratio]),
+                _convert_to_str(actual[ratio]), ratio)
+
+
+    def test_single_query(self):
+        with self.assertNumQueries(1):
+            get_player_page_stats(self.player)
+
+
+    def test_matches_aggregates(self):
+        stats = get_player_page_stats(self.player)
+        filters = {"season__stage": SeasonStage.REGULAR}
+        sums = ["at_bats", "hits", "walks", "runs", "plate_appearances"]
+
+        by_year = list(get_stats(self.qs, "player_career_hitting_stats",
+            filters=filters))
+        self.assertEqual(len(by_year), len(stats["career_by_year"]))
+        for expected, actual in zip(by_year, stats["career_by_year"]):
+            self.assertStatsEqual(expected, actual, sums + ["year"])
+
+        career = get_stats_aggregate(self.qs,
+            "player_career_hitting_stats_totals", filters=filters)
+        self.assertStatsEqual(career, stats["career"], sums + ["year"])
+
+        recent = list(get_stats(self.splits_qs[:5], "last_x_hitting_date"))
+        self.assertEqual(len(recent), len(stats["recent_games"]))
+        for expected, actual in zip(recent, stats["recent_games"]):
+            self.assertStatsEqual(expected, actual, sums + ["date"])
+
+        for games, actual in zip([3, 5, 7], stats["last_x"]):
+            expected = get_stats_aggregate(self.splits_qs[:games],
+                "last_x_hitting_stats_totals",
+                extra_keys={"duration": f"Last {games} Games"})
+            self.assertStatsEqual(expected, actual, sums + ["duration"])
+
+
+class HittingSplitsTests(TestCase):
+    """
+    Tests HittingSplits and get_player_splits from stats/get_stats.py
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.player_season = PlayerSeason.objects.get(id=1)
+        cls.player = cls.player_season.player
+        cls.stage = SeasonStage.objects.get(id=3)
+        team_season = cls.player_season.team.team
+        other = TeamSeason.objects.get(id=2)
+        for day, game_date in enumerate([datetime(2020, 6, 1),
+                datetime(2020, 6, 2), datetime(2020, 6, 5),
+                datetime(2020, 6, 9), datetime(2020, 7, 1),
+                datetime(2020, 7, 3)], start=1):
+            home = day % 2 == 1
+            game = Game.objects.create(season=cls.stage,
+                home_team=team_season if home else other,
+                away_team=other if home else team_season, date=game_date)
+            tgs = TeamGameStats.objects.create(game=game, team=team_season)
+            PlayerHittingGameStats.objects.create(team_stats=tgs,
+                player=cls.player_season, at_bats=day + 1, singles=day % 3,
+                walks=day % 2, plate_appearances=day + 1 + day % 2)
+        cls.qs = PlayerHittingGameStats.objects.filter(
+            player__player=cls.player, season__featured=True)
+
+
+    def setUp(self):
+        self.splits = HittingSplits.for_player(self.player)
+
+
+    def assertTotalsEqual(self, queryset, split):
+        expected = queryset.aggregate(at_bats=Sum("at_bats"),
+            walks=Sum("walks"), plate_appearances=Sum("plate_appearances"))
+        for stat, value in expected.items():
+            self.assertEqual(value or 0, split[stat], stat)
+
+
+    def test_single_query(self):
+        with self.assertNumQueries(1):
+            HittingSplits.for_player(self.player)
+
+
+    def test_last(self):
+        ordered = self.qs.order_by("-team_stats__game__date", "-pk")
+        split = self.splits.last(4)
+        self.assertEqual(split["duration"], "Last 4 Games")
+        self.assertTotalsEqual(self.qs.filter(
+            pk__in=[row.pk for row in ordered[:4]]), split)
+        self.assertTotalsEqual(self.qs, self.splits.last(100))
+
+
+    def test_between(self):
+        split = self.splits.between(date(2020, 6, 2), date(2020, 6, 9))
+        self.assertEqual(split["at_bats"], 3 + 4 + 5)
+        self.assertEqual(split["duration"], "2020-06-02 - 2020-06-09")
+        self.assertEqual(
+            self.splits.between(date(2020, 6, 3), date(2020, 6, 4))["at_bats"],
+            0)
+        self.assertEqual(
+            self.splits.between(date(2020, 6, 9), date(2020, 6, 1))["at_bats"],
+            0)
+
+
+    def test_home_away(self):
+        home = self.splits.home()
+        away = self.splits.away()
+        self.assertEqual((home["duration"], away["duration"]), ("Home", "Away"))
+        self.assertTotalsEqual(self.qs.filter(
+            team_stats__game__home_team=self.player_season.team.team), home)
+        self.assertTotalsEqual(self.qs.exclude(
+            team_stats__game__home_team=self.player_season.team.team), away)
+
+
+    def test_month(self):
+        split = self.splits.month(2020, 7)
+        self.assertEqual(split["duration"], "July 2020")
+        self.assertEqual(split["at_bats"], 6 + 7)
+        self.assertEqual(self.splits.month(2019, 7)["at_bats"], 0)
+
+
+    def test_split_names(self):
+        self.assertEqual(self.splits.split("last-2"), self.splits.last(2))
+        self.assertEqual(self.splits.split("home"), self.splits.home())
+        self.assertEqual(self.splits.split("away"), self.splits.away())
+        self.assertEqual(self.splits.split("2020-06"),
+            self.splits.month(2020, 6))
+        self.assertEqual(self.splits.split("2020-06-01..2020-06-05"),
+            self.splits.between(date(2020, 6, 1), date(2020, 6, 5)))
+        for name in ["", "last-0", "last-x", "2020-13", "bogus",
+                "2020-06-01..", "2020-06-01..2020-06-02..2020-06-03"]:
+            self.assertIsNone(self.splits.split(name), name)
+
+
+    def test_get_player_splits(self):
+        with self.assertNumQueries(1):
+            splits = get_player_splits(self.player, ["last-3", "bogus", "home"])
+        self.assertEqual([split["duration"] for split in splits],
+            ["Last 3 Games", "Home"])
@@ -1,8 +1,12 @@
 from asyncio import staggered
+import datetime
+from unittest import skipUnless
+from django.db import connection
 from django.test import TestCase
 from league.models import Game, PlayerSeason, SeasonStage, TeamSeason
 from stats.models import (TeamGameStats, TeamGameLineScore,
-    PlayerHittingGameStats, PlayerPitchingGameStats)
+    PlayerHittingGameStats, PlayerHittingSeasonStats, PlayerPitchingGameStats,
+    PlayerPitchingSeasonStats, TeamPitchingSeasonStats, TeamStanding)
 
 
 class TeamGameStatsTestCase(TestCase):
@@ -32,6 +36,14 @@ class TeamGameStatsTestCase(TestCase):
         self.assertEqual(self.tgs.season, self.stage)
         self.assertEqual(self.tgs.team, self.team_season)
         self.assertEqual(self.tgs.game, self.game)
+        self.assertEqual(self.tgs.league, self.team_season.team.league)
+
+
+    @skipUnless(connection.vendor == "sqlite", "EXPLAIN output is SQLite's")
+    def test_league_season_filter_uses_index(self):
+        plan = TeamGameStats.objects.filter(
+            league=self.tgs.league, season=self.stage).explain()
+        self.assertIn("team_game_league_idx", plan)
 
     
     def test_labels(self):
@@ -130,6 +142,25 @@ class TeamGameLineScoreTestCase(TestCase):
             f"{self.tgs.team.team} Linescore for {self.tgs}")
 
 
+    def test_inning_scores_created(self):
+        innings = list(self.tgls.inningscore_set.values_list("inning", "runs"))
+        self.assertEqual(innings, [(i, 0) for i in range(1, 10)])
+
+
+    def test_inning_scores_follow_edits(self):
+        self.tgls.third = 2
+        self.tgls.extras = "0-4"
+        self.tgls.save()
+        innings = dict(self.tgls.inningscore_set.values_list("inning", "runs"))
+        self.assertEqual(innings[3], 2)
+        self.assertEqual(innings[10], 0)
+        self.assertEqual(innings[11], 4)
+
+        self.tgls.extras = "None"
+        self.tgls.save()
+        self.assertEqual(self.tgls.inningscore_set.count(), 9)
+
+
 class PlayerHittingGameStatsTestCase(TestCase):
     @classmethod
     def setUpTestData(cls) -> None:
@@ -183,6 +214,30 @@ class PlayerHittingGameStatsTestCase(TestCase):
         self.assertEqual(self.phgs.team_stats, self.tgs)
         self.assertEqual(self.phgs.season, self.stage)
         self.assertEqual(self.phgs.player, self.player)
+        self.assertEqual(self.phgs.league, self.tgs.league)
+        self.assertEqual(self.phgs.game, self.game)
+        self.assertEqual(self.phgs.game_date, self.game.date)
+
+
+    def test_game_date_follows_reschedule(self):
+        self.game.date = self.game.date + datetime.timedelta(days=1)
+        self.game.save()
+        self.phgs.refresh_from_db()
+        self.assertEqual(self.phgs.game_date, self.game.date)
+
+
+    @skipUnless(connection.vendor == "sqlite", "EXPLAIN output is SQLite's")
+    def test_league_season_filter_uses_index(self):
+        plan = PlayerHittingGameStats.objects.filter(
+            league=self.tgs.league, season=self.stage).explain()
+        self.assertIn("hitting_game_league_idx", plan)
+
+
+    @skipUnless(connection.vendor == "sqlite", "EXPLAIN output is SQLite's")
+    def test_player_date_range_uses_index(self):
+        plan = PlayerHittingGameStats.objects.filter(player=self.player,
+            game_date__lte=self.game.date).order_by("game_date").explain()
+        self.assertIn("hitting_game_date_idx", plan)
 
     def test_labels(self):
         phgs_stat_labels = {
@@ -268,6 +323,23 @@ class PlayerPitchingGameStatsTestCase(TestCase):
         self.assertEqual(self.ppgs.team_stats, self.tgs)
         self.assertEqual(self.ppgs.season, self.stage)
         self.assertEqual(self.ppgs.player, self.player)
+        self.assertEqual(self.ppgs.league, self.tgs.league)
+        self.assertEqual(self.ppgs._game, self.game)
+        self.assertEqual(self.ppgs.game_date, self.game.date)
+
+
+    def test_game_date_follows_reschedule(self):
+        self.game.date = self.game.date + datetime.timedelta(days=1)
+        self.game.save()
+        self.ppgs.refresh_from_db()
+        self.assertEqual(self.ppgs.game_date, self.game.date)
+
+
+    @skipUnless(connection.vendor == "sqlite", "EXPLAIN output is SQLite's")
+    def test_league_season_filter_uses_index(self):
+        plan = PlayerPitchingGameStats.objects.filter(
+            league=self.tgs.league, season=self.stage).explain()
+        self.assertIn("pitching_game_league_idx", plan)
 
     def test_labels(self):
         ppgs_stat_labels = {
@@ -302,3 +374,311 @@ class PlayerPitchingGameStatsTestCase(TestCase):
             str(self.ppgs),
             f"Player: {self.player.player} Game: {self.tgs}"
         )
+
+
+
+class PlayerHittingSeasonStatsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.stage = SeasonStage.objects.get(id=3)
+        cls.team_season = TeamSeason.objects.get(id=1)
+        cls.game = Game.objects.get(id=1)
+        cls.game2 = Game.objects.get(id=2)
+        cls.player = PlayerSeason.objects.get(id=1)
+        cls.player2 = PlayerSeason.objects.get(id=2)
+
+        cls.tgs = TeamGameStats.objects.create(
+            season=cls.stage,
+            team=cls.team_season,
+            game=cls.game2,
+        )
+        return super().setUpTestData()
+
+
+    def _create_stats(self, player=None, **stats):
+        return PlayerHittingGameStats.objects.create(
+            team_stats=self.tgs,
+            season=self.stage,
+            player=player or self.player,
+            **stats)
+
+
+    def test_rollup_created_on_save(self):
+        self._create_stats(at_bats=4, singles=1, homeruns=1, walks=1,
+            runs_batted_in=2)
+        rollup = PlayerHittingSeasonStats.objects.get(
+            player=self.player, season=self.stage)
+
+        totals = PlayerHittingGameStats.objects.filter(
+            player=self.player, season=self.stage)
+        self.assertEqual(rollup.games, totals.count())
+        self.assertEqual(rollup.league, self.player.player.league)
+        self.assertEqual(rollup.hits, sum(s.hits for s in totals))
+        self.assertEqual(rollup.at_bats, sum(s.at_bats for s in totals))
+        self.assertEqual(rollup.homeruns, 1)
+        self.assertEqual(rollup.runs_batted_in, 2)
+        self.assertAlmostEqual(rollup.average, 2/4)
+        self.assertAlmostEqual(rollup.on_base_percentage, 3/5)
+        self.assertAlmostEqual(rollup.slugging_percentage, 5/4)
+        self.assertAlmostEqual(rollup.on_base_plus_slugging, 3/5 + 5/4)
+
+
+    def test_rollup_updated_on_edit(self):
+        stats = self._create_stats(at_bats=4, singles=1)
+        stats.singles = 3
+        stats.save()
+        rollup = PlayerHittingSeasonStats.objects.get(
+            player=self.player, season=self.stage)
+        self.assertEqual(rollup.hits, 3)
+        self.assertAlmostEqual(rollup.average, 3/4)
+
+
+    def test_rollup_moves_when_player_changes(self):
+        stats = self._create_stats(at_bats=4, doubles=2)
+        stats.player = self.player2
+        stats.save()
+        rollup = PlayerHittingSeasonStats.objects.get(
+            player=self.player2, season=self.stage)
+        self.assertEqual(rollup.doubles, 2)
+        self.assertEqual(
+            PlayerHittingSeasonStats.objects.get(
+                player=self.player, season=self.stage).doubles, 0)
+
+
+    def test_rollup_updated_on_delete(self):
+        stats = self._create_stats(at_bats=4, triples=1)
+        stats.delete()
+        rollup = PlayerHittingSeasonStats.objects.get(
+            player=self.player, season=self.stage)
+        self.assertEqual(rollup.triples, 0)
+
+
+    def test_rollup_removed_with_last_game(self):
+        PlayerHittingGameStats.objects.filter(player=self.player).delete()
+        self.assertFalse(PlayerHittingSeasonStats.objects.filter(
+            player=self.player, season=self.stage).exists())
+
+
+    def test_zero_at_bats_ratios_none(self):
+        rollup = PlayerHittingSeasonStats(player=self.player, season=self.stage)
+        rollup.calculate_ratios()
+        self.assertEqual(rollup.average, None)
+        self.assertEqual(rollup.on_base_percentage, None)
+        self.assertEqual(rollup.slugging_percentage, None)
+        self.assertEqual(rollup.on_base_plus_slugging, None)
+
+
+    def test_expected_name(self):
+        self._create_stats()
+        rollup = PlayerHittingSeasonStats.objects.get(
+            player=self.player, season=self.stage)
+        self.assertEqual(
+            str(rollup),
+            f"Player: {self.player.player} Season: {self.stage}")
+
+
+
+class PitchingSeasonStatsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.stage = SeasonStage.objects.get(id=3)
+        cls.team_season = TeamSeason.objects.get(id=1)
+        cls.game2 = Game.objects.get(id=2)
+        cls.player = PlayerSeason.objects.get(id=1)
+        cls.player2 = PlayerSeason.objects.get(id=2)
+
+        cls.tgs = TeamGameStats.objects.create(
+            season=cls.stage,
+            team=cls.team_season,
+            game=cls.game2,
+        )
+        return super().setUpTestData()
+
+
+    def _create_stats(self, player=None, **stats):
+        return PlayerPitchingGameStats.objects.create(
+            team_stats=self.tgs,
+            season=self.stage,
+            player=player or self.player,
+            **stats)
+
+
+    def test_player_rollup_created_on_save(self):
+        self._create_stats(outs_recorded=18, earned_runs=2,
+            hits_allowed=5, walks_allowed=1, win=1, game=1)
+        rollup = PlayerPitchingSeasonStats.objects.get(
+            player=self.player, season=self.stage)
+        self.assertEqual(rollup.league, self.player.player.league)
+        self.assertEqual(rollup.win, 1)
+        self.assertEqual(rollup.innings_pitched, 6)
+        self.assertAlmostEqual(rollup.era, 3.0)
+        self.assertAlmostEqual(rollup.whip, 1.0)
+
+
+    def test_team_rollup_created_on_save(self):
+        self._create_stats(outs_recorded=15, earned_runs=1, game_started=1,
+            game=1)
+        self._create_stats(player=self.player2, outs_recorded=12, earned_runs=2,
+            game=1)
+        rollup = TeamPitchingSeasonStats.objects.get(
+            team_season=self.team_season)
+        self.assertEqual(rollup.season, self.stage)
+        self.assertEqual(rollup.innings_pitched, 9)
+        self.assertEqual(rollup.earned_runs, 3)
+        self.assertEqual(rollup.game, rollup.game_started)
+        self.assertAlmostEqual(rollup.era, 3.0)
+
+
+    def test_rollups_updated_on_delete(self):
+        stats = self._create_stats(outs_recorded=9, earned_runs=3)
+        stats.delete()
+        player_rollup = PlayerPitchingSeasonStats.objects.get(
+            player=self.player, season=self.stage)
+        team_rollup = TeamPitchingSeasonStats.objects.get(
+            team_season=self.team_season)
+        self.assertEqual(player_rollup.earned_runs, 0)
+        self.assertEqual(team_rollup.earned_runs, 0)
+
+
+    def test_rollup_moves_when_player_changes(self):
+        stats = self._create_stats(outs_recorded=6, strikeouts=4)
+        stats.player = self.player2
+        stats.save()
+        self.assertEqual(PlayerPitchingSeasonStats.objects.get(
+            player=self.player2, season=self.stage).strikeouts, 4)
+        self.assertEqual(PlayerPitchingSeasonStats.objects.get(
+            player=self.player, season=self.stage).strikeouts, 0)
+
+
+    def test_innings_set_from_outs(self):
+        stats = self._create_stats(outs_recorded=20)
+        self.assertEqual(stats.innings_pitched, 6)
+        self.assertEqual(stats._innings, 20 / 3)
+
+
+    def test_rollup_sums_outs_exactly(self):
+        for _ in range(3):
+            self._create_stats(outs_recorded=1, earned_runs=1)
+        rollup = PlayerPitchingSeasonStats.objects.get(
+            player=self.player, season=self.stage)
+        self.assertEqual(rollup.outs_recorded, 3)
+        self.assertEqual(rollup.innings_pitched, 1.0)
+        self.assertEqual(rollup.era, 27.0)
+
+
+    def test_no_innings_ratios_none(self):
+        rollup = PlayerPitchingSeasonStats(player=self.player, season=self.stage)
+        rollup.calculate_ratios()
+        self.assertEqual(rollup.era, None)
+        self.assertEqual(rollup.whip, None)
+
+
+
+class TeamStandingTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.stage = SeasonStage.objects.get(id=3)
+        cls.team_season = TeamSeason.objects.get(id=1)
+        cls.team_season2 = TeamSeason.objects.get(id=2)
+        cls.game = Game.objects.get(id=2)
+        return super().setUpTestData()
+
+
+    def _standing(self, team_season=None):
+        return TeamStanding.objects.get(team=team_season or self.team_season)
+
+
+    def test_standing_updated_on_create(self):
+        before = self._standing()
+        TeamGameStats.objects.create(team=self.team_season, game=self.game,
+            runs_for=5, runs_against=2, win=True, loss=False, tie=False)
+        after = self._standing()
+        self.assertEqual(after.league, self.team_season.team.league)
+        self.assertEqual(after.season, self.stage)
+        self.assertEqual(after.win, before.win + 1)
+        self.assertEqual(after.runs_for, before.runs_for + 5)
+        self.assertEqual(after.differential, after.runs_for - after.runs_against)
+
+
+    def test_standing_updated_by_delta_on_edit(self):
+        tgs = TeamGameStats.objects.create(team=self.team_season,
+            game=self.game, runs_for=1, runs_against=3, win=False, loss=True)
+        before = self._standing()
+        tgs.runs_for, tgs.win, tgs.loss = 4, True, False
+        tgs.save()
+        after = self._standing()
+        self.assertEqual(after.win, before.win + 1)
+        self.assertEqual(after.loss, before.loss - 1)
+        self.assertEqual(after.runs_for, before.runs_for + 3)
+        self.assertEqual(after.runs_against, before.runs_against)
+
+
+    def test_standing_moves_when_team_changes(self):
+        tgs = TeamGameStats.objects.create(team=self.team_season,
+            game=self.game, runs_for=2, win=True)
+        before, before2 = self._standing(), self._standing(self.team_season2)
+        tgs.team = self.team_season2
+        tgs.save()
+        self.assertEqual(self._standing().win, before.win - 1)
+        self.assertEqual(self._standing(self.team_season2).win, before2.win + 1)
+
+
+    def test_standing_recomputed_when_missing(self):
+        tgs = TeamGameStats.objects.create(team=self.team_season,
+            game=self.game, runs_for=2, win=True)
+        TeamStanding.objects.filter(team=self.team_season).delete()
+        tgs.team = self.team_season2
+        tgs.save()
+        incremental = list(TeamStanding.objects.order_by("team").values(
+            "team", *TeamStanding.RESULT_FIELDS))
+        TeamStanding.rebuild()
+        self.assertEqual(incremental, list(TeamStanding.objects.order_by(
+            "team").values("team", *TeamStanding.RESULT_FIELDS)))
+
+
+    def test_standing_recomputed_instead_of_negative(self):
+        tgs = TeamGameStats.objects.create(team=self.team_season,
+            game=self.game, runs_for=2, win=True)
+        TeamStanding.objects.filter(team=self.team_season).update(win=0,
+            runs_for=0)
+        tgs.win, tgs.loss = False, True
+        tgs.save()
+        after = self._standing()
+        self.assertEqual(after.loss, TeamGameStats.objects.filter(
+            team=self.team_season, loss=True).count())
+        self.assertEqual(after.win, TeamGameStats.objects.filter(
+            team=self.team_season, win=True).count())
+
+
+    def test_standing_updated_on_delete(self):
+        before = self._standing()
+        tgs = TeamGameStats.objects.create(team=self.team_season,
+            game=self.game, runs_for=6, runs_against=1, win=True)
+        tgs.delete()
+        after = self._standing()
+        self.assertEqual(after.win, before.win)
+        self.assertEqual(after.runs_for, before.runs_for)
+
+
+    def test_rebuild_matches_incremental(self):
+        TeamGameStats.objects.create(team=self.team_season, game=self.game,
+            runs_for=3, runs_against=3, tie=True)
+        incremental = list(TeamStanding.objects.order_by("team").values())
+        TeamStanding.objects.update(win=0, loss=0, tie=0)
+        TeamStanding.rebuild()
+        rebuilt = list(TeamStanding.objects.order_by("team").values(
+            *[k for k in incremental[0] if k != "id"]))
+        self.assertEqual(
+            [{k: v for k, v in row.items() if k != "id"} for row in incremental],
+            rebuilt)
+
+
+    def test_no_games_pct_none(self):
+        standing = TeamStanding(team=self.team_season)
+        standing.calculate_ratios()
+        self.assertEqual(standing.pct, None)
+        self.assertEqual(standing.differential, 0)
+
+
+    def test_expected_name(self):
+        self.assertEqual(str(self._standing()), f"{self.team_season} Standing")
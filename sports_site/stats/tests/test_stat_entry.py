@@ -0,0 +1,114 @@
+from django.db.models import Sum
+from django.test import TestCase
+from league.models import (Game, League, Player, PlayerSeason, Roster,
+    SeasonStage, TeamSeason)
+from stats.models import (PlayerHittingGameStats, PlayerHittingSeasonStats,
+    PlayerPitchingGameStats, PlayerPitchingSeasonStats, TeamGameStats,
+    TeamPitchingSeasonStats)
+from stats.stat_entry import (create_hitting_stats, create_pitching_stats,
+    save_hitting_stats, save_pitching_stats)
+
+
+class StatEntryTest(TestCase):
+    """
+    Tests stats/stat_entry.py
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.league = League.objects.get(id=1)
+        cls.stage = SeasonStage.objects.get(id=3)
+        cls.team_season = TeamSeason.objects.get(id=1)
+        cls.game = Game.objects.get(id=2)
+        roster = Roster.objects.get(team=cls.team_season)
+        for i in range(8):
+            player = Player.objects.create(league=cls.league,
+                first_name="Lineup", last_name=f"Player {i}")
+            PlayerSeason.objects.create(player=player, team=roster,
+                season=cls.stage, number=i, position="LF")
+        cls.players = list(roster.playerseason_set.all())
+
+        cls.tgs = TeamGameStats.objects.create(
+            season=cls.stage,
+            team=cls.team_season,
+            game=cls.game,
+        )
+
+
+    def setUp(self):
+        self.tgs = TeamGameStats.objects.select_related("game").get(
+            pk=self.tgs.pk)
+
+
+    def test_create_hitting_stats(self):
+        created, existing = create_hitting_stats(self.tgs,
+            self.players + [None, self.players[0]])
+        self.assertEqual(len(created), len(self.players))
+        self.assertEqual(existing, [])
+        for row in PlayerHittingGameStats.objects.filter(team_stats=self.tgs):
+            self.assertEqual(row.season, self.stage)
+            self.assertEqual(row.league, self.league)
+            self.assertEqual(row.game, self.game)
+            self.assertEqual(row.game_date, self.game.date)
+        self.assertEqual(PlayerHittingSeasonStats.objects.filter(
+            player__in=self.players, season=self.stage).count(),
+            len(self.players))
+
+        created, existing = create_hitting_stats(self.tgs, self.players[:2])
+        self.assertEqual(created, [])
+        self.assertEqual([row.player for row in existing], self.players[:2])
+
+
+    def test_create_queries_do_not_grow_with_lineup(self):
+        with self.assertNumQueries(7):
+            create_hitting_stats(self.tgs, self.players[2:4])
+        with self.assertNumQueries(7):
+            create_hitting_stats(self.tgs, self.players[4:])
+
+
+    def test_save_hitting_stats(self):
+        created, _ = create_hitting_stats(self.tgs, self.players)
+        rows = list(PlayerHittingGameStats.objects.filter(team_stats=self.tgs))
+        for row in rows:
+            row.at_bats = 4
+            row.singles = 1
+            row.doubles = 1
+
+        with self.assertNumQueries(7):
+            save_hitting_stats(self.tgs, rows)
+
+        for row in PlayerHittingGameStats.objects.filter(team_stats=self.tgs):
+            self.assertEqual(row.hits, 2)
+        rollup = PlayerHittingSeasonStats.objects.get(
+            player=self.players[-1], season=self.stage)
+        self.assertEqual(rollup.hits, 2)
+        self.assertEqual(rollup.average, .5)
+
+
+    def test_save_moves_row_to_another_player(self):
+        row, = create_hitting_stats(self.tgs, self.players[-1:])[0]
+        row.player = self.players[-2]
+        save_hitting_stats(self.tgs, [row])
+        self.assertFalse(PlayerHittingSeasonStats.objects.filter(
+            player=self.players[-1], season=self.stage).exists())
+        self.assertTrue(PlayerHittingSeasonStats.objects.filter(
+            player=self.players[-2], season=self.stage).exists())
+
+
+    def test_save_pitching_stats(self):
+        created, _ = create_pitching_stats(self.tgs, self.players[-2:])
+        for row in created:
+            row.outs_recorded = 14
+            row.earned_runs = 3
+        save_pitching_stats(self.tgs, created)
+
+        row = PlayerPitchingGameStats.objects.get(pk=created[0].pk)
+        self.assertEqual(row.innings_pitched, 4)
+        self.assertEqual(row._game, self.game)
+        rollup = PlayerPitchingSeasonStats.objects.get(
+            player=created[0].player, season=self.stage)
+        self.assertEqual(rollup.outs_recorded, 14)
+        team = TeamPitchingSeasonStats.objects.get(
+            team_season=self.team_season)
+        self.assertEqual(team.earned_runs, PlayerPitchingGameStats.objects.filter(
+            team_stats__team=self.team_season).aggregate(
+                earned_runs=Sum("earned_runs"))["earned_runs"])
@@ -21,6 +21,7 @@ class TableStatObject():
         self.era = 3.67
         self.whip = 1.25
         self.innings_pitched = 67.67
+        self.outs_recorded = 203
 
 class ASPlayerHittingGameStatsTableTest(TestCase):
     """
@@ -80,8 +81,7 @@ class ASPlayerPitchingGameStatsTableTest(TestCase):
 
     def test_render_innings_pitched(self):
         ip = self.table.render_innings_pitched(self.record)
-        record_ip = _convert_to_str_ip(self.record.innings_pitched)
-        self.assertEqual(record_ip, ip)
+        self.assertEqual("67.2", ip)
 
 
 class TeamHittingStatsTableTest(TestCase):
@@ -385,4 +385,29 @@ class TeamGameLineScoreTableTests(TestCase):
             "game","first", "second", "third", "fourth", "fifth", "sixth",
             "seventh","eighth", "ninth"] 
         self.assertEqual(self.table.Meta.fields, fields)
-    
\ No newline at end of file
+    
+
+class ColumnarRatiosMixinTest(TestCase):
+    """
+    Tests ColumnarRatiosMixin from stats/tables.py
+    """
+    def test_before_render_formats_page(self):
+        rows = [{"first": "A", "last": "B", "hits": 1, "at_bats": 3,
+            "walks": 0, "hit_by_pitch": 0, "sacrifice_flies": 0,
+            "average": None, "on_base_percentage": None}] * 2
+        table = PlayerHittingStatsTable([dict(row) for row in rows])
+        table.paginate(per_page=1)
+        table.before_render(None)
+        record = table.page.object_list.data[0]
+        self.assertEqual(record["average_display"], ".333")
+        self.assertEqual(table.render_average(record), ".333")
+        self.assertNotIn("average_display", table.data.data[1])
+
+    def test_pitching_before_render(self):
+        table = PlayerPitchingStatsTable([{"earned_runs": 1,
+            "walks_allowed": 0, "hits_allowed": 0, "outs_recorded": 9,
+            "innings_pitched": 3.0}])
+        table.before_render(None)
+        record = table.data.data[0]
+        self.assertEqual(table.render_era(record), "3.00")
+        self.assertEqual(table.render_innings_pitched(record), "3.0")
@@ -1,16 +1,24 @@
+import csv
+import io
+from unittest import mock
+from core.testing import QueryBudgetMixin
 from django.test import TestCase
 from django.urls import reverse
 
 from league.models import (Game, League, SeasonStage, TeamSeason)
+from stats.columnar import add_hitting_ratios
+from stats.csv_export import iter_csv_rows
 from stats.filters import (HittingSimpleFilter, PitchingSimpleFilter,
     StandingsSimpleFilter)
-from stats.models import (PlayerHittingGameStats, PlayerPitchingGameStats, 
-    TeamGameStats, TeamGameLineScore)
+from stats.models import (PlayerHittingGameStats, PlayerHittingSeasonStats,
+    PlayerPitchingGameStats, PlayerPitchingSeasonStats, TeamGameStats,
+    TeamGameLineScore, TeamStanding)
 from stats.tables import (ASPlayerHittingGameStatsTable,
     ASPlayerPitchingGameStatsTable, PlayerHittingStatsTable,
     PlayerPitchingStatsTable, StandingsTable, TeamGameLineScoreTable,
     TeamHittingStatsTable, TeamPitchingStatsTable)
-from stats.get_stats import get_extra_innings, get_stats
+from stats.get_stats import get_extra_innings, get_rollup_stats, get_stats
+from stats.views import StatsView
 
 
 
@@ -142,7 +150,7 @@ class TeamGameStatsInfoViewTest(TestCase):
         
 
 
-class StatsViewTests(TestCase):
+class StatsViewTests(QueryBudgetMixin, TestCase):
     """
     Tests StatsView
     from stats/views/views.py
@@ -211,8 +219,14 @@ class StatsViewTests(TestCase):
         self.assertQuerysetEqual(ths, hs, transform=lambda x:x)
 
 
+    def test_query_budget(self):
+        response = self.assertQueryBudget(9, reverse('stats-page'),
+            {'league': self.league.url})
+        self.assertEqual(response.status_code, 200)
+
 
-class PitchingStatsViewTests(TestCase):
+
+class PitchingStatsViewTests(QueryBudgetMixin, TestCase):
     """
     Tests PitchingStatsView
     from stats/views/views.py
@@ -283,8 +297,14 @@ class PitchingStatsViewTests(TestCase):
         self.assertQuerysetEqual(ths, hs, transform=lambda x:x)
 
 
+    def test_query_budget(self):
+        response = self.assertQueryBudget(9, reverse('pitching-stats-page'),
+            {'league': self.league.url})
+        self.assertEqual(response.status_code, 200)
 
-class TeamHittingStatsViewTests(TestCase):
+
+
+class TeamHittingStatsViewTests(QueryBudgetMixin, TestCase):
     """
     Tests TeamHittingStatsView
     from stats/views/views.py
@@ -355,8 +375,14 @@ class TeamHittingStatsViewTests(TestCase):
         self.assertQuerysetEqual(ths, hs, transform=lambda x:x)
 
 
+    def test_query_budget(self):
+        response = self.assertQueryBudget(9, reverse('team-stats-page'),
+            {'league': self.league.url})
+        self.assertEqual(response.status_code, 200)
+
+
 
-class TeamPitchingStatsViewTests(TestCase):
+class TeamPitchingStatsViewTests(QueryBudgetMixin, TestCase):
     """
     Tests TeamPitchingStatsView
     from stats/views/views.py
@@ -424,11 +450,22 @@ class TeamPitchingStatsViewTests(TestCase):
             season=self.stage) #queryset --> get_pitching_stats
         hs = get_stats(qs, "team_season_pitching") #hitting_stats
         ths = response.context["object_list"]
-        self.assertQuerysetEqual(ths, hs, transform=lambda x:x)
+        #Rollup rows key the team by team_season instead of team_stats__team
+        expected = []
+        for row in hs:
+            row["team_season"] = row.pop("team_stats__team")
+            expected.append(row)
+        self.assertQuerysetEqual(ths, expected, transform=lambda x:x)
 
 
+    def test_query_budget(self):
+        response = self.assertQueryBudget(9, reverse('team-pitching-stats-page'),
+            {'league': self.league.url})
+        self.assertEqual(response.status_code, 200)
 
-class StandingsViewTests(TestCase):
+
+
+class StandingsViewTests(QueryBudgetMixin, TestCase):
     """
     Tests StandingsView
     from stats/views/views.py
@@ -496,4 +533,76 @@ class StandingsViewTests(TestCase):
             season=self.stage) #queryset --> get_team_game_stats
         hs = get_stats(qs, "league_standings") #standings_stats
         ths = response.context["object_list"]
-        self.assertQuerysetEqual(ths, hs, transform=lambda x:x)
\ No newline at end of file
+        self.assertQuerysetEqual(ths, hs, transform=lambda x:x)
+
+
+    def test_query_budget(self):
+        response = self.assertQueryBudget(9, reverse('standings-page'),
+            {'league': self.league.url})
+        self.assertEqual(response.status_code, 200)
+
+
+class CSVExportTests(TestCase):
+    """
+    Tests ?format=csv on the stats pages, CSVExportMixin
+    from stats/csv_export.py
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.league = League.objects.get(id=1)
+        cls.stage = SeasonStage.objects.get(id=3)
+
+
+    def get_csv(self, name):
+        response = self.client.get(reverse(name) +
+            f"?league={self.league.url}&format=csv")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        content = b"".join(response.streaming_content).decode()
+        return response, list(csv.reader(io.StringIO(content)))
+
+
+    def test_hitting_csv(self):
+        response, rows = self.get_csv("stats-page")
+        self.assertEqual(response["Content-Disposition"],
+            f'attachment; filename="{self.league.url}_hitting.csv"')
+
+        qs = PlayerHittingSeasonStats.objects.filter(league=self.league,
+            season=self.stage).order_by("-hits", "player")
+        expected = list(PlayerHittingStatsTable(add_hitting_ratios(
+            get_rollup_stats(qs, "all_season_hitting"))).as_values())
+        self.assertTrue(len(expected) > 1)
+        self.assertEqual(rows, [["" if value is None else str(value)
+            for value in row] for row in expected])
+
+
+    def test_pitching_csv(self):
+        _, rows = self.get_csv("pitching-stats-page")
+        self.assertEqual(rows[0][:3], ["First", "Last", "W"])
+        self.assertEqual(len(rows) - 1, PlayerPitchingSeasonStats.objects.filter(
+            league=self.league, season=self.stage).count())
+
+
+    def test_standings_csv(self):
+        _, rows = self.get_csv("standings-page")
+        self.assertEqual(rows[0][:3], ["Team name", "W", "L"])
+        self.assertEqual(len(rows) - 1, TeamStanding.objects.filter(
+            league=self.league, season=self.stage).count())
+
+
+    def test_csv_is_not_paginated(self):
+        qs = PlayerHittingSeasonStats.objects.filter(league=self.league,
+            season=self.stage)
+        count = qs.count()
+        with mock.patch.object(StatsView, "csv_chunk_size", 1), \
+                mock.patch.object(StatsView, "paginate_by", 1):
+            _, rows = self.get_csv("stats-page")
+        self.assertEqual(len(rows), count + 1)
+        self.assertEqual(rows.count(rows[0]), 1)
+
+
+    def test_empty_csv_has_header(self):
+        qs = iter_csv_rows(StandingsTable, TeamStanding.objects.none(), 10)
+        self.assertEqual(list(qs), [["Team name", "W", "L", "T", "PCT", "RF",
+            "RA", "DIFF"]])
@@ -9,6 +9,9 @@ urlpatterns = [
     path('team/hitting/', TeamHittingStatsView.as_view(), name='team-stats-page'),
     path('team/pitching/', TeamPitchingStatsView.as_view(), name='team-pitching-stats-page'),
     path('standings/', StandingsView.as_view(), name="standings-page"),
+
+    #Read-only JSON API --> hitting, pitching, team-hitting, team-pitching, standings
+    path('api/<slug:endpoint>/', views.stats_api_view, name='stats-api'),
     
     #All Team Stats Info View --> Create,edit delete all objects.
     path(
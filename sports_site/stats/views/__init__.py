@@ -1,3 +1,4 @@
+from .api_views import *
 from .tg_linescore_views import *
 from .tgs_hitting_views import *
 from .tgs_pitching_views import *
@@ -0,0 +1,229 @@
+"""
+Read-only JSON leaderboards, ie /league/stats/api/hitting/?league=tl
+
+Query params:
+    league - League url slug, required.
+    season - SeasonStage pk, defaults to the featured stage.
+    sort - Field to sort on, "-hits" for descending, defaults to the
+        endpoint's sort below.
+    fields - Comma separated fields to return, from the endpoint's
+        stats_defaults preset, defaults to all of them.
+    limit - Rows per page, up to API_MAX_PAGE_SIZE.
+    cursor - The "next" cursor of the previous page.
+
+Pages are keyset (seek) paginated on (sort value, key) instead of by
+offset, so every page costs the same however deep it is.
+"""
+import base64
+import hashlib
+import json
+from django.db.models import F, Q
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_GET
+from league.models import League
+from ..get_stats import get_rollup_stats, get_stats
+from ..models import (PlayerHittingGameStats, PlayerHittingSeasonStats,
+    PlayerPitchingSeasonStats, TeamPitchingSeasonStats, TeamStanding)
+from ..stats_defaults import rollup_dict_choices, stats_dict_choices
+
+
+API_PAGE_SIZE = 25
+API_MAX_PAGE_SIZE = 100
+
+API_ENDPOINTS = {
+    "hitting": {
+        "model": PlayerHittingSeasonStats,
+        "stats": "all_season_hitting",
+        "rollup": True,
+        "sort": "-hits",
+        },
+    "pitching": {
+        "model": PlayerPitchingSeasonStats,
+        "stats": "all_season_pitching",
+        "rollup": True,
+        "sort": "-win",
+        },
+    "team-hitting": {
+        "model": PlayerHittingGameStats,
+        "stats": "team_season_hitting",
+        "rollup": False,
+        "sort": "-hits",
+        },
+    "team-pitching": {
+        "model": TeamPitchingSeasonStats,
+        "stats": "team_season_pitching",
+        "rollup": True,
+        "sort": "-win",
+        },
+    "standings": {
+        "model": TeamStanding,
+        "stats": "league_standings",
+        "rollup": True,
+        "sort": "-win",
+        },
+    }
+
+
+
+class APIError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def endpoint_fields(endpoint):
+    """
+    Returns (key, fields) for an endpoint, read from its stats_defaults
+    preset. key is the field rows are grouped on, ie "player", and breaks
+    ties in the sort order.
+    """
+    if endpoint["rollup"]:
+        stats = rollup_dict_choices[endpoint["stats"]]
+        fields = list(stats["fields"]) + list(stats["initial"])
+        return stats["fields"][0], fields
+
+    stats = stats_dict_choices[endpoint["stats"]]
+    sums, ratios = stats["default_stats"]
+    fields = ([stats["annotation_value"]] + list(stats["initial"]) +
+        [val[0] if type(val) == tuple else val for val in sums] +
+        list(ratios))
+    return stats["annotation_value"], list(dict.fromkeys(fields))
+
+
+def encode_cursor(value, key):
+    return base64.urlsafe_b64encode(json.dumps([value, key]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        value, key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise APIError("Invalid cursor.")
+    if not isinstance(key, int):
+        raise APIError("Invalid cursor.")
+    return value, key
+
+
+def seek(queryset, sort, key, cursor, descending):
+    """
+    Orders queryset on (sort, key), nulls last, and filters it to the rows
+    after cursor.
+
+    Params:
+        queryset - values() queryset.
+        sort - Field name to sort on.
+        key - Unique field name breaking ties.
+        cursor - (sort value, key value) of the last row seen, or None.
+        descending - bool, sort high to low.
+    """
+    order = F(sort).desc(nulls_last=True) if descending else F(sort).asc(
+        nulls_last=True)
+    queryset = queryset.order_by(order, key)
+    if cursor is None:
+        return queryset
+
+    value, last_key = cursor
+    if value is None:
+        return queryset.filter(Q(**{f"{sort}__isnull": True,
+            f"{key}__gt": last_key}))
+    past = f"{sort}__lt" if descending else f"{sort}__gt"
+    return queryset.filter(Q(**{past: value}) |
+        Q(**{sort: value, f"{key}__gt": last_key}) |
+        Q(**{f"{sort}__isnull": True}))
+
+
+def _params(request, endpoint):
+    key, fields = endpoint_fields(endpoint)
+
+    requested = request.GET.get("fields")
+    if requested:
+        selected = [field for field in requested.split(",") if field]
+        unknown = set(selected) - set(fields)
+        if unknown:
+            raise APIError(f"Unknown fields: {', '.join(sorted(unknown))}.")
+    else:
+        selected = fields
+
+    sort = request.GET.get("sort", endpoint["sort"])
+    descending = sort.startswith("-")
+    sort = sort.lstrip("-")
+    if sort not in fields:
+        raise APIError(f"Unknown sort field: {sort}.")
+
+    try:
+        limit = int(request.GET.get("limit", API_PAGE_SIZE))
+    except ValueError:
+        raise APIError("limit must be a number.")
+    if not 0 < limit <= API_MAX_PAGE_SIZE:
+        raise APIError(f"limit must be between 1 and {API_MAX_PAGE_SIZE}.")
+
+    cursor = request.GET.get("cursor")
+    cursor = decode_cursor(cursor) if cursor else None
+    return key, selected, sort, descending, limit, cursor
+
+
+def _season(request):
+    league = request.league_resolver.league
+    season = request.GET.get("season")
+    if not season:
+        return league, request.league_resolver.featured_stage
+    try:
+        return league, int(season)
+    except ValueError:
+        raise APIError("season must be a number.")
+
+
+def get_api_page(request, endpoint):
+    """
+    Returns the page of rows and the next cursor, None on the last page,
+    for an API_ENDPOINTS endpoint.
+    """
+    key, selected, sort, descending, limit, cursor = _params(request,
+        endpoint)
+    league, season = _season(request)
+
+    queryset = endpoint["model"].objects.filter(league=league, season=season)
+    if endpoint["rollup"]:
+        stats = get_rollup_stats(queryset, endpoint["stats"],
+            fields=set(selected) | {key, sort})
+    else:
+        stats = get_stats(queryset, endpoint["stats"])
+
+    rows = list(seek(stats, sort, key, cursor, descending)[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][sort], rows[-1][key])
+
+    output = [key] + [field for field in selected if field != key]
+    return [{field: row[field] for field in output} for row in rows], next_cursor
+
+
+@require_GET
+def stats_api_view(request, endpoint):
+    """
+    JSON page of an API_ENDPOINTS leaderboard, with an ETag of its body so
+    pollers get a 304 while nothing has changed.
+    """
+    try:
+        if endpoint not in API_ENDPOINTS:
+            raise APIError(f"Unknown endpoint: {endpoint}.", status=404)
+        try:
+            rows, next_cursor = get_api_page(request, API_ENDPOINTS[endpoint])
+        except League.DoesNotExist:
+            raise APIError("Unknown league.", status=404)
+    except APIError as error:
+        return JsonResponse({"error": str(error)}, status=error.status)
+
+    next_url = None
+    if next_cursor:
+        params = request.GET.copy()
+        params["cursor"] = next_cursor
+        next_url = f"{request.path}?{params.urlencode()}"
+
+    response = JsonResponse({"results": rows, "next": next_url})
+    etag = quote_etag(hashlib.md5(response.content).hexdigest())
+    response["ETag"] = etag
+    return get_conditional_response(request, etag=etag, response=response)
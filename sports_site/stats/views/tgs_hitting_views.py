@@ -6,6 +6,7 @@ from league.models import Game, Roster, TeamSeason
 from ..decorators import user_owns_game
 from ..forms import HittingGameStatsFormset, PlayerStatsCreateForm, PHGSFHelper
 from ..models import TeamGameStats
+from ..stat_entry import create_hitting_stats, save_hitting_stats
 
 
 
@@ -32,20 +33,17 @@ def team_game_stats_create_view(request, game_pk, team_season_pk,
                            form_kwargs={'team_season':team_season,
                                         'team_game_stats':team_game_stats})
 
-    if request.method == "POST":
-        for form in formset:
-            if form.is_valid():
-                hitting_stats, created = form.process()
-
-                if created:
-                    messages.success(request,
-                        f"{hitting_stats.player.player} hitting stats "
-                        f"created for {game}.")
-                else:
-                    if hitting_stats:
-                        messages.info(request,
-                            f"{hitting_stats.player.player} already has "
-                            f"stats for {game}.")
+    if request.method == "POST" and formset.is_valid():
+        created, existing = create_hitting_stats(team_game_stats,
+            [form.cleaned_data.get("player") for form in formset])
+        for hitting_stats in created:
+            messages.success(request,
+                f"{hitting_stats.player.player} hitting stats "
+                f"created for {game}.")
+        for hitting_stats in existing:
+            messages.info(request,
+                f"{hitting_stats.player.player} already has "
+                f"stats for {game}.")
 
 
 
@@ -72,7 +70,8 @@ def team_game_stats_edit_view(request, game_pk, team_season_pk,
     roster = Roster.objects.get(team=team_season)
     players = roster.playerseason_set.all()
 
-    team_game_stats, created = TeamGameStats.objects.get_or_create(
+    team_game_stats, created = TeamGameStats.objects.select_related(
+        "game__home_team__team", "game__away_team__team").get_or_create(
             pk=team_game_stats_pk,
             season=team_season.season,
             team=team_season,
@@ -88,8 +87,9 @@ def team_game_stats_edit_view(request, game_pk, team_season_pk,
             form_kwargs={'team_season':team_season,
                          'game_stats':team_game_stats})
         if formset.is_valid():
-            for form in formset:
-                saved_stats = form.process()
+            rows = [form.process(commit=False) for form in formset
+                if form.instance.pk or form.has_changed()]
+            for saved_stats in save_hitting_stats(team_game_stats, rows):
                 messages.success(request, f"{saved_stats} saved.")
 
             return redirect('stats-team-game-stats', game_pk, team_season_pk)
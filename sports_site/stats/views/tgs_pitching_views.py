@@ -7,6 +7,7 @@ from ..decorators import user_owns_game
 from ..forms import (PitchingGameStatsFormset, PlayerPitchingStatsCreateForm,
     PPGSFHelper)
 from ..models import TeamGameStats
+from ..stat_entry import create_pitching_stats, save_pitching_stats
 
 
 
@@ -33,20 +34,17 @@ def team_game_pitching_stats_create_view(request, game_pk, team_season_pk,
                            form_kwargs={'team_season':team_season,
                                         'team_game_stats':team_game_stats})
 
-    if request.method == "POST":
-        for form in formset:
-            if form.is_valid():
-                pitching_stats, created = form.process()
-
-                if created:
-                    messages.success(request,
-                        f"{pitching_stats.player.player} pitching stats "
-                        f"created for {game}.")
-                else:
-                    if pitching_stats:
-                        messages.info(request,
-                            f"{pitching_stats.player.player} already has "
-                            f"stats for {game}.")
+    if request.method == "POST" and formset.is_valid():
+        created, existing = create_pitching_stats(team_game_stats,
+            [form.cleaned_data.get("player") for form in formset])
+        for pitching_stats in created:
+            messages.success(request,
+                f"{pitching_stats.player.player} pitching stats "
+                f"created for {game}.")
+        for pitching_stats in existing:
+            messages.info(request,
+                f"{pitching_stats.player.player} already has "
+                f"stats for {game}.")
 
         if 'create' in request.POST:
             return redirect('stats-team-game-stats', game_pk, team_season_pk)
@@ -71,7 +69,9 @@ def team_game_pitching_stats_edit_view(request, game_pk, team_season_pk,
     roster = Roster.objects.get(team=team_season)
     players = roster.playerseason_set.all()
 
-    team_game_stats= TeamGameStats.objects.get(pk=team_game_stats_pk,
+    team_game_stats= TeamGameStats.objects.select_related(
+        "game__home_team__team", "game__away_team__team").get(
+                                               pk=team_game_stats_pk,
                                                season=team_season.season,
                                                team=team_season,
                                                game=game)
@@ -86,8 +86,9 @@ def team_game_pitching_stats_edit_view(request, game_pk, team_season_pk,
             form_kwargs={'team_season':team_season,
                          'game_stats':team_game_stats})
         if formset.is_valid():
-            for form in formset:
-                saved_stats = form.process()
+            rows = [form.process(commit=False) for form in formset
+                if form.instance.pk or form.has_changed()]
+            for saved_stats in save_pitching_stats(team_game_stats, rows):
                 messages.success(request, f"{saved_stats} saved.")
 
             return redirect('stats-team-game-stats', game_pk, team_season_pk)
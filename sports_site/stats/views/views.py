@@ -3,12 +3,14 @@ from django.core.exceptions import ObjectDoesNotExist
 from django.shortcuts import render
 from django_filters.views import FilterView
 from django_tables2.views import SingleTableMixin
-from league.models import League, SeasonStage
+from league.decorators import LeagueDataConditionMixin
+from ..csv_export import CSVExportMixin
 from ..decorators import user_owns_game
 from ..filters import HittingSimpleFilter, PitchingSimpleFilter, StandingsSimpleFilter
-from ..get_stats import (get_stats, get_extra_innings)
-from ..models import (PlayerHittingGameStats, PlayerPitchingGameStats,
-    TeamGameLineScore, TeamGameStats)
+from ..get_stats import (get_extra_innings, get_rollup_stats, get_stats)
+from ..models import (PlayerHittingGameStats, PlayerHittingSeasonStats,
+    PlayerPitchingGameStats, PlayerPitchingSeasonStats, TeamGameLineScore,
+    TeamGameStats, TeamPitchingSeasonStats, TeamStanding)
 from ..tables import (ASPlayerHittingGameStatsTable,
     ASPlayerPitchingGameStatsTable, PlayerHittingStatsTable,
     PlayerPitchingStatsTable, StandingsTable, TeamGameLineScoreTable,
@@ -27,8 +29,9 @@ def team_game_stats_info_view(request, game_pk, team_season_pk):
     table2 = ASPlayerPitchingGameStatsTable(pitching_stats)
 
     try:
-        linescore = TeamGameLineScore.objects.get(game=game_stats,
-                                                  game__team=team_season_pk)
+        linescore = TeamGameLineScore.objects.select_related(
+            "game__team__team").prefetch_related("inningscore_set").get(
+                game=game_stats, game__team=team_season_pk)
         table_data = [get_extra_innings(linescore)]
         table3 = TeamGameLineScoreTable(table_data)
     except ObjectDoesNotExist:
@@ -51,182 +54,156 @@ def team_game_stats_info_view(request, game_pk, team_season_pk):
 
 
 """Stats Display Views"""
-class StatsView(SingleTableMixin, FilterView):
+class StatsView(LeagueDataConditionMixin, CSVExportMixin,
+        SingleTableMixin, FilterView):
     model = PlayerHittingGameStats
     table_class = PlayerHittingStatsTable
     template_name = "stats/stats_page.html"
 
     filterset_class = HittingSimpleFilter
     paginate_by = 25
-
-
-    def dispatch(self, request, *args, **kwargs):
-        self.league_slug = self.request.GET.get('league', None)
-        
-        return super().dispatch(request, *args, **kwargs)
+    csv_filename = "hitting"
 
 
     def get_context_data(self, **kwargs):
         data = super().get_context_data(**kwargs)
-        data['league'] = League.objects.get(url=self.league_slug)
-        data['stage'] = SeasonStage.objects.get(season__league__url=self.league_slug,
-            featured=True)
+        data['league'] = self.request.league_resolver.league
+        data['stage'] = self.request.league_resolver.featured_stage
         return data
 
 
     def get_queryset(self):
         super().get_queryset()
-        league = League.objects.get(url=self.league_slug)
+        league = self.request.league_resolver.league
         season_stage = self.request.GET.get("season", None)
         stage = (season_stage if season_stage
-             else SeasonStage.objects.get(season__league=league, featured=True))
-        qs = PlayerHittingGameStats.objects.filter(
-            player__player__league=league,
-            season=stage).order_by('-hits')
-        hitting_stats = get_stats(qs, "all_season_hitting")
+             else self.request.league_resolver.featured_stage)
+        qs = PlayerHittingSeasonStats.objects.filter(
+            league=league,
+            season=stage).order_by('-hits', 'player')
+        hitting_stats = get_rollup_stats(qs, "all_season_hitting")
         return hitting_stats
 
 
-class PitchingStatsView(SingleTableMixin, FilterView):
+class PitchingStatsView(LeagueDataConditionMixin, CSVExportMixin,
+        SingleTableMixin, FilterView):
     model = PlayerPitchingGameStats
     table_class = PlayerPitchingStatsTable
     template_name = "stats/pitching_stats_page.html"
 
     filterset_class = PitchingSimpleFilter
     paginate_by = 25
-
-
-    def dispatch(self, request, *args, **kwargs):
-        self.league_slug = self.request.GET.get('league', None)
-
-        return super().dispatch(request, *args, **kwargs)
+    csv_filename = "pitching"
 
 
     def get_context_data(self, **kwargs):
         data = super().get_context_data(**kwargs)
-        data['league'] = League.objects.get(url=self.league_slug)
-        data['stage'] = SeasonStage.objects.get(season__league__url=self.league_slug,
-            featured=True)
+        data['league'] = self.request.league_resolver.league
+        data['stage'] = self.request.league_resolver.featured_stage
         return data
 
 
     def get_queryset(self):
         super().get_queryset()
-        league = League.objects.get(url=self.league_slug)
+        league = self.request.league_resolver.league
         season_stage = self.request.GET.get("season", None)
         stage = (season_stage if season_stage
-             else SeasonStage.objects.get(season__league=league, featured=True))
-        qs = PlayerPitchingGameStats.objects.filter(
-            player__player__league=league,
-            season=stage).order_by("-win")
-        pitching_stats = get_stats(qs, "all_season_pitching")
+             else self.request.league_resolver.featured_stage)
+        qs = PlayerPitchingSeasonStats.objects.filter(
+            league=league,
+            season=stage).order_by("-win", "player")
+        pitching_stats = get_rollup_stats(qs, "all_season_pitching")
         return pitching_stats
 
 
-class TeamHittingStatsView(SingleTableMixin, FilterView):
+class TeamHittingStatsView(LeagueDataConditionMixin, CSVExportMixin,
+        SingleTableMixin, FilterView):
     model = PlayerHittingGameStats
     table_class = TeamHittingStatsTable
     template_name = "stats/team_stats_page.html"
 
     filterset_class = HittingSimpleFilter
     paginate_by = 25
-
-
-    def dispatch(self, request, *args, **kwargs):
-        self.league_slug = self.request.GET.get('league', None)
-
-        return super().dispatch(request, *args, **kwargs)
+    csv_filename = "team_hitting"
 
 
     def get_context_data(self, **kwargs):
         data = super().get_context_data(**kwargs)
-        data['league'] = League.objects.get(url=self.league_slug)
-        data['stage'] = SeasonStage.objects.get(season__league__url=self.league_slug,
-            featured=True)
+        data['league'] = self.request.league_resolver.league
+        data['stage'] = self.request.league_resolver.featured_stage
         return data
 
 
     def get_queryset(self):
         super().get_queryset()
-        league = League.objects.get(url=self.league_slug)
+        league = self.request.league_resolver.league
         season_stage = self.request.GET.get("season", None)
         stage = (season_stage if season_stage
-             else SeasonStage.objects.get(season__league=league, featured=True))
+             else self.request.league_resolver.featured_stage)
         qs = PlayerHittingGameStats.objects.filter(
-            player__player__league=league,
-            season=stage).order_by("-hits")
+            league=league, season=stage).order_by("-hits")
         hitting_stats = get_stats(qs, "team_season_hitting")
         return hitting_stats
 
 
-class TeamPitchingStatsView(SingleTableMixin, FilterView):
+class TeamPitchingStatsView(LeagueDataConditionMixin, CSVExportMixin,
+        SingleTableMixin, FilterView):
     model = PlayerPitchingGameStats
     table_class = TeamPitchingStatsTable
     template_name = "stats/team_pitching_stats_page.html"
 
     filterset_class = PitchingSimpleFilter
     paginate_by = 25
-
-
-    def dispatch(self, request, *args, **kwargs):
-        self.league_slug = self.request.GET.get('league', None)
-
-        return super().dispatch(request, *args, **kwargs)
+    csv_filename = "team_pitching"
 
 
     def get_context_data(self, **kwargs):
         data = super().get_context_data(**kwargs)
-        data['league'] = League.objects.get(url=self.league_slug)
-        data['stage'] = SeasonStage.objects.get(season__league__url=self.league_slug,
-            featured=True)
+        data['league'] = self.request.league_resolver.league
+        data['stage'] = self.request.league_resolver.featured_stage
         return data
 
 
     def get_queryset(self):
         super().get_queryset()
-        league = League.objects.get(url=self.league_slug)
+        league = self.request.league_resolver.league
         season_stage = self.request.GET.get("season", None)
         stage = (season_stage if season_stage
-             else SeasonStage.objects.get(season__league=league, featured=True))
-        qs = PlayerPitchingGameStats.objects.filter(
-            player__player__league=league,
-            season=stage).order_by("-win")
-        pitching_stats = get_stats(qs, "team_season_pitching")
+             else self.request.league_resolver.featured_stage)
+        qs = TeamPitchingSeasonStats.objects.filter(
+            league=league,
+            season=stage).order_by("-win", "team_season")
+        pitching_stats = get_rollup_stats(qs, "team_season_pitching")
         return pitching_stats
 
 
 """Standings Display View"""
-class StandingsView(SingleTableMixin, FilterView):
+class StandingsView(LeagueDataConditionMixin, CSVExportMixin,
+        SingleTableMixin, FilterView):
     model = TeamGameStats
     table_class = StandingsTable
     template_name = "stats/standings_page.html"
 
     filterset_class = StandingsSimpleFilter
     paginate_by = 25
-
-
-    def dispatch(self, request, *args, **kwargs):
-        self.league_slug = self.request.GET.get('league', None)
-
-        return super().dispatch(request, *args, **kwargs)
+    csv_filename = "standings"
 
 
     def get_context_data(self, **kwargs):
         data = super().get_context_data(**kwargs)
-        data['league'] = League.objects.get(url=self.league_slug)
-        data['stage'] = SeasonStage.objects.get(season__league__url=self.league_slug,
-            featured=True)
+        data['league'] = self.request.league_resolver.league
+        data['stage'] = self.request.league_resolver.featured_stage
         return data
 
 
     def get_queryset(self):
         super().get_queryset()
-        league = League.objects.get(url=self.league_slug)
+        league = self.request.league_resolver.league
         season_stage = self.request.GET.get("season", None)
         stage = (season_stage if season_stage
-             else SeasonStage.objects.get(season__league=league, featured=True))
-        qs = TeamGameStats.objects.filter(
-            team__team__league=league,
-            season=stage).order_by('-win')
-        standings_stats = get_stats(qs, "league_standings")
+             else self.request.league_resolver.featured_stage)
+        qs = TeamStanding.objects.filter(
+            league=league,
+            season=stage).order_by('-win', 'team')
+        standings_stats = get_rollup_stats(qs, "league_standings")
         return standings_stats